@@ -0,0 +1,24 @@
+// Copyright (c) 2026, Me and contributors
+// For license information, please see license.txt
+
+// Socket.io handlers loaded by the Frappe realtime server.
+//
+// `repairbox_subscribe` joins the branch rooms of Repair Order updates. The
+// rooms are decided by the server for the session user, like Frappe's own
+// doctype_subscribe, so restricted users cannot join other branches.
+
+const { frappe_request } = require("../../frappe/realtime/utils");
+
+const ROOMS_METHOD = "/api/method/repairbox.repairbox.realtime.get_realtime_rooms";
+
+module.exports = function (socket) {
+    socket.on("repairbox_subscribe", () => {
+        frappe_request(ROOMS_METHOD, socket).end((err, res) => {
+            if (err) {
+                console.log(err);
+                return;
+            }
+            (res.body.message || []).forEach((room) => socket.join(room));
+        });
+    });
+};
@@ -0,0 +1,464 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Synthetic data generator for load tests.
+
+Creates brands, devices, defects, inspection checklist templates, branches,
+customers, Repair Orders with their defect and inspection rows, and Repair Logs
+using bulk inserts, one commit per chunk of orders. All generated records use a `BENCH` prefix so `purge` can
+remove them again.
+
+	bench --site <site> repairbox-generate-data --orders 100000
+	bench --site <site> execute repairbox.benchmarks.data_generator.purge
+
+Distributions are loosely based on a phone repair shop: a few popular devices
+take most of the orders (Zipf), most orders have one or two defects, prices
+are log-normal and old orders are mostly delivered.
+"""
+
+import random
+import string
+import time
+
+import frappe
+from frappe.utils import add_to_date, cint, flt, now_datetime
+
+from repairbox.repairbox.doctype.completion_time_stat.completion_time_stat import rebuild_completion_stats
+from repairbox.repairbox.doctype.customer_phone_index.customer_phone_index import get_index_rows, insert_rows
+from repairbox.repairbox.doctype.inspection_template_resolution.inspection_template_resolution import (
+	update_device_resolution,
+	update_device_type_resolutions
+)
+from repairbox.repairbox.doctype.repair_order.repair_order import get_defect_summary
+from repairbox.repairbox.doctype.repair_status_interval.repair_status_interval import rebuild_all as rebuild_intervals
+from repairbox.repairbox.doctype.technician_workload.technician_workload import rebuild_all as rebuild_workloads
+
+PREFIX = "BENCH"
+
+DEVICE_TYPES = [
+	('Smartphone', 70), ('Laptop', 12), ('Tablet', 10),
+	('Smartwatch', 4), ('Gaming Console', 2), ('Desktop', 2)
+]
+
+DEFECT_TITLES = [
+	'Screen Replacement', 'Battery Replacement', 'Charging Port Repair',
+	'Back Glass Replacement', 'Camera Repair', 'Speaker Repair',
+	'Microphone Repair', 'Water Damage Treatment', 'Software Reinstall',
+	'Button Repair', 'Keyboard Replacement', 'Motherboard Repair'
+]
+
+INSPECTION_ITEMS = [
+	('Screen', 'Display'), ('Touch', 'Display'), ('Speaker', 'Audio'),
+	('Microphone', 'Audio'), ('Wi-Fi', 'Connectivity'), ('Bluetooth', 'Connectivity'),
+	('Battery Health', 'Battery'), ('Rear Camera', 'Camera'), ('Front Camera', 'Camera'),
+	('Charging Port', 'Buttons & Ports'), ('Power Button', 'Buttons & Ports'),
+	('Face ID / Fingerprint', 'Sensors'), ('Housing', 'Physical Condition')
+]
+
+# Share of devices, most popular first, with a device-specific checklist template
+DEVICE_TEMPLATE_SHARE = 0.1
+
+PRIORITY_WEIGHTS = {'Standard': 70, 'Express': 20, 'Urgent': 7, 'Economy': 3}
+
+# Status of orders younger than two weeks
+ACTIVE_STATUS_WEIGHTS = {
+	'Pending Review': 15, 'In Progress': 30, 'Awaiting Parts': 12,
+	'Awaiting Customer Approval': 6, 'Testing': 8, 'Completed': 6,
+	'Ready for Pickup': 10, 'On Hold': 3, 'Delivered': 8, 'Cancelled': 2
+}
+
+# Status of older orders
+CLOSED_STATUS_WEIGHTS = {'Delivered': 86, 'Cancelled': 8, 'Ready for Pickup': 4, 'On Hold': 2}
+
+STATUS_PATH = ['Pending Review', 'In Progress', 'Testing', 'Completed', 'Ready for Pickup', 'Delivered']
+
+TAX_RATE = 0.19
+
+
+def generate(
+	orders=10000, brands=12, devices_per_brand=15, defects_per_device=8,
+	customers=None, technicians=None, days=730, inspection=True,
+	branches=3, chunk_size=5000, seed=42
+):
+	"""Generate a dataset of `orders` Repair Orders on top of any existing BENCH data"""
+	started = time.perf_counter()
+	offset = count_orders()
+
+	# Master data must come out the same on every run so later runs can add orders to it
+	master = ensure_master_data(random.Random(seed), brands, devices_per_brand, defects_per_device)
+	ensure_inspection_templates(master.devices)
+	master.branches = ensure_branches(branches)
+
+	rng = random.Random(seed + offset)
+	customer_names = ensure_customers(rng, cint(customers) or max((offset + orders) // 3, 1), chunk_size)
+	technicians = technicians or get_technicians()
+	priority_charges = dict(frappe.get_all('Repair Priority', fields=['name', 'extra_charge'], as_list=True))
+
+	for chunk_start in range(0, orders, chunk_size):
+		chunk = min(chunk_size, orders - chunk_start)
+		insert_orders(
+			rng, offset + chunk_start, chunk, master, customer_names,
+			technicians, priority_charges, days, inspection
+		)
+		frappe.db.commit()
+		print(f"  {chunk_start + chunk}/{orders} orders")
+
+	# Bulk inserts skip the hooks keeping technician workloads up to date
+	rebuild_workloads()
+	rebuild_intervals()
+	frappe.db.commit()
+
+	print(f"Generated {orders} orders in {time.perf_counter() - started:.1f}s")
+
+
+def count_orders():
+	"""Number of generated Repair Orders already in the database"""
+	return frappe.db.count('Repair Order', {'name': ['like', f'RO-{PREFIX}-%']})
+
+
+def ensure_master_data(rng, brands, devices_per_brand, defects_per_device):
+	"""Create generated brands, devices and defects if they do not exist yet"""
+	now = now_datetime()
+	owner = frappe.session.user
+
+	brand_names = [f'{PREFIX} Brand {i:02d}' for i in range(1, brands + 1)]
+	new_brands = [b for b in brand_names if not frappe.db.exists('Brand', b)]
+	if new_brands:
+		frappe.db.bulk_insert(
+			'Brand', ['name', 'brand_name', 'is_active', 'creation', 'modified', 'owner', 'modified_by'],
+			[(b, b, 1, now, now, owner, owner) for b in new_brands]
+		)
+
+	devices = []
+	device_values = []
+	for brand in brand_names:
+		for i in range(1, devices_per_brand + 1):
+			name = f'{brand} Model {i:03d}'
+			device_type = weighted_choice(rng, dict(DEVICE_TYPES))
+			devices.append(frappe._dict(name=name, brand=brand, device_type=device_type))
+			device_values.append((name, name, brand, f'M{i:03d}', device_type, 1, now, now, owner, owner))
+
+	existing = set(frappe.get_all('Device', filters={'name': ['like', f'{PREFIX} %']}, pluck='name'))
+	new_devices = [row for row in device_values if row[0] not in existing]
+	if new_devices:
+		frappe.db.bulk_insert(
+			'Device',
+			['name', 'device_name', 'brand', 'model', 'device_type', 'is_active', 'creation', 'modified', 'owner', 'modified_by'],
+			new_devices
+		)
+
+	# Popular devices first: Zipf-like weights by rank
+	device_weights = [1 / (rank ** 1.1) for rank in range(1, len(devices) + 1)]
+	rng.shuffle(devices)
+
+	defects = {}
+	defect_values = []
+	existing = set(frappe.get_all('Defect', filters={'name': ['like', f'{PREFIX} %']}, pluck='name'))
+	for device in devices:
+		defects[device.name] = []
+		for title in rng.sample(DEFECT_TITLES, min(defects_per_device, len(DEFECT_TITLES))):
+			price = round(rng.lognormvariate(4.3, 0.6), 0)
+			defect = frappe._dict(
+				name=f'{device.name}-{title}',
+				title=title,
+				estimated_time=rng.choice([15, 30, 45, 60, 90, 120, 180]),
+				selling_price=price,
+				cost_amount=round(price * rng.uniform(0.35, 0.7), 2)
+			)
+			defects[device.name].append(defect)
+			if defect.name not in existing:
+				defect_values.append((
+					defect.name, device.name, device.brand, title, defect.estimated_time,
+					defect.cost_amount, defect.selling_price, 1, now, now, owner, owner
+				))
+
+	if defect_values:
+		frappe.db.bulk_insert(
+			'Defect',
+			['name', 'device', 'brand', 'defect_title', 'estimated_time', 'cost_amount', 'selling_price', 'is_active', 'creation', 'modified', 'owner', 'modified_by'],
+			defect_values
+		)
+
+	frappe.db.commit()
+	return frappe._dict(devices=devices, device_weights=device_weights, defects=defects)
+
+
+def ensure_inspection_templates(devices):
+	"""
+	Create a checklist template per device type and one for each of the most
+	popular devices if they do not exist yet, and resolve the generated devices
+	to them.
+
+	Templates are not defaults, so they never displace the default template of
+	a device type on the site.
+	"""
+	now = now_datetime()
+	owner = frappe.session.user
+
+	templates = [
+		(f'{PREFIX} {device_type} Inspection', device_type, None)
+		for device_type, _ in DEVICE_TYPES
+	] + [
+		(f'{device.name} Inspection', device.device_type, device.name)
+		for device in devices[:max(int(len(devices) * DEVICE_TEMPLATE_SHARE), 1)]
+	]
+
+	existing = set(frappe.get_all(
+		'Inspection Checklist Template', filters={'name': ['like', f'{PREFIX} %']}, pluck='name'
+	))
+	new_templates = [template for template in templates if template[0] not in existing]
+	if not new_templates:
+		return
+
+	frappe.db.bulk_insert(
+		'Inspection Checklist Template',
+		['name', 'template_name', 'device_type', 'device', 'is_active', 'is_default', 'creation', 'modified', 'owner', 'modified_by'],
+		[(name, name, device_type, device, 1, 0, now, now, owner, owner) for name, device_type, device in new_templates]
+	)
+	frappe.db.bulk_insert(
+		'Inspection Checklist Item',
+		['name', 'creation', 'modified', 'owner', 'modified_by', 'parent', 'parenttype', 'parentfield', 'idx',
+			'item_name', 'category', 'is_mandatory', 'sort_order'],
+		[
+			(
+				f'{name}-{idx:02d}', now, now, owner, owner, name, 'Inspection Checklist Template', 'checklist_items', idx,
+				item_name, category, int(idx <= 3), idx
+			)
+			for name, _, _ in new_templates
+			for idx, (item_name, category) in enumerate(INSPECTION_ITEMS, 1)
+		]
+	)
+
+	# Bulk inserts skip the template hooks maintaining the resolution table
+	for device_type in {device_type for _, device_type, _ in new_templates}:
+		update_device_type_resolutions(device_type)
+	frappe.db.commit()
+
+
+def ensure_branches(count):
+	"""Create generated branches if they do not exist yet and return their names"""
+	now = now_datetime()
+	owner = frappe.session.user
+
+	branch_names = [f'{PREFIX} Branch {i:02d}' for i in range(1, max(cint(count), 1) + 1)]
+	frappe.db.bulk_insert(
+		'Branch', ['name', 'branch', 'creation', 'modified', 'owner', 'modified_by'],
+		[(b, b, now, now, owner, owner) for b in branch_names],
+		ignore_duplicates=True
+	)
+	frappe.db.commit()
+
+	return branch_names
+
+
+def ensure_customers(rng, count, chunk_size):
+	"""Create generated customers up to `count` and return their names"""
+	existing = frappe.db.count('Customer', {'name': ['like', f'{PREFIX}-CUST-%']})
+	now = now_datetime()
+	owner = frappe.session.user
+	customer_group = frappe.db.get_value('Customer Group', {'is_group': 0}, 'name') or 'All Customer Groups'
+	territory = frappe.db.get_value('Territory', {'is_group': 0}, 'name') or 'All Territories'
+
+	for start in range(existing, count, chunk_size):
+		values = []
+		for i in range(start + 1, min(start + chunk_size, count) + 1):
+			name = f'{PREFIX}-CUST-{i:07d}'
+			values.append((
+				name, f'Customer {i:07d}', 'Individual', customer_group, territory,
+				random_phone(rng), f'customer{i}@example.com', now, now, owner, owner
+			))
+		frappe.db.bulk_insert(
+			'Customer',
+			['name', 'customer_name', 'customer_type', 'customer_group', 'territory', 'mobile_no', 'email_id', 'creation', 'modified', 'owner', 'modified_by'],
+			values
+		)
+
+		# Bulk inserts skip the doc events maintaining the phone index
+		insert_rows([
+			index_row
+			for row in values
+			for index_row in get_index_rows('Customer', row[0], [row[0]], [row[5]], None)
+		])
+		frappe.db.commit()
+
+	return [f'{PREFIX}-CUST-{i:07d}' for i in range(1, count + 1)]
+
+
+def get_technicians():
+	"""Enabled system users orders can be assigned to"""
+	users = frappe.get_all(
+		'User',
+		filters={'enabled': 1, 'user_type': 'System User', 'name': ['not in', ['Guest']]},
+		pluck='name',
+		limit=50
+	)
+	return users or ['Administrator']
+
+
+def insert_orders(rng, offset, count, master, customer_names, technicians, priority_charges, days, inspection):
+	"""Bulk insert one chunk of Repair Orders with their child rows and logs"""
+	now = now_datetime()
+	owner = frappe.session.user
+	orders, defect_rows, inspection_rows, logs, payments = [], [], [], [], []
+
+	for i in range(offset + 1, offset + count + 1):
+		name = f'RO-{PREFIX}-{i:07d}'
+		# Taken in turn, so seeded datasets stay the same for any branch count
+		branch = master.branches[i % len(master.branches)]
+		device = rng.choices(master.devices, weights=master.device_weights)[0]
+		booking_date = add_to_date(now, days=-rng.uniform(0, days))
+		age_days = (now - booking_date).days
+		status = weighted_choice(rng, ACTIVE_STATUS_WEIGHTS if age_days < 14 else CLOSED_STATUS_WEIGHTS)
+		priority = weighted_choice(rng, PRIORITY_WEIGHTS)
+
+		defect_count = min(1 + int(rng.expovariate(1.6)), len(master.defects[device.name]))
+		selected = rng.sample(master.defects[device.name], defect_count)
+		for idx, defect in enumerate(selected, 1):
+			defect_rows.append((
+				random_name(rng), now, now, owner, owner, name, 'Repair Order', 'defects', idx,
+				defect.name, defect.title, defect.estimated_time, defect.cost_amount, defect.selling_price
+			))
+
+		if inspection:
+			for idx, (item_name, category) in enumerate(INSPECTION_ITEMS, 1):
+				failed = rng.random() < 0.08
+				inspection_rows.append((
+					random_name(rng), now, now, owner, owner, name, 'Repair Order', 'device_inspection', idx,
+					item_name, category, 'Fail' if failed else 'Pass', int(failed), 0, ''
+				))
+
+		total_service = sum(defect.selling_price for defect in selected)
+		priority_charge = flt(priority_charges.get(priority))
+		tax_amount = (total_service + priority_charge) * TAX_RATE
+		grand_total = total_service + priority_charge + tax_amount
+		estimated_minutes = sum(defect.estimated_time for defect in selected)
+		expected_completion = add_to_date(booking_date, hours=estimated_minutes * 1.2 / 60)
+
+		actual_completion = None
+		if status in ('Completed', 'Ready for Pickup', 'Delivered'):
+			actual_completion = add_to_date(booking_date, hours=estimated_minutes / 60 * rng.lognormvariate(1.2, 0.7))
+
+		paid_amount = grand_total if status == 'Delivered' else rng.choice([0, 0, grand_total * 0.5])
+		payment_status = 'Paid' if paid_amount >= grand_total else ('Partially Paid' if paid_amount else 'Unpaid')
+		customer = customer_names[rng.randrange(len(customer_names))]
+		if paid_amount:
+			payment_date = actual_completion or booking_date
+			payments.append((
+				f'{name}-PAY-001', payment_date, payment_date, owner, owner, 1,
+				name, customer, branch, payment_date, paid_amount
+			))
+
+		orders.append((
+			name, booking_date, actual_completion or booking_date, owner, owner,
+			customer, None, random_phone(rng), None,
+			device.brand, device.name, device.name, random_serial(rng),
+			status, priority, rng.choice(technicians), branch,
+			total_service, priority_charge, tax_amount, grand_total, paid_amount, grand_total - paid_amount, payment_status,
+			f'RB-{PREFIX[0]}{i:07d}', booking_date, expected_completion, actual_completion,
+			estimated_minutes, len(selected), get_defect_summary(defect.title for defect in selected)
+		))
+
+		logs.extend(make_logs(rng, name, branch, status, booking_date, actual_completion, technicians, now))
+
+	frappe.db.bulk_insert('Repair Order', [
+		'name', 'creation', 'modified', 'owner', 'modified_by',
+		'customer', 'customer_name', 'contact_number', 'email',
+		'brand', 'device', 'device_model', 'serial_number',
+		'status', 'priority', 'assigned_to', 'branch',
+		'total_service_amount', 'priority_charge', 'tax_amount', 'grand_total',
+		'paid_amount', 'outstanding_amount', 'payment_status',
+		'tracking_id', 'booking_date', 'expected_completion', 'actual_completion',
+		'estimated_minutes', 'defect_count', 'defect_summary'
+	], orders)
+
+	frappe.db.bulk_insert('Repair Order Defect', [
+		'name', 'creation', 'modified', 'owner', 'modified_by', 'parent', 'parenttype', 'parentfield', 'idx',
+		'defect', 'defect_title', 'estimated_time', 'cost_amount', 'selling_price'
+	], defect_rows)
+
+	if inspection_rows:
+		frappe.db.bulk_insert('Device Inspection Item', [
+			'name', 'creation', 'modified', 'owner', 'modified_by', 'parent', 'parenttype', 'parentfield', 'idx',
+			'item_name', 'category', 'status', 'is_defective', 'is_mandatory', 'notes'
+		], inspection_rows)
+
+	frappe.db.bulk_insert('Repair Log', [
+		'name', 'creation', 'modified', 'owner', 'modified_by',
+		'repair_order', 'branch', 'log_date', 'status', 'updated_by', 'notes', 'notify_customer', 'is_public'
+	], logs)
+
+	if payments:
+		frappe.db.bulk_insert('Repair Payment', [
+			'name', 'creation', 'modified', 'owner', 'modified_by', 'docstatus',
+			'repair_order', 'customer', 'branch', 'payment_date', 'amount'
+		], payments)
+		frappe.db.bulk_insert('Series', ['name', 'current'], [(f'{row[6]}-PAY-', 1) for row in payments], ignore_duplicates=True)
+
+
+def make_logs(rng, repair_order, branch, status, booking_date, actual_completion, technicians, now):
+	"""Repair Logs walking the order through the status path up to its current status"""
+	path = STATUS_PATH[:STATUS_PATH.index(status) + 1] if status in STATUS_PATH else ['Pending Review', status]
+	end = actual_completion or now
+	span_hours = max((end - booking_date).total_seconds() / 3600, 1)
+
+	logs = []
+	log_date = booking_date
+	for idx, log_status in enumerate(path, 1):
+		logs.append((
+			f'{repair_order}-LOG-{idx:05d}', log_date, log_date, 'Administrator', 'Administrator',
+			repair_order, branch, log_date, log_status, rng.choice(technicians),
+			f'Status changed to {log_status}', 0, int(rng.random() < 0.7)
+		))
+		log_date = add_to_date(log_date, hours=rng.uniform(0, span_hours / len(path)))
+
+	return logs
+
+
+def purge():
+	"""Delete all generated records and rebuild the aggregates they fed"""
+	orders = f'RO-{PREFIX}-%'
+	frappe.db.sql("DELETE FROM `tabRepair Log` WHERE repair_order LIKE %s", orders)
+	frappe.db.sql("DELETE FROM `tabRepair Event` WHERE repair_order LIKE %s", orders)
+	frappe.db.sql("DELETE FROM `tabRepair Status Interval` WHERE repair_order LIKE %s", orders)
+	frappe.db.sql("DELETE FROM `tabRepair Payment` WHERE repair_order LIKE %s", orders)
+	frappe.db.sql("DELETE FROM `tabSeries` WHERE name LIKE %s", f'RO-{PREFIX}-%-PAY-')
+	frappe.db.sql("DELETE FROM `tabRepair Order Defect` WHERE parent LIKE %s", orders)
+	frappe.db.sql("DELETE FROM `tabDevice Inspection Item` WHERE parent LIKE %s", orders)
+	frappe.db.sql("DELETE FROM `tabRepair Order` WHERE name LIKE %s", orders)
+	frappe.db.sql("DELETE FROM `tabCustomer Phone Index` WHERE customer LIKE %s", f'{PREFIX}-CUST-%')
+	frappe.db.sql("DELETE FROM `tabCustomer` WHERE name LIKE %s", f'{PREFIX}-CUST-%')
+	frappe.db.sql("DELETE FROM `tabDefect` WHERE name LIKE %s", f'{PREFIX} %')
+	frappe.db.sql("DELETE FROM `tabInspection Template Resolution` WHERE name LIKE %s", f'{PREFIX} %')
+	# Other devices that resolved to a generated template fall back to their next best one
+	devices = frappe.db.sql_list("""
+		SELECT name FROM `tabInspection Template Resolution`
+		WHERE template LIKE %s
+	""", f'{PREFIX} %')
+	frappe.db.sql("DELETE FROM `tabInspection Checklist Item` WHERE parent LIKE %s", f'{PREFIX} %')
+	frappe.db.sql("DELETE FROM `tabInspection Checklist Template` WHERE name LIKE %s", f'{PREFIX} %')
+	for device in devices:
+		update_device_resolution(device)
+	frappe.db.sql("DELETE FROM `tabDevice` WHERE name LIKE %s", f'{PREFIX} %')
+	frappe.db.sql("DELETE FROM `tabBrand` WHERE name LIKE %s", f'{PREFIX} %')
+	frappe.db.sql("DELETE FROM `tabBranch` WHERE name LIKE %s", f'{PREFIX} Branch %')
+	rebuild_workloads()
+	rebuild_completion_stats()
+	frappe.db.commit()
+
+
+def weighted_choice(rng, weights):
+	"""Pick a key of `weights` with probability proportional to its value"""
+	return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def random_phone(rng):
+	return '+216 ' + ''.join(rng.choices(string.digits, k=8))
+
+
+def random_serial(rng):
+	return ''.join(rng.choices(string.ascii_uppercase + string.digits, k=12))
+
+
+def random_name(rng):
+	return ''.join(rng.choices(string.ascii_lowercase + string.digits, k=10))
@@ -0,0 +1,143 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Benchmark of device inspection storage modes.
+
+Inserts and re-saves the same Repair Orders with inspection results stored as
+Device Inspection Item rows and as a compact JSON payload, then reports save
+times and stored size. All records are rolled back at the end.
+
+	bench --site <site> execute repairbox.benchmarks.inspection_storage.run --kwargs "{'orders': 200}"
+"""
+
+import json
+import statistics
+import time
+
+import frappe
+
+from repairbox.repairbox.inspection_storage import ROW_FIELDS
+
+STATUSES = ('Pass', 'Pass', 'Pass', 'Fail', 'Not Tested')
+
+
+def run(orders=100, items=45, output=None):
+	"""Benchmark both storage modes and print the results as JSON"""
+	fixture = get_fixture()
+	results = {'orders': orders, 'items_per_order': items, 'modes': {}}
+
+	frappe.flags.mute_emails = True
+	try:
+		for mode in ('rows', 'compact'):
+			frappe.flags.repairbox_compact_inspection = mode == 'compact'
+			results['modes'][mode] = benchmark_mode(fixture, orders, items)
+	finally:
+		frappe.flags.repairbox_compact_inspection = None
+		frappe.flags.mute_emails = False
+		frappe.db.rollback()
+
+	report = json.dumps(results, indent=2, default=str)
+	if output:
+		with open(output, 'w') as f:
+			f.write(report)
+
+	print(report)
+	return results
+
+
+def get_fixture():
+	"""Pick existing master data to build benchmark orders from"""
+	fixture = frappe._dict(
+		customer=frappe.db.get_value('Customer', {}, 'name'),
+		device=frappe.db.get_value('Device', {'is_active': 1}, ['name', 'brand'], as_dict=True),
+		status=frappe.db.get_value('Repair Status', {'is_default': 1}, 'name') or 'Pending Review',
+		priority=frappe.db.get_value('Repair Priority', {'is_default': 1}, 'name') or 'Standard'
+	)
+
+	if not fixture.customer or not fixture.device:
+		frappe.throw('Create at least one Customer and one active Device before running the benchmark')
+
+	return fixture
+
+
+def make_order(fixture, items):
+	"""Build a Repair Order with `items` inspection rows"""
+	return frappe.get_doc({
+		'doctype': 'Repair Order',
+		'customer': fixture.customer,
+		'brand': fixture.device.brand,
+		'device': fixture.device.name,
+		'status': fixture.status,
+		'priority': fixture.priority,
+		'device_inspection': [
+			{
+				'item_name': f'Check {idx}',
+				'category': 'Other',
+				'status': STATUSES[idx % len(STATUSES)],
+				'is_defective': int(STATUSES[idx % len(STATUSES)] == 'Fail'),
+				'notes': 'Scratched' if idx % 10 == 0 else ''
+			}
+			for idx in range(1, items + 1)
+		]
+	})
+
+
+def benchmark_mode(fixture, orders, items):
+	"""Time inserts and form-style re-saves, then measure what was stored"""
+	insert_times = []
+	save_times = []
+	names = []
+
+	for _ in range(orders):
+		doc = make_order(fixture, items)
+		start = time.perf_counter()
+		doc.insert(ignore_permissions=True)
+		insert_times.append(time.perf_counter() - start)
+		names.append(doc.name)
+
+		# Reload and save like the form does, including the onload expansion
+		doc = frappe.get_doc('Repair Order', doc.name)
+		doc.run_method('onload')
+		doc.technician_notes = 'Benchmark re-save'
+		start = time.perf_counter()
+		doc.save(ignore_permissions=True)
+		save_times.append(time.perf_counter() - start)
+
+	return {
+		'insert_ms': summarize(insert_times),
+		'save_ms': summarize(save_times),
+		'storage': measure_storage(names)
+	}
+
+
+def summarize(timings):
+	"""Mean and percentiles of a list of durations, in milliseconds"""
+	timings = sorted(t * 1000 for t in timings)
+	return {
+		'mean': round(statistics.mean(timings), 2),
+		'p50': round(timings[len(timings) // 2], 2),
+		'p95': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+		'max': round(timings[-1], 2)
+	}
+
+
+def measure_storage(names):
+	"""Count inspection rows and approximate stored bytes for the given orders"""
+	row_columns = ['name', 'parent', 'parenttype', 'parentfield', 'owner', 'modified_by'] + list(ROW_FIELDS)
+	rows, row_bytes = frappe.db.sql("""
+		SELECT COUNT(*), COALESCE(SUM(LENGTH(CONCAT_WS('', {columns}))), 0)
+		FROM `tabDevice Inspection Item`
+		WHERE parenttype = 'Repair Order' AND parent IN %s
+	""".format(columns=', '.join(f'`{c}`' for c in row_columns)), (tuple(names),))[0]
+
+	payload_bytes = frappe.db.sql("""
+		SELECT COALESCE(SUM(LENGTH(inspection_data)), 0)
+		FROM `tabRepair Order`
+		WHERE name IN %s
+	""", (tuple(names),))[0][0]
+
+	return {
+		'child_rows': rows,
+		'approx_bytes': int(row_bytes) + int(payload_bytes)
+	}
@@ -0,0 +1,347 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Concurrent save stress test.
+
+Worker processes replay a mix of intake (new Repair Orders), status changes
+(form saves), Repair Log inserts and default flag changes on Repair Status,
+Repair Priority and Inspection Checklist Template against a small pool of hot
+orders, so the writes contend for the same rows. The report lists throughput and latency per operation,
+failures by kind (deadlocks, lock wait timeouts, modified-timestamp
+conflicts), the database lock counters and lost status updates.
+
+	bench --site <site> repairbox-stress --workers 8 --duration 60
+
+Run it against a local copy only: pool orders keep the statuses written
+during the run. Orders and logs created by the run are deleted afterwards.
+"""
+
+import json
+import multiprocessing
+import random
+import time
+
+import frappe
+from frappe.utils import now_datetime
+
+from repairbox.benchmarks.inspection_storage import summarize
+from repairbox.repairbox.doctype.inspection_template_resolution.inspection_template_resolution import (
+	rebuild_all as rebuild_template_resolutions
+)
+from repairbox.repairbox.doctype.repair_order.repair_order import RepairOrderConflictError
+from repairbox.repairbox.doctype.technician_workload.technician_workload import rebuild_all as rebuild_workloads
+
+# Relative weight of each operation in the traffic mix
+DEFAULT_MIX = {'intake': 3, 'status': 4, 'log': 3, 'defaults': 1, 'template_default': 1}
+
+# Statuses a hot order is moved between
+STATUSES = ['In Progress', 'Testing', 'Awaiting Parts', 'On Hold', 'Ready for Pickup']
+
+# Status writes closer together than this cannot be ordered reliably across processes
+CLOCK_TOLERANCE = 0.05
+
+DEFAULT_FLAG_DOCTYPES = ('Repair Status', 'Repair Priority')
+
+# Has one default per device and per device type, cleared by scoped updates
+TEMPLATE_DOCTYPE = 'Inspection Checklist Template'
+
+
+def run(workers=8, duration=30, orders=20, mix=None, output=None, keep=False, seed=42):
+	"""Run the stress test from the current site and print the report"""
+	mix = parse_mix(mix)
+	pool = get_order_pool(orders)
+	defaults = get_defaults()
+	counters_before = get_lock_counters()
+	frappe.db.commit()
+
+	ctx = multiprocessing.get_context('spawn')
+	started = time.perf_counter()
+	with ctx.Pool(workers) as process_pool:
+		results = process_pool.starmap(worker, [
+			(frappe.local.site, frappe.local.sites_path, pool, mix, duration, seed + idx)
+			for idx in range(workers)
+		])
+	elapsed = time.perf_counter() - started
+
+	counters_after = get_lock_counters()
+	report = build_report(results, elapsed, workers, mix)
+	report['lock_counters'] = {
+		key: counters_after[key] - counters_before.get(key, 0) for key in counters_after
+	}
+	report['lost_updates'] = find_lost_updates(results)
+
+	restore_defaults(defaults)
+	if not keep:
+		delete_created(
+			[name for result in results for name in result['created']],
+			[name for result in results for name in result['logs']]
+		)
+	frappe.db.commit()
+
+	text = json.dumps(report, indent=2, default=str)
+	if output:
+		with open(output, 'w') as f:
+			f.write(text)
+
+	print(text)
+	return report
+
+
+def parse_mix(mix):
+	"""Accept a dict or an `op=weight,op=weight` string"""
+	if not mix:
+		return dict(DEFAULT_MIX)
+
+	if isinstance(mix, str):
+		mix = {op: int(weight) for op, weight in (part.split('=') for part in mix.split(','))}
+
+	unknown = set(mix) - set(OPERATIONS)
+	if unknown:
+		frappe.throw(f"Unknown operations: {', '.join(sorted(unknown))}")
+
+	return mix
+
+
+def get_order_pool(orders):
+	"""Open orders all workers write to"""
+	pool = frappe.get_all(
+		'Repair Order',
+		filters={'status': ['in', STATUSES]},
+		order_by='modified desc',
+		limit=orders,
+		pluck='name'
+	)
+	if not pool:
+		frappe.throw('No open Repair Orders found, generate data first')
+
+	return pool
+
+
+def worker(site, sites_path, pool, mix, duration, seed):
+	"""Replay random operations for `duration` seconds in a separate process"""
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	frappe.set_user('Administrator')
+	frappe.flags.mute_emails = True
+
+	rng = random.Random(seed)
+	ops, weights = list(mix), list(mix.values())
+	result = {'ops': {}, 'errors': [], 'status_writes': [], 'created': [], 'logs': []}
+
+	try:
+		deadline = time.time() + duration
+		while time.time() < deadline:
+			op = rng.choices(ops, weights=weights)[0]
+			stats = result['ops'].setdefault(op, {'ok': 0, 'timings': [], 'failures': {}})
+
+			start = time.perf_counter()
+			try:
+				written = OPERATIONS[op](rng, pool, result)
+				frappe.db.commit()
+			except Exception as e:
+				frappe.db.rollback()
+				kind = classify_error(e)
+				stats['failures'][kind] = stats['failures'].get(kind, 0) + 1
+				if kind == 'error' and len(result['errors']) < 10:
+					result['errors'].append(f'{op}: {e!r}')
+				continue
+
+			stats['ok'] += 1
+			stats['timings'].append(time.perf_counter() - start)
+			if written:
+				result['status_writes'].append((*written, time.time()))
+	finally:
+		frappe.destroy()
+
+	return result
+
+
+def classify_error(e):
+	if isinstance(e, frappe.QueryDeadlockError):
+		return 'deadlock'
+	if isinstance(e, frappe.QueryTimeoutError):
+		return 'lock_timeout'
+	if isinstance(e, (frappe.TimestampMismatchError, RepairOrderConflictError)):
+		return 'conflict'
+	if isinstance(e, frappe.ValidationError):
+		return 'validation'
+	return 'error'
+
+
+def op_intake(rng, pool, result):
+	"""Create a new order like the counter does"""
+	doc = frappe.copy_doc(frappe.get_doc('Repair Order', rng.choice(pool)))
+	doc.status = 'Pending Review'
+	doc.booking_date = now_datetime()
+	doc.expected_completion = None
+	doc.insert(ignore_permissions=True)
+	result['created'].append(doc.name)
+
+
+def op_status(rng, pool, result):
+	"""Move an order to another status from the form"""
+	doc = frappe.get_doc('Repair Order', rng.choice(pool))
+	doc.status = rng.choice([status for status in STATUSES if status != doc.status])
+	doc.save(ignore_permissions=True)
+	return doc.name, doc.status
+
+
+def op_log(rng, pool, result):
+	"""Add a Repair Log, which writes the order status directly"""
+	log = frappe.get_doc({
+		'doctype': 'Repair Log',
+		'repair_order': rng.choice(pool),
+		'status': rng.choice(STATUSES),
+		'notes': 'Stress test'
+	}).insert(ignore_permissions=True)
+	result['logs'].append(log.name)
+	return log.repair_order, log.status
+
+
+def op_defaults(rng, pool, result):
+	"""Make another status or priority the default"""
+	doctype = rng.choice(DEFAULT_FLAG_DOCTYPES)
+	doc = frappe.get_doc(doctype, rng.choice(frappe.get_all(doctype, pluck='name')))
+	doc.is_default = 1
+	doc.save(ignore_permissions=True)
+
+
+def op_template_default(rng, pool, result):
+	"""Make a checklist template the default of its device or device type"""
+	templates = frappe.get_all(TEMPLATE_DOCTYPE, filters={'is_active': 1}, pluck='name')
+	if not templates:
+		return
+
+	doc = frappe.get_doc(TEMPLATE_DOCTYPE, rng.choice(templates))
+	doc.is_default = 1
+	doc.save(ignore_permissions=True)
+
+
+OPERATIONS = {
+	'intake': op_intake,
+	'status': op_status,
+	'log': op_log,
+	'defaults': op_defaults,
+	'template_default': op_template_default
+}
+
+
+def build_report(results, elapsed, workers, mix):
+	"""Merge the worker results into throughput, latency and failure counts"""
+	report = {
+		'finished': str(now_datetime()),
+		'workers': workers,
+		'seconds': round(elapsed, 2),
+		'mix': mix,
+		'operations': {},
+		'errors': [error for result in results for error in result['errors']]
+	}
+
+	for op in mix:
+		ok = sum(result['ops'].get(op, {}).get('ok', 0) for result in results)
+		timings = [t for result in results for t in result['ops'].get(op, {}).get('timings', [])]
+		failures = {}
+		for result in results:
+			for kind, count in result['ops'].get(op, {}).get('failures', {}).items():
+				failures[kind] = failures.get(kind, 0) + count
+
+		report['operations'][op] = {
+			'ok': ok,
+			'per_second': round(ok / elapsed, 2),
+			'ms': summarize(timings) if timings else None,
+			'failures': failures
+		}
+
+	return report
+
+
+def find_lost_updates(results):
+	"""Orders whose final status differs from the last status committed to them"""
+	writes = {}
+	for result in results:
+		for order, status, committed_at in result['status_writes']:
+			writes.setdefault(order, []).append((committed_at, status))
+
+	if not writes:
+		return {'checked': 0, 'lost': []}
+
+	current = dict(frappe.get_all(
+		'Repair Order',
+		filters={'name': ['in', list(writes)]},
+		fields=['name', 'status'],
+		as_list=True
+	))
+
+	lost = []
+	for order, order_writes in writes.items():
+		order_writes.sort()
+		committed_at, status = order_writes[-1]
+		ambiguous = len(order_writes) > 1 and committed_at - order_writes[-2][0] < CLOCK_TOLERANCE
+		if not ambiguous and current.get(order) != status:
+			lost.append({'order': order, 'expected': status, 'actual': current.get(order)})
+
+	return {'checked': len(writes), 'lost': lost}
+
+
+def get_lock_counters():
+	"""Server-wide lock wait and deadlock counters"""
+	if frappe.db.db_type == 'postgres':
+		row = frappe.db.sql("""
+			SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()
+		""")
+		return {'deadlocks': row[0][0] if row else 0}
+
+	return {
+		name.lower(): int(value)
+		for name, value in frappe.db.sql("""
+			SHOW GLOBAL STATUS
+			WHERE Variable_name IN ('Innodb_row_lock_waits', 'Innodb_row_lock_time', 'Innodb_deadlocks')
+		""")
+	}
+
+
+def get_defaults():
+	defaults = {
+		doctype: frappe.db.get_value(doctype, {'is_default': 1}, 'name')
+		for doctype in DEFAULT_FLAG_DOCTYPES
+	}
+	defaults[TEMPLATE_DOCTYPE] = frappe.get_all(TEMPLATE_DOCTYPE, filters={'is_default': 1}, pluck='name')
+	return defaults
+
+
+def restore_defaults(defaults):
+	"""Put back the default status, priority and checklist templates changed by the run"""
+	for doctype in DEFAULT_FLAG_DOCTYPES:
+		frappe.db.sql(f"""
+			UPDATE `tab{doctype}`
+			SET is_default = CASE WHEN name = %s THEN 1 ELSE 0 END
+		""", (defaults[doctype] or '',))
+
+	frappe.db.sql(f"""
+		UPDATE `tab{TEMPLATE_DOCTYPE}`
+		SET is_default = CASE WHEN name IN %s THEN 1 ELSE 0 END
+	""", (tuple(defaults[TEMPLATE_DOCTYPE]) or ('',),))
+	# Template saves during the run resolved devices to the defaults of the moment
+	rebuild_template_resolutions()
+
+
+def delete_created(orders, logs):
+	"""Remove the orders and logs created during the run with their events, and recount workloads"""
+	for start in range(0, len(logs), 1000):
+		batch = tuple(logs[start:start + 1000])
+		frappe.db.sql("DELETE FROM `tabRepair Log` WHERE name IN %s", (batch,))
+		frappe.db.sql(
+			"DELETE FROM `tabRepair Event` WHERE reference_doctype = 'Repair Log' AND reference_name IN %s", (batch,)
+		)
+
+	for start in range(0, len(orders), 1000):
+		batch = tuple(orders[start:start + 1000])
+		frappe.db.sql("DELETE FROM `tabRepair Log` WHERE repair_order IN %s", (batch,))
+		frappe.db.sql("DELETE FROM `tabRepair Event` WHERE repair_order IN %s", (batch,))
+		frappe.db.sql("DELETE FROM `tabRepair Status Interval` WHERE repair_order IN %s", (batch,))
+		for child in ('Repair Order Defect', 'Device Inspection Item'):
+			frappe.db.sql(f"DELETE FROM `tab{child}` WHERE parenttype = 'Repair Order' AND parent IN %s", (batch,))
+		frappe.db.sql("DELETE FROM `tabRepair Order` WHERE name IN %s", (batch,))
+
+	rebuild_workloads()
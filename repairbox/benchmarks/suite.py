@@ -0,0 +1,332 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Benchmark suite for RepairBox endpoints and document save paths.
+
+For every requested scale the generated dataset is topped up to that many
+Repair Orders (see `data_generator`), then every registered benchmark is run
+and its latency, query count and rows returned are recorded. Results are written
+as JSON after each scale so long runs keep partial results:
+
+	bench --site <site> repairbox-benchmark --scales 10000,100000,1000000
+	bench --site <site> execute repairbox.benchmarks.suite.run --kwargs "{'scales': '10000'}"
+
+Benchmarks that write are rolled back, so the dataset stays the same between
+runs and scales.
+"""
+
+import json
+import random
+
+import frappe
+from frappe.utils import now_datetime
+
+import repairbox
+from repairbox.benchmarks import data_generator
+from repairbox.benchmarks.inspection_storage import summarize
+from repairbox.repairbox.doctype.repair_order.repair_order import (
+	TIMELINE_CACHE_KEY,
+	get_inspection_checklist,
+	get_my_repairs,
+	get_overdue_repairs,
+	get_repair_timeline,
+	lookup_customers_by_phone,
+	quick_create_customer
+)
+from repairbox.repairbox.doctype.technician_workload.technician_workload import get_technicians
+from repairbox.repairbox.kanban import KANBAN_CACHE_KEY, get_kanban_data
+from repairbox.repairbox.permissions import is_restricted_technician
+from repairbox.repairbox.profiling import measure
+
+DEFAULT_SCALES = (10000, 100000, 1000000)
+
+# Columns of the Repair Order list view
+LIST_FIELDS = [
+	'name', 'customer', 'status', 'device', 'defect_count', 'defect_summary',
+	'grand_total', 'payment_status', 'modified'
+]
+
+# Registered benchmarks in run order, see `benchmark`
+BENCHMARKS = []
+
+
+def benchmark(name, writes=False, setup=None):
+	"""
+	Register a benchmark function taking the suite context.
+
+	`setup` runs before every iteration outside the measurement, e.g. to clear
+	a cache. Benchmarks that `writes` are rolled back after their iterations.
+	"""
+	def decorator(fn):
+		BENCHMARKS.append(frappe._dict(name=name, fn=fn, writes=writes, setup=setup))
+		return fn
+
+	return decorator
+
+
+def run(scales=None, iterations=20, output='repairbox-benchmark.json', generate=True, only=None):
+	"""Run the suite at each scale and write the results to `output`"""
+	scales = parse_scales(scales)
+	only = set(only.split(',')) if isinstance(only, str) else set(only or [])
+
+	results = {
+		'started': str(now_datetime()),
+		'repairbox_version': repairbox.__version__,
+		'frappe_version': frappe.__version__,
+		'db_type': frappe.conf.db_type or 'mariadb',
+		'iterations': iterations,
+		'scales': []
+	}
+
+	frappe.flags.mute_emails = True
+	try:
+		for scale in scales:
+			if generate:
+				missing = scale - data_generator.count_orders()
+				if missing > 0:
+					print(f"Generating {missing} orders for scale {scale}")
+					data_generator.generate(orders=missing)
+
+			print(f"Running benchmarks at {scale} orders")
+			results['scales'].append({
+				'orders': frappe.db.count('Repair Order'),
+				'benchmarks': run_scale(get_context(), iterations, only)
+			})
+			write_results(results, output)
+	finally:
+		frappe.flags.mute_emails = False
+
+	return results
+
+
+def parse_scales(scales):
+	"""Accept a list of ints or a comma separated string"""
+	if not scales:
+		return list(DEFAULT_SCALES)
+
+	if isinstance(scales, str):
+		scales = scales.split(',')
+
+	return sorted(int(scale) for scale in scales)
+
+
+def run_scale(context, iterations, only=None):
+	"""Run every registered benchmark against the current dataset"""
+	results = {}
+	for bench in BENCHMARKS:
+		if only and bench.name not in only:
+			continue
+
+		results[bench.name] = run_benchmark(bench, context, iterations)
+		print(f"  {bench.name}: p50 {results[bench.name]['ms']['p50']} ms")
+
+	return results
+
+
+def run_benchmark(bench, context, iterations):
+	"""Time `iterations` calls of one benchmark after a warm-up call"""
+	timings, queries, rows = [], [], []
+
+	try:
+		for iteration in range(iterations + 1):
+			if bench.setup:
+				bench.setup(context)
+
+			with measure() as counter:
+				bench.fn(context)
+
+			# The first call only warms up caches and connections
+			if iteration:
+				timings.append(counter.elapsed_ms / 1000)
+				queries.append(counter.queries)
+				rows.append(counter.rows)
+	finally:
+		if bench.writes:
+			frappe.db.rollback()
+
+	return {
+		'ms': summarize(timings),
+		'queries': {'mean': round(sum(queries) / len(queries), 2), 'max': max(queries)},
+		'rows': {'mean': round(sum(rows) / len(rows), 2), 'max': max(rows)}
+	}
+
+
+def get_context():
+	"""Pick the records the benchmarks work on"""
+	rng = random.Random(42)
+
+	orders = frappe.get_all(
+		'Repair Order',
+		filters={'status': ['not in', ['Delivered', 'Cancelled']]},
+		fields=['name', 'device', 'assigned_to', 'customer'],
+		order_by='modified desc',
+		limit=50
+	)
+	if not orders:
+		frappe.throw('Generate data before running the benchmark suite')
+
+	order = rng.choice(orders)
+	return frappe._dict(
+		rng=rng,
+		orders=[o.name for o in orders],
+		order=order.name,
+		device=order.device,
+		customer=order.customer,
+		phone=frappe.db.get_value('Customer', order.customer, 'mobile_no'),
+		technician=order.assigned_to or 'Administrator',
+		list_technician=get_list_technician(),
+		statuses=['In Progress', 'Testing', 'Awaiting Parts', 'On Hold']
+	)
+
+
+def get_list_technician():
+	"""Technician restricted to their assigned orders, for the list view benchmarks"""
+	technician = next((user for user in get_technicians() if is_restricted_technician(user)), None)
+	if not technician:
+		print("No user with only the Technician role, technician lists are measured unrestricted")
+
+	return technician or 'Administrator'
+
+
+def write_results(results, output):
+	"""Write results as JSON, replacing the previous file"""
+	if not output:
+		print(json.dumps(results, indent=2, default=str))
+		return
+
+	with open(output, 'w') as f:
+		json.dump(results, f, indent=2, default=str)
+
+
+def clear_timeline(context):
+	frappe.cache().hdel(TIMELINE_CACHE_KEY, context.order)
+
+
+def clear_kanban(context):
+	frappe.cache().delete_value(KANBAN_CACHE_KEY)
+
+
+def new_request(context):
+	"""Forget what was resolved for the current request, like a new request would"""
+	frappe.flags.pop('repairbox_restricted_technicians', None)
+
+
+def run_as(user, fn):
+	current = frappe.session.user
+	frappe.set_user(user)
+	try:
+		return fn()
+	finally:
+		frappe.set_user(current)
+
+
+# Endpoints
+
+@benchmark('get_my_repairs')
+def bench_get_my_repairs(context):
+	run_as(context.technician, get_my_repairs)
+
+
+@benchmark('get_overdue_repairs')
+def bench_get_overdue_repairs(context):
+	get_overdue_repairs()
+
+
+@benchmark('get_inspection_checklist')
+def bench_get_inspection_checklist(context):
+	get_inspection_checklist(context.device)
+
+
+@benchmark('get_repair_timeline.cold', setup=clear_timeline)
+def bench_get_repair_timeline_cold(context):
+	get_repair_timeline(context.order)
+
+
+@benchmark('get_repair_timeline.cached')
+def bench_get_repair_timeline(context):
+	get_repair_timeline(context.order, public_only=1)
+
+
+@benchmark('get_kanban_data.cold', setup=clear_kanban)
+def bench_get_kanban_data_cold(context):
+	get_kanban_data()
+
+
+@benchmark('get_kanban_data.delta')
+def bench_get_kanban_data_delta(context):
+	get_kanban_data(since=now_datetime())
+
+
+# List views of a technician, with the permission query conditions applied
+
+@benchmark('repair_order.list.technician', setup=new_request)
+def bench_list_repair_orders_technician(context):
+	run_as(context.list_technician, lambda: frappe.get_list(
+		'Repair Order', fields=LIST_FIELDS, order_by='modified desc', limit_page_length=20
+	))
+
+
+@benchmark('repair_order.count.technician', setup=new_request)
+def bench_count_repair_orders_technician(context):
+	run_as(context.list_technician, lambda: frappe.get_list(
+		'Repair Order', fields=['count(*) as count'], limit_page_length=0
+	))
+
+
+@benchmark('repair_log.list.technician', setup=new_request)
+def bench_list_repair_logs_technician(context):
+	run_as(context.list_technician, lambda: frappe.get_list(
+		'Repair Log',
+		fields=['name', 'repair_order', 'status', 'log_date', 'updated_by'],
+		order_by='log_date desc',
+		limit_page_length=20
+	))
+
+
+@benchmark('lookup_customers_by_phone')
+def bench_lookup_customers_by_phone(context):
+	lookup_customers_by_phone(context.phone)
+
+
+@benchmark('quick_create_customer', writes=True)
+def bench_quick_create_customer(context):
+	quick_create_customer(
+		f'Benchmark Customer {frappe.generate_hash(length=8)}',
+		data_generator.random_phone(context.rng)
+	)
+
+
+# Save paths
+
+@benchmark('repair_order.insert', writes=True)
+def bench_insert_repair_order(context):
+	source = frappe.get_doc('Repair Order', context.order)
+	doc = frappe.copy_doc(source)
+	doc.expected_completion = None
+	doc.insert(ignore_permissions=True)
+
+
+@benchmark('repair_order.save', writes=True)
+def bench_save_repair_order(context):
+	doc = frappe.get_doc('Repair Order', context.rng.choice(context.orders))
+	doc.technician_notes = f'Benchmark {frappe.generate_hash(length=6)}'
+	doc.save(ignore_permissions=True)
+
+
+@benchmark('repair_order.status_change', writes=True)
+def bench_change_status(context):
+	doc = frappe.get_doc('Repair Order', context.rng.choice(context.orders))
+	doc.status = context.rng.choice([s for s in context.statuses if s != doc.status])
+	doc.save(ignore_permissions=True)
+
+
+@benchmark('repair_log.insert', writes=True)
+def bench_insert_repair_log(context):
+	frappe.get_doc({
+		'doctype': 'Repair Log',
+		'repair_order': context.rng.choice(context.orders),
+		'log_date': now_datetime(),
+		'status': context.rng.choice(context.statuses),
+		'notes': 'Benchmark log'
+	}).insert(ignore_permissions=True)
@@ -0,0 +1,132 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command('repairbox-generate-data')
+@click.option('--orders', default=10000, type=int, help='Number of Repair Orders to add')
+@click.option('--chunk-size', default=5000, type=int, help='Orders inserted per commit')
+@click.option('--branches', default=3, type=int, help='Number of branches the orders are spread over')
+@click.option('--seed', default=42, type=int)
+@click.option('--purge', is_flag=True, default=False, help='Delete generated data instead')
+@pass_context
+def generate_data(context, orders, chunk_size, branches, seed, purge):
+	"""Generate synthetic RepairBox data for load tests"""
+	from repairbox.benchmarks import data_generator
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		if purge:
+			data_generator.purge()
+		else:
+			data_generator.generate(orders=orders, chunk_size=chunk_size, branches=branches, seed=seed)
+	finally:
+		frappe.destroy()
+
+
+@click.command('repairbox-benchmark')
+@click.option('--scales', default='10000,100000,1000000', help='Comma separated Repair Order counts')
+@click.option('--iterations', default=20, type=int, help='Timed calls per benchmark')
+@click.option('--output', default='repairbox-benchmark.json', help='Path of the JSON results file')
+@click.option('--only', default=None, help='Comma separated benchmark names to run')
+@click.option('--no-generate', is_flag=True, default=False, help='Use the existing data as is')
+@pass_context
+def benchmark(context, scales, iterations, output, only, no_generate):
+	"""Benchmark RepairBox endpoints and save paths at increasing data volumes"""
+	from repairbox.benchmarks import suite
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		suite.run(
+			scales=scales,
+			iterations=iterations,
+			output=output,
+			generate=not no_generate,
+			only=only
+		)
+	finally:
+		frappe.destroy()
+
+
+@click.command('repairbox-stress')
+@click.option('--workers', default=8, type=int, help='Number of worker processes')
+@click.option('--duration', default=30, type=int, help='Seconds each worker runs')
+@click.option('--orders', default=20, type=int, help='Size of the pool of contended orders')
+@click.option('--mix', default=None, help='Operation weights, e.g. intake=3,status=4,log=3,defaults=1,template_default=1')
+@click.option('--output', default=None, help='Path of the JSON report')
+@click.option('--keep', is_flag=True, default=False, help='Keep the orders and logs created by the run')
+@pass_context
+def stress(context, workers, duration, orders, mix, output, keep):
+	"""Replay concurrent RepairBox writes and report lock contention"""
+	from repairbox.benchmarks import stress
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		stress.run(
+			workers=workers,
+			duration=duration,
+			orders=orders,
+			mix=mix,
+			output=output,
+			keep=keep
+		)
+	finally:
+		frappe.destroy()
+
+
+@click.command('repairbox-export-orders')
+@click.option('--from-date', default=None, help='First booking date to include')
+@click.option('--to-date', default=None, help='Last booking date to include')
+@click.option('--status', default=None, help='Only orders in this status')
+@click.option('--branch', 'branches', multiple=True, help='Only orders of this branch, repeatable')
+@click.option('--format', 'file_format', default='csv', type=click.Choice(['csv', 'xlsx', 'jsonl']))
+@click.option('--output', default=None, help='Path of the export file')
+@click.option('--chunk-size', default=1000, type=int, help='Orders read per query')
+@pass_context
+def export_orders(context, from_date, to_date, status, branches, file_format, output, chunk_size):
+	"""Export Repair Orders with their defects and inspection rows"""
+	from repairbox.repairbox.export import export_repair_orders
+
+	output = output or f'repair-orders.{file_format}'
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		with open(output, 'wb') as f:
+			count = export_repair_orders(
+				f,
+				file_format,
+				from_date=from_date,
+				to_date=to_date,
+				status=status,
+				branches=branches,
+				chunk_size=chunk_size
+			)
+		print(f"Exported {count} orders to {output}")
+	finally:
+		frappe.destroy()
+
+
+@click.command('repairbox-generate-thumbnails')
+@click.option('--workers', default=4, type=int, help='Number of worker processes')
+@click.option('--force', is_flag=True, default=False, help='Also regenerate existing thumbnails')
+@pass_context
+def generate_thumbnails(context, workers, force):
+	"""Generate thumbnail variants of existing Device images"""
+	from repairbox.repairbox.thumbnails import backfill
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		backfill(workers=workers, force=force)
+	finally:
+		frappe.destroy()
+
+
+commands = [generate_data, benchmark, stress, export_orders, generate_thumbnails]
@@ -51,6 +51,80 @@ fixtures = [
 	}
 ]
 
+# Scheduled Tasks
+# ---------------
+scheduler_events = {
+	"daily": [
+		"repairbox.repairbox.doctype.technician_workload.technician_workload.report_workload_drift",
+		"repairbox.repairbox.doctype.completion_time_stat.completion_time_stat.rebuild_completion_stats",
+		"repairbox.repairbox.outbox.purge_old_events"
+	],
+	"daily_long": [
+		"repairbox.repairbox.retention.purge_expired_pii",
+		"repairbox.repairbox.invoicing.invoice_delivered_orders_daily"
+	],
+	"cron": {
+		"* * * * *": [
+			"repairbox.repairbox.outbox.enqueue_dispatch"
+		],
+		"*/5 * * * *": [
+			"repairbox.repairbox.profiling.flush_profile_samples"
+		]
+	}
+}
+
+# Document Events
+# ---------------
+# Keep the customer phone index in sync with Customers and Contacts, and the
+# cached branches of users with their User Permissions
+doc_events = {
+	"Customer": {
+		"on_update": "repairbox.repairbox.doctype.customer_phone_index.customer_phone_index.update_customer_phones",
+		"on_trash": "repairbox.repairbox.doctype.customer_phone_index.customer_phone_index.delete_phones",
+		"after_rename": "repairbox.repairbox.doctype.customer_phone_index.customer_phone_index.rename_customer_phones"
+	},
+	"Contact": {
+		"on_update": "repairbox.repairbox.doctype.customer_phone_index.customer_phone_index.update_contact_phones",
+		"on_trash": "repairbox.repairbox.doctype.customer_phone_index.customer_phone_index.delete_phones"
+	},
+	"User Permission": {
+		"on_update": "repairbox.repairbox.branch.clear_user_branches_cache",
+		"after_delete": "repairbox.repairbox.branch.clear_user_branches_cache"
+	}
+}
+
+# Permissions
+# -----------
+# Users with User Permissions on Branch only see the records of their branches,
+# technicians only the orders assigned to them
+permission_query_conditions = {
+	"Repair Order": "repairbox.repairbox.permissions.repair_order_query",
+	"Repair Log": "repairbox.repairbox.permissions.repair_log_query",
+	"Repair Payment": "repairbox.repairbox.permissions.repair_payment_query",
+	"Repair Status Interval": "repairbox.repairbox.permissions.repair_status_interval_query"
+}
+
+has_permission = {
+	"Repair Order": "repairbox.repairbox.permissions.has_permission",
+	"Repair Log": "repairbox.repairbox.permissions.has_permission",
+	"Repair Payment": "repairbox.repairbox.permissions.has_permission",
+	"Repair Status Interval": "repairbox.repairbox.permissions.has_permission"
+}
+
+# Repair Events
+# -------------
+# Consumers of the event outbox, enabled by name in RepairBox Settings
+repairbox_event_consumers = {
+	"file": "repairbox.repairbox.outbox.FileConsumer"
+}
+
+# Log Clearing
+# ------------
+# Days to keep records before they are deleted by the daily log cleanup
+default_log_clearing_doctypes = {
+	"RepairBox Profile Summary": 30
+}
+
 # Installation
 # ------------
 after_install = "repairbox.setup.install.after_install"
@@ -60,7 +134,7 @@ after_install = "repairbox.setup.install.after_install"
 
 # include js, css files in header of desk.html
 app_include_css = "/assets/repairbox/css/repairbox.css"
-# app_include_js = "/assets/repairbox/js/repairbox.js"
+app_include_js = "/assets/repairbox/js/repairbox.js"
 
 # include js, css files in header of web template
 # web_include_css = "/assets/repairbox/css/repairbox.css"
@@ -0,0 +1,10 @@
+import frappe
+
+from repairbox.repairbox.doctype.customer_phone_index.customer_phone_index import rebuild_all
+
+
+def execute():
+	"""Index the phone numbers of existing customers and their contacts"""
+	frappe.reload_doc('repairbox', 'doctype', 'customer_phone_index')
+	frappe.reload_doc('repairbox', 'doctype', 'repairbox_settings')
+	rebuild_all()
@@ -0,0 +1,9 @@
+import frappe
+
+from repairbox.repairbox.doctype.inspection_template_resolution.inspection_template_resolution import rebuild_all
+
+
+def execute():
+	"""Resolve the inspection template of every existing device"""
+	frappe.reload_doc('repairbox', 'doctype', 'inspection_template_resolution')
+	rebuild_all()
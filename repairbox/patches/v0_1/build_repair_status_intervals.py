@@ -0,0 +1,9 @@
+import frappe
+
+from repairbox.repairbox.doctype.repair_status_interval.repair_status_interval import rebuild_all
+
+
+def execute():
+	"""Build status stints of existing orders from their Repair Logs"""
+	frappe.reload_doc('repairbox', 'doctype', 'repair_status_interval')
+	rebuild_all()
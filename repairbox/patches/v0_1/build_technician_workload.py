@@ -0,0 +1,22 @@
+import frappe
+
+from repairbox.repairbox.doctype.technician_workload.technician_workload import rebuild_all
+
+
+def execute():
+	"""Store the estimated time of existing orders and compute technician workloads"""
+	frappe.reload_doc('repairbox', 'doctype', 'repair_order')
+	frappe.reload_doc('repairbox', 'doctype', 'technician_workload')
+
+	frappe.db.sql("""
+		UPDATE `tabRepair Order` ro
+		JOIN (
+			SELECT parent, SUM(estimated_time) AS minutes
+			FROM `tabRepair Order Defect`
+			WHERE parenttype = 'Repair Order' AND parentfield = 'defects'
+			GROUP BY parent
+		) defects ON defects.parent = ro.name
+		SET ro.estimated_minutes = defects.minutes
+	""")
+
+	rebuild_all()
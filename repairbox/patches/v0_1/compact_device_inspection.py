@@ -0,0 +1,12 @@
+import frappe
+
+from repairbox.repairbox.inspection_storage import is_compact_storage_enabled, migrate_to_compact
+
+
+def execute():
+	"""Pack existing inspection rows for sites that enabled compact storage"""
+	frappe.reload_doc('repairbox', 'doctype', 'repairbox_settings')
+	frappe.reload_doc('repairbox', 'doctype', 'repair_order')
+
+	if is_compact_storage_enabled():
+		migrate_to_compact()
@@ -0,0 +1,48 @@
+import frappe
+from frappe.utils import now_datetime
+
+
+def execute():
+	"""Record paid amounts entered by hand as opening payments and set outstanding amounts"""
+	frappe.reload_doc('repairbox', 'doctype', 'repair_order')
+	frappe.reload_doc('repairbox', 'doctype', 'repair_payment')
+
+	frappe.db.sql("""
+		UPDATE `tabRepair Order`
+		SET outstanding_amount = grand_total - paid_amount
+	""")
+
+	now = now_datetime()
+	user = frappe.session.user
+	orders = frappe.db.sql("""
+		SELECT name, customer, paid_amount, modified
+		FROM `tabRepair Order`
+		WHERE paid_amount > 0
+		AND NOT EXISTS (
+			SELECT 1 FROM `tabRepair Payment` payment WHERE payment.repair_order = `tabRepair Order`.name
+		)
+	""")
+
+	for start in range(0, len(orders), 1000):
+		frappe.db.bulk_insert(
+			'Repair Payment',
+			fields=[
+				'name', 'repair_order', 'customer', 'payment_date', 'amount', 'remarks',
+				'docstatus', 'creation', 'modified', 'owner', 'modified_by'
+			],
+			values=[
+				(
+					f'{name}-PAY-001', name, customer, modified, paid_amount, 'Opening balance',
+					1, now, now, user, user
+				)
+				for name, customer, paid_amount, modified in orders[start:start + 1000]
+			]
+		)
+		# Names come from the `{repair_order}-PAY-###` series, continue after the opening payment
+		frappe.db.bulk_insert(
+			'Series',
+			fields=['name', 'current'],
+			values=[(f'{name}-PAY-', 1) for name, *_ in orders[start:start + 1000]],
+			ignore_duplicates=True
+		)
+		frappe.db.commit()
@@ -0,0 +1,25 @@
+import frappe
+
+from repairbox.repairbox.doctype.technician_workload.technician_workload import rebuild_all as rebuild_workloads
+
+
+def execute():
+	"""
+	Put existing records in the site's branch when there is only one.
+
+	With several branches the orders are left without one, visible only to
+	users not restricted to branches, until they are assigned.
+	"""
+	for doctype in ('repair_order', 'repair_log', 'repair_payment', 'repair_status_interval', 'technician_workload'):
+		frappe.reload_doc('repairbox', 'doctype', doctype)
+
+	branches = frappe.get_all('Branch', pluck='name', limit=2)
+	if len(branches) == 1:
+		for doctype in ('Repair Order', 'Repair Log', 'Repair Payment', 'Repair Status Interval'):
+			frappe.db.sql(
+				f"UPDATE `tab{doctype}` SET branch = %s WHERE branch IS NULL",
+				branches[0]
+			)
+
+	# Technician branches come from their User Permissions
+	rebuild_workloads()
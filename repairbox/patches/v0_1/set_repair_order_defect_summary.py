@@ -0,0 +1,23 @@
+import frappe
+
+from repairbox.repairbox.doctype.repair_order.repair_order import DEFECT_SUMMARY_LENGTH
+
+
+def execute():
+	"""Fill the defect count and summary of existing orders"""
+	frappe.reload_doc('repairbox', 'doctype', 'repair_order')
+
+	frappe.db.sql("""
+		UPDATE `tabRepair Order` ro
+		JOIN (
+			SELECT parent, COUNT(*) AS defect_count, LEFT(
+				GROUP_CONCAT(COALESCE(defect_title, defect) ORDER BY idx SEPARATOR ', '),
+				%(length)s
+			) AS defect_summary
+			FROM `tabRepair Order Defect`
+			WHERE parenttype = 'Repair Order' AND parentfield = 'defects'
+			GROUP BY parent
+		) defects ON defects.parent = ro.name
+		SET ro.defect_count = defects.defect_count,
+			ro.defect_summary = defects.defect_summary
+	""", {'length': DEFECT_SUMMARY_LENGTH})
@@ -0,0 +1,14 @@
+import frappe
+
+from repairbox.repairbox.thumbnails import update_order_images
+
+
+def execute():
+	"""Copy the WebP thumbnail of every device to its Repair Orders"""
+	frappe.reload_doc('repairbox', 'doctype', 'device')
+	frappe.reload_doc('repairbox', 'doctype', 'repair_order')
+
+	for device, thumbnail in frappe.get_all(
+		'Device', filters={'thumbnail_webp': ['is', 'set']}, fields=['name', 'thumbnail_webp'], as_list=True
+	):
+		update_order_images(device, thumbnail)
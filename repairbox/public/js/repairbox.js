@@ -0,0 +1,69 @@
+// Copyright (c) 2026, Me and contributors
+// For license information, please see license.txt
+
+frappe.provide('repairbox.realtime');
+
+// ========================================
+// REALTIME REPAIR ORDER UPDATES
+// ========================================
+//
+// The server pushes compact diffs of Repair Order changes as
+// `repairbox_order_update` ({orders: [{n, s, a, p, m}]}). Open forms reload
+// here; the Repair Order list and kanban views (repair_order_list.js) and
+// other screens listen to the jQuery events below instead of polling:
+//
+//   $(document).on('repairbox:order_update', (e, orders) => { ... });
+//   $(document).on('repairbox:resync', () => { /* reload everything */ });
+
+repairbox.realtime.FIELD_MAP = {
+    n: 'name',
+    s: 'status',
+    a: 'assigned_to',
+    p: 'priority',
+    m: 'modified'
+};
+
+repairbox.realtime.expand = function (diff) {
+    const change = {};
+    Object.keys(diff).forEach(key => {
+        change[repairbox.realtime.FIELD_MAP[key] || key] = diff[key];
+    });
+    return change;
+};
+
+repairbox.realtime.setup = function () {
+    if (repairbox.realtime.ready || !frappe.realtime.socket) {
+        return;
+    }
+    repairbox.realtime.ready = true;
+
+    // Updates are published to branch rooms; the server decides which ones
+    // this user joins. Rooms are left on disconnect, so join again on connect
+    frappe.realtime.socket.emit('repairbox_subscribe');
+
+    frappe.realtime.on('repairbox_order_update', (data) => {
+        const orders = (data.orders || []).map(repairbox.realtime.expand);
+
+        // Keep open forms in sync without a reload
+        if (cur_frm && cur_frm.doctype === 'Repair Order' && !cur_frm.is_dirty()) {
+            const change = orders.find(order => order.name === cur_frm.doc.name);
+            if (change && change.modified !== cur_frm.doc.modified) {
+                cur_frm.reload_doc();
+            }
+        }
+
+        $(document).trigger('repairbox:order_update', [orders]);
+    });
+
+    // Missed events cannot be replayed, ask screens to reload after a reconnect
+    let connected_once = frappe.realtime.socket.connected;
+    frappe.realtime.socket.on('connect', () => {
+        frappe.realtime.socket.emit('repairbox_subscribe');
+        if (connected_once) {
+            $(document).trigger('repairbox:resync');
+        }
+        connected_once = true;
+    });
+};
+
+$(document).on('app_ready', () => repairbox.realtime.setup());
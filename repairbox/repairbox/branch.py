@@ -0,0 +1,141 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Branch partitioning of Repair Orders.
+
+Every Repair Order belongs to a Branch; its Repair Logs, Repair Payments and
+status intervals carry the same branch. Users with User Permissions on
+Branch only see the records of those branches, users without any see all
+of them.
+
+The restriction is applied by the permission hooks in `permissions` as a
+plain `branch IN (...)` predicate, which is matched on the branch-leading
+indexes. The branch fields ignore generic User Permissions, whose
+`IFNULL(branch, '') = '' OR ...` condition cannot use an index.
+"""
+
+import frappe
+from frappe import _
+
+# Redis hash of user -> {'branches': [...], 'default': ...}
+USER_BRANCHES_CACHE_KEY = "repairbox_user_branches"
+
+# Cache namespace of users who see all branches
+ALL_BRANCHES = "all"
+
+
+def get_user_branch_info(user=None):
+	"""Branches of a user's User Permissions and their default branch, cached per user"""
+	user = user or frappe.session.user
+	info = frappe.cache().hget(USER_BRANCHES_CACHE_KEY, user)
+	if info is not None:
+		return info
+
+	permissions = [] if user == 'Administrator' else frappe.get_all(
+		'User Permission',
+		filters={'user': user, 'allow': 'Branch'},
+		fields=['for_value', 'is_default'],
+		order_by='is_default desc, for_value asc'
+	)
+
+	branches = sorted({row.for_value for row in permissions})
+	info = {
+		'branches': branches,
+		# The marked default, or the only branch of the user
+		'default': permissions[0].for_value if permissions and (permissions[0].is_default or len(branches) == 1) else None
+	}
+	frappe.cache().hset(USER_BRANCHES_CACHE_KEY, user, info)
+	return info
+
+
+def get_user_branches(user=None):
+	"""Branches `user` is restricted to, or an empty list for all branches"""
+	return get_user_branch_info(user)['branches']
+
+
+def get_default_branch(user=None):
+	return get_user_branch_info(user)['default']
+
+
+def get_branch_scope(user=None):
+	"""Cache namespace of the data `user` sees: their branches, or all"""
+	return '|'.join(get_user_branches(user)) or ALL_BRANCHES
+
+
+def get_branch_condition(doctype, user=None, alias=None):
+	"""SQL restricting `doctype` rows to the branches of `user`, or '' without restriction"""
+	branches = get_user_branches(user)
+	if not branches:
+		return ''
+
+	return '{table}.branch IN ({branches})'.format(
+		table=alias or f'`tab{doctype}`',
+		branches=', '.join(frappe.db.escape(branch) for branch in branches)
+	)
+
+
+def add_branch_filter(filters, user=None):
+	"""Add the branches of `user` to `frappe.get_all` filters"""
+	branches = get_user_branches(user)
+	if branches:
+		filters['branch'] = ['in', branches]
+
+	return filters
+
+
+def validate_branch(doc):
+	"""Keep users restricted to branches from creating or moving orders elsewhere"""
+	branches = get_user_branches()
+	if not branches:
+		return
+
+	if not doc.branch:
+		frappe.throw(_('Please select a Branch'), frappe.MandatoryError)
+
+	if doc.branch not in branches:
+		frappe.throw(
+			_('You are not allowed to create or move Repair Orders in Branch {0}').format(doc.branch),
+			frappe.PermissionError
+		)
+
+
+def move_order_branch(repair_order, branch):
+	"""Move the records of a Repair Order to the branch it was moved to"""
+	for doctype in ('Repair Log', 'Repair Payment', 'Repair Status Interval'):
+		frappe.db.sql(
+			f"UPDATE `tab{doctype}` SET branch = %(branch)s WHERE repair_order = %(repair_order)s",
+			{'branch': branch, 'repair_order': repair_order}
+		)
+
+
+def has_branch_permission(doc, ptype=None, user=None):
+	"""Records of other branches are not accessible to restricted users"""
+	branches = get_user_branches(user)
+	if not branches or doc.get('branch') in branches:
+		return True
+
+	# New records get their branch on validate (the user's default, or fetched from the order)
+	return ptype == 'create' and not doc.get('branch')
+
+
+def clear_user_branches_cache(doc, method=None):
+	"""
+	User Permission hook on update and after delete, so the branches are read
+	without a deleted row; also moves the technician workload to the new
+	default branch.
+	"""
+	if doc.allow != 'Branch':
+		return
+
+	def clear():
+		frappe.cache().hdel(USER_BRANCHES_CACHE_KEY, doc.user)
+
+	clear()
+	# The lookup below caches this transaction's view; drop it once it is committed or undone
+	frappe.db.after_commit.add(clear)
+	frappe.db.after_rollback.add(clear)
+
+	frappe.db.set_value(
+		'Technician Workload', doc.user, 'branch', get_default_branch(doc.user), update_modified=False
+	)
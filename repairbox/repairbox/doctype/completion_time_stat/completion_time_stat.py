@@ -0,0 +1,155 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_to_date, flt, now_datetime
+
+# Completed orders looked at when computing the statistics
+HISTORY_DAYS = 365
+
+# Fewer completed orders than this are not trusted for estimates
+MIN_SAMPLES = 5
+
+# Statuses during which the order waits rather than being worked on
+WAITING_STATUSES = ('Awaiting Parts', 'Awaiting Customer Approval', 'On Hold')
+
+
+class CompletionTimeStat(Document):
+	pass
+
+
+def get_stat_key(stat_type, reference):
+	return f'{stat_type}::{reference}'
+
+
+def get_expected_hours(device, defects):
+	"""
+	Get the learned completion time of an order, or None without enough history.
+
+	Uses the slowest defect of the order, falling back to the device. All
+	statistics are read with one primary-key lookup.
+	"""
+	keys = [get_stat_key('Defect', defect) for defect in defects if defect]
+	if device:
+		keys.append(get_stat_key('Device', device))
+
+	if not keys:
+		return None
+
+	stats = frappe.get_all(
+		'Completion Time Stat',
+		filters={'name': ['in', keys], 'samples': ['>=', MIN_SAMPLES]},
+		fields=['stat_type', 'p80_hours']
+	)
+
+	defect_hours = [stat.p80_hours for stat in stats if stat.stat_type == 'Defect']
+	if defect_hours:
+		return max(defect_hours)
+
+	device_hours = [stat.p80_hours for stat in stats if stat.stat_type == 'Device']
+	return device_hours[0] if device_hours else None
+
+
+def rebuild_completion_stats():
+	"""Recompute all statistics from completed orders in one aggregated query (nightly)"""
+	rows = frappe.db.sql(get_stats_query(), {
+		'since': add_to_date(now_datetime(), days=-HISTORY_DAYS),
+		'waiting_statuses': WAITING_STATUSES
+	})
+
+	frappe.db.delete('Completion Time Stat')
+
+	now = now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		'Completion Time Stat',
+		fields=[
+			'name', 'stat_key', 'stat_type', 'reference', 'samples',
+			'p50_hours', 'p80_hours', 'p90_hours', 'avg_wait_hours',
+			'computed_on', 'creation', 'modified', 'owner', 'modified_by'
+		],
+		values=[
+			(
+				stat_key, stat_key, stat_type, reference, samples,
+				flt(p50, 2), flt(p80, 2), flt(p90, 2), flt(avg_wait, 2),
+				now, now, now, user, user
+			)
+			for stat_key, stat_type, reference, samples, p50, p80, p90, avg_wait in rows
+		]
+	)
+
+
+def get_stats_query():
+	"""
+	Aggregate turnaround and waiting time per device and per defect.
+
+	Turnaround is `booking_date` to `actual_completion`; waiting time is the
+	time between a Repair Log in a waiting status and the next log of the
+	order. MariaDB only has PERCENTILE_CONT as a window function, Postgres
+	only as an aggregate.
+	"""
+	if frappe.db.db_type == 'postgres':
+		seconds = "EXTRACT(EPOCH FROM ({end} - {start}))"
+		select = """
+			SELECT stat_key, stat_type, reference, COUNT(*),
+				PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY hours),
+				PERCENTILE_CONT(0.8) WITHIN GROUP (ORDER BY hours),
+				PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY hours),
+				AVG(wait_hours)
+			FROM samples
+			GROUP BY stat_key, stat_type, reference
+		"""
+	else:
+		seconds = "TIMESTAMPDIFF(SECOND, {start}, {end})"
+		select = """
+			SELECT DISTINCT stat_key, stat_type, reference,
+				COUNT(*) OVER (PARTITION BY stat_key),
+				PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY hours) OVER (PARTITION BY stat_key),
+				PERCENTILE_CONT(0.8) WITHIN GROUP (ORDER BY hours) OVER (PARTITION BY stat_key),
+				PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY hours) OVER (PARTITION BY stat_key),
+				AVG(wait_hours) OVER (PARTITION BY stat_key)
+			FROM samples
+		"""
+
+	return """
+		WITH completed AS (
+			SELECT name, device, {turnaround} / 3600 AS hours
+			FROM `tabRepair Order`
+			WHERE actual_completion > booking_date
+			AND booking_date >= %(since)s
+			AND status != 'Cancelled'
+		),
+		log_spans AS (
+			SELECT log.repair_order, log.status, log.log_date,
+				LEAD(log.log_date) OVER (PARTITION BY log.repair_order ORDER BY log.log_date) AS next_log_date
+			FROM `tabRepair Log` log
+			JOIN completed ON completed.name = log.repair_order
+		),
+		waits AS (
+			SELECT repair_order, SUM({wait}) / 3600 AS wait_hours
+			FROM log_spans
+			WHERE status IN %(waiting_statuses)s AND next_log_date IS NOT NULL
+			GROUP BY repair_order
+		),
+		samples AS (
+			SELECT CONCAT('Device::', completed.device) AS stat_key, 'Device' AS stat_type,
+				completed.device AS reference, completed.hours, COALESCE(waits.wait_hours, 0) AS wait_hours
+			FROM completed
+			LEFT JOIN waits ON waits.repair_order = completed.name
+			WHERE completed.device IS NOT NULL
+			UNION ALL
+			SELECT CONCAT('Defect::', defect.defect), 'Defect',
+				defect.defect, completed.hours, COALESCE(waits.wait_hours, 0)
+			FROM completed
+			JOIN `tabRepair Order Defect` defect
+				ON defect.parent = completed.name AND defect.parenttype = 'Repair Order' AND defect.parentfield = 'defects'
+			LEFT JOIN waits ON waits.repair_order = completed.name
+			WHERE defect.defect IS NOT NULL
+		)
+		{select}
+	""".format(
+		turnaround=seconds.format(start='booking_date', end='actual_completion'),
+		wait=seconds.format(start='log_date', end='next_log_date'),
+		select=select
+	)
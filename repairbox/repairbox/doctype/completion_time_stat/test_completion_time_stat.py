@@ -0,0 +1,9 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.tests.utils import FrappeTestCase
+
+
+# class TestCompletionTimeStat(FrappeTestCase):
+# 	pass
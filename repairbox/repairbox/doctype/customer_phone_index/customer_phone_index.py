@@ -0,0 +1,212 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import re
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now_datetime
+
+# Digits compared when a number was entered without its country code
+SUFFIX_LENGTH = 8
+
+# Shorter numbers are too ambiguous to match on
+MIN_DIGITS = 6
+
+INDEX_FIELDS = [
+	'name', 'customer', 'phone', 'phone_digits', 'phone_suffix',
+	'source_doctype', 'source_name', 'creation', 'modified', 'owner', 'modified_by'
+]
+
+
+class CustomerPhoneIndex(Document):
+	pass
+
+
+def normalize_phone(phone, country_code=None):
+	"""
+	Get the E.164 digits and the suffix of a phone number, or None.
+
+	`+216 20 123 456`, `00216 20123456` and (with country code 216)
+	`20 123 456` all give `('21620123456', '20123456')`.
+	"""
+	if not phone:
+		return None
+
+	phone = str(phone).strip()
+	digits = re.sub(r'\D', '', phone)
+	if len(digits) < MIN_DIGITS:
+		return None
+
+	if phone.startswith('+'):
+		e164 = digits
+	elif digits.startswith('00'):
+		e164 = digits[2:]
+	elif country_code and not (digits.startswith(country_code) and len(digits) > len(country_code) + SUFFIX_LENGTH - 1):
+		# National number, drop the trunk prefix
+		e164 = country_code + digits.lstrip('0')
+	else:
+		e164 = digits
+
+	return e164, e164[-SUFFIX_LENGTH:]
+
+
+def get_country_code():
+	"""Country code assumed for numbers entered without one"""
+	code = frappe.get_cached_doc('RepairBox Settings').default_country_code
+	return re.sub(r'\D', '', code or '') or None
+
+
+def update_customer_phones(doc, method=None):
+	"""Index the mobile number of a Customer (doc event)"""
+	update_index('Customer', doc.name, [doc.name], [doc.get('mobile_no')])
+
+
+def update_contact_phones(doc, method=None):
+	"""Index the numbers of a Contact for every Customer it is linked to (doc event)"""
+	customers = [
+		link.link_name for link in doc.get('links') or []
+		if link.link_doctype == 'Customer' and link.link_name
+	]
+	phones = [row.phone for row in doc.get('phone_nos') or []]
+	phones += [doc.get('mobile_no'), doc.get('phone')]
+
+	update_index('Contact', doc.name, customers, phones)
+
+
+def delete_phones(doc, method=None):
+	"""Remove the index rows of a deleted Customer or Contact (doc event)"""
+	frappe.db.delete('Customer Phone Index', {'source_doctype': doc.doctype, 'source_name': doc.name})
+
+
+def rename_customer_phones(doc, method=None, old=None, new=None, merge=False):
+	"""Point index rows to the new name of a renamed Customer (doc event)"""
+	frappe.db.sql("""
+		UPDATE `tabCustomer Phone Index`
+		SET customer = %(new)s,
+			source_name = CASE WHEN source_doctype = 'Customer' THEN %(new)s ELSE source_name END
+		WHERE customer = %(old)s
+	""", {'old': old, 'new': new})
+
+
+def update_index(source_doctype, source_name, customers, phones):
+	"""Replace the index rows of one Customer or Contact"""
+	rows = get_index_rows(source_doctype, source_name, customers, phones, get_country_code())
+
+	existing = {
+		(row.customer, row.phone_digits)
+		for row in frappe.get_all(
+			'Customer Phone Index',
+			filters={'source_doctype': source_doctype, 'source_name': source_name},
+			fields=['customer', 'phone_digits']
+		)
+	}
+
+	# Saves that do not touch phone numbers do not write to the index
+	if existing == {(row[1], row[3]) for row in rows}:
+		return
+
+	frappe.db.delete('Customer Phone Index', {'source_doctype': source_doctype, 'source_name': source_name})
+	insert_rows(rows)
+
+
+def get_index_rows(source_doctype, source_name, customers, phones, country_code):
+	"""Index rows for every pair of customer and distinct normalized number"""
+	numbers = {}
+	for phone in phones:
+		normalized = normalize_phone(phone, country_code)
+		if normalized:
+			numbers.setdefault(normalized, phone)
+
+	now = now_datetime()
+	user = frappe.session.user
+	return [
+		(
+			frappe.generate_hash(length=10), customer, phone, e164, suffix,
+			source_doctype, source_name, now, now, user, user
+		)
+		for customer in customers
+		for (e164, suffix), phone in numbers.items()
+	]
+
+
+def insert_rows(rows):
+	if rows:
+		frappe.db.bulk_insert('Customer Phone Index', fields=INDEX_FIELDS, values=rows)
+
+
+def find_customers(phone):
+	"""
+	Find customers by phone number.
+
+	Returns `[(customer, exact)]`, exact E.164 matches first, then customers
+	whose number only shares the last digits.
+	"""
+	normalized = normalize_phone(phone, get_country_code())
+	if not normalized:
+		return []
+
+	e164, suffix = normalized
+	matches = frappe.db.sql("""
+		SELECT customer, MAX(phone_digits = %(e164)s) AS exact
+		FROM `tabCustomer Phone Index`
+		WHERE phone_suffix = %(suffix)s
+		GROUP BY customer
+		ORDER BY exact DESC, customer ASC
+		LIMIT 20
+	""", {'e164': e164, 'suffix': suffix})
+
+	return [(customer, bool(exact)) for customer, exact in matches]
+
+
+def rebuild_all(batch_size=1000):
+	"""Rebuild the index from all Customers and Contacts"""
+	frappe.db.delete('Customer Phone Index')
+	country_code = get_country_code()
+
+	customers = frappe.db.sql("""
+		SELECT name, mobile_no FROM `tabCustomer`
+		WHERE mobile_no IS NOT NULL AND mobile_no != ''
+	""")
+	for start in range(0, len(customers), batch_size):
+		rows = []
+		for customer, mobile_no in customers[start:start + batch_size]:
+			rows += get_index_rows('Customer', customer, [customer], [mobile_no], country_code)
+		insert_rows(rows)
+		frappe.db.commit()
+
+	contacts = frappe.db.sql_list("""
+		SELECT DISTINCT parent FROM `tabDynamic Link`
+		WHERE parenttype = 'Contact' AND link_doctype = 'Customer'
+	""")
+	for start in range(0, len(contacts), batch_size):
+		batch = contacts[start:start + batch_size]
+		linked, phones = {}, {}
+
+		for contact, customer in frappe.db.sql("""
+			SELECT parent, link_name FROM `tabDynamic Link`
+			WHERE parenttype = 'Contact' AND link_doctype = 'Customer' AND parent IN %s
+		""", (tuple(batch),)):
+			linked.setdefault(contact, []).append(customer)
+
+		for contact, phone in frappe.db.sql("""
+			SELECT parent, phone FROM `tabContact Phone`
+			WHERE parenttype = 'Contact' AND parent IN %(contacts)s
+			UNION ALL
+			SELECT name, mobile_no FROM `tabContact` WHERE name IN %(contacts)s
+			UNION ALL
+			SELECT name, phone FROM `tabContact` WHERE name IN %(contacts)s
+		""", {'contacts': tuple(batch)}):
+			phones.setdefault(contact, []).append(phone)
+
+		rows = []
+		for contact in batch:
+			rows += get_index_rows('Contact', contact, linked.get(contact, []), phones.get(contact, []), country_code)
+		insert_rows(rows)
+		frappe.db.commit()
+
+
+def on_doctype_update():
+	"""Lookups by suffix read the customer and digits from the index"""
+	frappe.db.add_index('Customer Phone Index', ['phone_suffix', 'customer'])
+	frappe.db.add_index('Customer Phone Index', ['source_doctype', 'source_name'])
@@ -0,0 +1,78 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import random
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.repairbox.doctype.customer_phone_index.customer_phone_index import find_customers, normalize_phone
+from repairbox.repairbox.doctype.repair_order.repair_order import quick_create_customer
+
+# Country code no test site uses as its default
+TEST_COUNTRY_CODE = '998'
+
+
+class TestCustomerPhoneIndex(FrappeTestCase):
+	def test_normalize_phone(self):
+		expected = ('21620123456', '20123456')
+		self.assertEqual(normalize_phone('+216 20 123 456'), expected)
+		self.assertEqual(normalize_phone('00216 20-123-456'), expected)
+		self.assertEqual(normalize_phone('20 123 456', '216'), expected)
+		self.assertEqual(normalize_phone('020123456', '216'), expected)
+		self.assertEqual(normalize_phone('21620123456', '216'), expected)
+		self.assertIsNone(normalize_phone('12-34'))
+
+	def test_find_customers_by_suffix(self):
+		number = make_number()
+		exact = make_customer(f'+{TEST_COUNTRY_CODE} {number}')
+		# Stored without its country code, only the last digits match
+		national = make_customer(number)
+
+		self.assertEqual(find_customers(f'+{TEST_COUNTRY_CODE} {number}'), [(exact, True), (national, False)])
+
+	def test_quick_create_reuses_the_only_match(self):
+		phone = f'+{TEST_COUNTRY_CODE} {make_number()}'
+		customer = make_customer(phone)
+
+		self.assertEqual(quick_create_customer('_Test Phone Customer', phone), customer)
+
+	def test_quick_create_with_ambiguous_match(self):
+		phone = f'+{TEST_COUNTRY_CODE} {make_number()}'
+		existing = {make_customer(phone), make_customer(phone)}
+
+		created = quick_create_customer('_Test Phone Customer', phone)
+		self.assertNotIn(created, existing)
+		self.assertEqual(frappe.db.get_value('Customer', created, 'mobile_no'), phone)
+
+	def test_contact_phone_change_updates_index(self):
+		customer = make_customer()
+		old_phone = f'+{TEST_COUNTRY_CODE} {make_number()}'
+		new_phone = f'+{TEST_COUNTRY_CODE} {make_number()}'
+
+		contact = frappe.get_doc({
+			'doctype': 'Contact',
+			'first_name': '_Test Phone Contact',
+			'phone_nos': [{'phone': old_phone}],
+			'links': [{'link_doctype': 'Customer', 'link_name': customer}]
+		}).insert()
+		self.assertEqual(find_customers(old_phone), [(customer, True)])
+
+		contact.phone_nos[0].phone = new_phone
+		contact.save()
+		self.assertEqual(find_customers(old_phone), [])
+		self.assertEqual(find_customers(new_phone), [(customer, True)])
+
+
+def make_number():
+	"""Random national number, without a trunk prefix"""
+	return str(random.randint(20000000, 99999999))
+
+
+def make_customer(mobile_no=None):
+	return frappe.get_doc({
+		'doctype': 'Customer',
+		'customer_name': '_Test Phone Customer',
+		'customer_type': 'Individual',
+		'mobile_no': mobile_no
+	}).insert().name
@@ -4,6 +4,8 @@
 import frappe
 from frappe.model.document import Document
 
+from repairbox.repairbox.invoicing import clear_item_map_cache
+
 
 class Defect(Document):
 	def validate(self):
@@ -14,3 +16,12 @@ class Defect(Document):
 		# Fetch brand from device
 		if self.device and not self.brand:
 			self.brand = frappe.db.get_value("Device", self.device, "brand")
+
+	def on_update(self):
+		"""Invoices pick up the new item"""
+		if self.has_value_changed('item'):
+			clear_item_map_cache()
+
+	def on_trash(self):
+		"""Drop the deleted defect from the invoice item map"""
+		clear_item_map_cache()
@@ -1,9 +1,23 @@
 # Copyright (c) 2026, Me and contributors
 # For license information, please see license.txt
 
-# import frappe
-from frappe.tests.utils import FrappeTestCase
+import frappe
 
+from repairbox.tests.utils import QueryBudgetTestCase, get_test_defect, make_test_records
 
-# class TestDefect(FrappeTestCase):
-# 	pass
+SAVE_BUDGET = 8
+
+
+class TestDefect(QueryBudgetTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+
+	def test_save_query_budget(self):
+		frappe.get_doc('Defect', get_test_defect(1)).save()
+
+		doc = frappe.get_doc('Defect', get_test_defect(1))
+		doc.selling_price += 5
+		with self.assertQueryBudget(SAVE_BUDGET, 'Defect save'):
+			doc.save()
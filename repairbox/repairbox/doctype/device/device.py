@@ -4,9 +4,31 @@
 import frappe
 from frappe.model.document import Document
 
+from repairbox.repairbox.doctype.inspection_template_resolution.inspection_template_resolution import (
+	delete_device_resolution,
+	update_device_resolution
+)
+from repairbox.repairbox.thumbnails import queue_device_variants
+
 
 class Device(Document):
 	def validate(self):
 		"""Validate device before saving"""
 		if self.device_name:
 			self.device_name = self.device_name.strip()
+
+	def on_update(self):
+		"""Resolve the inspection template and regenerate thumbnails when their source changed"""
+		if self.has_value_changed('device_type'):
+			update_device_resolution(self.name)
+
+		queue_device_variants(self)
+
+	def on_trash(self):
+		"""Remove the inspection template resolution of the device"""
+		delete_device_resolution(self.name)
+
+	def after_rename(self, old_name, new_name, merge=False):
+		"""Move the inspection template resolution to the new name"""
+		delete_device_resolution(old_name)
+		update_device_resolution(new_name)
@@ -4,6 +4,13 @@
 import frappe
 from frappe.model.document import Document
 
+from repairbox.repairbox.doctype.inspection_template_resolution.inspection_template_resolution import (
+	release_template,
+	update_device_resolution,
+	update_device_type_resolutions
+)
+from repairbox.repairbox.inspection_storage import clear_template_items_cache
+
 
 class InspectionChecklistTemplate(Document):
 	def validate(self):
@@ -18,16 +25,51 @@ class InspectionChecklistTemplate(Document):
 				self.device_type = device_type
 
 		# Ensure only one default template per device (specific device takes priority)
+		# Both updates only touch current defaults through the (device/device_type, is_active, is_default) indexes
 		if self.is_default and self.device:
 			frappe.db.sql("""
 				UPDATE `tabInspection Checklist Template`
 				SET is_default = 0
-				WHERE device = %s AND name != %s
+				WHERE device = %s AND is_default = 1 AND name != %s
 			""", (self.device, self.name))
 		# Ensure only one default template per device type (if no specific device)
 		elif self.is_default and self.device_type and not self.device:
 			frappe.db.sql("""
 				UPDATE `tabInspection Checklist Template`
 				SET is_default = 0
-				WHERE device_type = %s AND device IS NULL AND name != %s
+				WHERE device_type = %s AND is_default = 1
+				AND (device IS NULL OR device = '') AND name != %s
 			""", (self.device_type, self.name))
+
+	def on_update(self):
+		"""Refresh cached template items and the device resolutions this template affects"""
+		clear_template_items_cache(self.name)
+
+		previous = self.get_doc_before_save()
+		self.update_resolutions()
+		if previous and (previous.device != self.device or previous.device_type != self.device_type):
+			self.update_resolutions(previous)
+
+	def on_trash(self):
+		"""Refresh cached template items and release the resolutions linking to the template"""
+		clear_template_items_cache(self.name)
+		# Otherwise the link check before delete fails for every device this template applies to
+		release_template(self.name)
+
+	def after_delete(self):
+		"""Resolve affected devices to their next best template"""
+		self.update_resolutions()
+
+	def update_resolutions(self, template=None):
+		"""Recompute the Inspection Template Resolution rows of the devices a template applies to"""
+		template = template or self
+		if template.device:
+			update_device_resolution(template.device)
+		elif template.device_type:
+			update_device_type_resolutions(template.device_type)
+
+
+def on_doctype_update():
+	"""Indexes for template resolution and default-flag updates"""
+	frappe.db.add_index('Inspection Checklist Template', ['device', 'is_active', 'is_default'])
+	frappe.db.add_index('Inspection Checklist Template', ['device_type', 'is_active', 'is_default'])
@@ -0,0 +1,151 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now_datetime
+
+
+class InspectionTemplateResolution(Document):
+	pass
+
+
+def get_template_for_device(device):
+	"""Get the effective Inspection Checklist Template of a device with a primary-key lookup"""
+	if not device:
+		return None
+
+	resolution = frappe.db.get_value(
+		'Inspection Template Resolution', device, ['name', 'template'], as_dict=True
+	)
+	if resolution:
+		return resolution.template
+
+	# Not resolved yet; rows are only written by the Device and template hooks
+	# and the build patch, never on this read path
+	resolved = resolve_device_template(device)
+	return resolved[1] if resolved else None
+
+
+def resolve_device_template(device):
+	"""Compute `(device_type, template)` of one device, or None if the device does not exist"""
+	device_type = frappe.db.get_value('Device', device, 'device_type')
+	if device_type is None and not frappe.db.exists('Device', device):
+		return None
+
+	return device_type, get_device_templates([device]).get(device) or get_device_type_template(device_type)
+
+
+def update_device_resolution(device):
+	"""Recompute and store the effective template of one device"""
+	resolved = resolve_device_template(device)
+	if not resolved:
+		delete_device_resolution(device)
+		return None
+
+	device_type, template = resolved
+	save_resolutions([(device, device_type, template)])
+
+	return template
+
+
+def update_device_type_resolutions(device_type):
+	"""Recompute the effective template of every device of a device type"""
+	if not device_type:
+		return
+
+	devices = frappe.get_all('Device', filters={'device_type': device_type}, pluck='name')
+	if not devices:
+		return
+
+	type_template = get_device_type_template(device_type)
+	device_templates = get_device_templates(devices)
+
+	save_resolutions([
+		(device, device_type, device_templates.get(device) or type_template)
+		for device in devices
+	])
+
+
+def release_template(template):
+	"""Unlink the resolution rows of a template being deleted; they are recomputed after delete"""
+	frappe.db.sql("""
+		UPDATE `tabInspection Template Resolution`
+		SET template = NULL
+		WHERE template = %s
+	""", (template,))
+
+
+def delete_device_resolution(device):
+	"""Remove the resolution row of a deleted or renamed device"""
+	frappe.db.delete('Inspection Template Resolution', {'name': device})
+
+
+def rebuild_all():
+	"""Rebuild the whole resolution table"""
+	frappe.db.delete('Inspection Template Resolution')
+
+	for device_type in frappe.get_all('Device', distinct=True, pluck='device_type'):
+		if device_type:
+			update_device_type_resolutions(device_type)
+
+	# Devices without a type can still have a device-specific template
+	untyped = frappe.db.sql_list("""
+		SELECT name FROM `tabDevice`
+		WHERE device_type IS NULL OR device_type = ''
+	""")
+	if untyped:
+		device_templates = get_device_templates(untyped)
+		save_resolutions([(device, None, device_templates.get(device)) for device in untyped])
+
+
+def get_device_templates(devices):
+	"""Map each device to its active device-specific template, preferring defaults"""
+	templates = {}
+	for row in frappe.db.sql("""
+		SELECT device, name
+		FROM `tabInspection Checklist Template`
+		WHERE device IN %s AND is_active = 1
+		ORDER BY is_default DESC, name ASC
+	""", (tuple(devices),), as_dict=True):
+		templates.setdefault(row.device, row.name)
+
+	return templates
+
+
+def get_device_type_template(device_type):
+	"""Get the active general template of a device type, preferring the default"""
+	if not device_type:
+		return None
+
+	result = frappe.db.sql("""
+		SELECT name FROM `tabInspection Checklist Template`
+		WHERE device_type = %s
+		AND (device IS NULL OR device = '')
+		AND is_active = 1
+		ORDER BY is_default DESC, name ASC
+		LIMIT 1
+	""", (device_type,))
+
+	return result[0][0] if result else None
+
+
+def save_resolutions(resolutions):
+	"""Replace the resolution rows for a list of `(device, device_type, template)`"""
+	if not resolutions:
+		return
+
+	frappe.db.delete('Inspection Template Resolution', {
+		'name': ['in', [device for device, _, _ in resolutions]]
+	})
+
+	now = now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		'Inspection Template Resolution',
+		fields=['name', 'device', 'device_type', 'template', 'creation', 'modified', 'owner', 'modified_by'],
+		values=[
+			(device, device, device_type, template, now, now, user, user)
+			for device, device_type, template in resolutions
+		]
+	)
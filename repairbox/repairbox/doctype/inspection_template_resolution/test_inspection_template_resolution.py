@@ -0,0 +1,33 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.tests.utils import TEST_DEVICE, make_test_records
+
+
+class TestInspectionTemplateResolution(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+
+	def test_delete_effective_template(self):
+		template = frappe.get_doc({
+			'doctype': 'Inspection Checklist Template',
+			'template_name': '_Test RepairBox Device Template',
+			'device': TEST_DEVICE,
+			'is_active': 1,
+			'is_default': 1,
+			'checklist_items': [{'item_name': 'Screen', 'category': 'Display'}]
+		}).insert()
+		self.assertEqual(
+			frappe.db.get_value('Inspection Template Resolution', TEST_DEVICE, 'template'), template.name
+		)
+
+		template.delete()
+
+		self.assertNotEqual(
+			frappe.db.get_value('Inspection Template Resolution', TEST_DEVICE, 'template'), template.name
+		)
@@ -0,0 +1,15 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class RepairEvent(Document):
+	pass
+
+
+def on_doctype_update():
+	"""Index for draining the pending events of a consumer in order, and for purging sent ones"""
+	frappe.db.add_index('Repair Event', ['consumer', 'status', 'name'])
+	frappe.db.add_index('Repair Event', ['status', 'creation'])
@@ -2,8 +2,16 @@
 # For license information, please see license.txt
 
 import frappe
+from frappe import _
 from frappe.model.document import Document
 
+from repairbox.repairbox.doctype.repair_order.repair_order import (
+	RepairOrderConflictError,
+	apply_status_update,
+	clear_timeline_cache
+)
+from repairbox.repairbox.outbox import publish_log_event
+
 
 class RepairLog(Document):
 	def validate(self):
@@ -12,15 +20,38 @@ class RepairLog(Document):
 		if not self.updated_by:
 			self.updated_by = frappe.session.user
 		
+		# Remember the status the order had when the log was written, unless
+		# the form already sent the one the user saw
+		if self.repair_order and self.is_new() and not self.previous_status:
+			self.previous_status = frappe.db.get_value("Repair Order", self.repair_order, "status")
+		
 		# Fetch current status from repair order if not set
 		if not self.status and self.repair_order:
-			self.status = frappe.db.get_value("Repair Order", self.repair_order, "status")
+			self.status = self.previous_status or frappe.db.get_value("Repair Order", self.repair_order, "status")
 	
 	def after_insert(self):
 		"""Actions after log is created"""
-		# Update repair order status if status is set
-		if self.status and self.repair_order:
-			frappe.db.set_value("Repair Order", self.repair_order, "status", self.status)
+		# Update repair order status if status is set, unless someone else
+		# changed it since this log was started
+		if self.status and self.repair_order and self.status != self.previous_status:
+			if not apply_status_update(self.repair_order, self.status, expected_status=self.previous_status):
+				frappe.throw(
+					_("Repair Order {0} was moved to another status while this log was written. Reload and try again.").format(self.repair_order),
+					RepairOrderConflictError
+				)
 		
-		# TODO: Send notification to customer if notify_customer is checked
-		# This would integrate with Frappe's notification system
+		# Integrations such as an SMS gateway act on notify_customer
+		publish_log_event(self)
+	
+	def on_update(self):
+		"""Refresh the cached timeline of the repair order"""
+		clear_timeline_cache(self.repair_order)
+	
+	def on_trash(self):
+		"""Refresh the cached timeline of the repair order"""
+		clear_timeline_cache(self.repair_order)
+
+
+def on_doctype_update():
+	"""Index for the list of users restricted to branches, sorted by log date"""
+	frappe.db.add_index('Repair Log', ['branch', 'log_date'])
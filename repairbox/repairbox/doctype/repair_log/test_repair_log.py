@@ -1,9 +1,38 @@
 # Copyright (c) 2026, Me and contributors
 # For license information, please see license.txt
 
-# import frappe
-from frappe.tests.utils import FrappeTestCase
+import frappe
 
+from repairbox.tests.utils import QueryBudgetTestCase, make_repair_order, make_test_records
 
-# class TestRepairLog(FrappeTestCase):
-# 	pass
+INSERT_BUDGET = 14
+
+
+class TestRepairLog(QueryBudgetTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+		cls.repair_order = make_repair_order().insert().name
+		make_log(cls.repair_order, 'In Progress').insert()
+
+	def test_insert_query_budget(self):
+		log = make_log(self.repair_order, 'Testing')
+		with self.assertQueryBudget(INSERT_BUDGET, 'Repair Log insert'):
+			log.insert()
+
+	def test_insert_updates_order_status(self):
+		make_log(self.repair_order, 'Awaiting Parts').insert()
+		self.assertEqual(
+			frappe.db.get_value('Repair Order', self.repair_order, 'status'),
+			'Awaiting Parts'
+		)
+
+
+def make_log(repair_order, status):
+	return frappe.get_doc({
+		'doctype': 'Repair Log',
+		'repair_order': repair_order,
+		'status': status,
+		'notes': f'Moved to {status}'
+	})
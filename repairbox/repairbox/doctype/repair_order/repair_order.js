@@ -66,6 +66,15 @@ frappe.ui.form.on('Repair Order', {
         if (frm.doc.device_inspection && frm.doc.device_inspection.length > 0) {
             render_inspection_toggle_buttons(frm);
         }
+
+        // Compact inspection data recorded against an older template version
+        if (frm.doc.__onload && frm.doc.__onload.inspection_template_changed) {
+            frm.dashboard.add_comment(
+                __('The inspection template was edited after this checklist was recorded. Please review the items.'),
+                'yellow',
+                true
+            );
+        }
     },
 
     // ========================================
@@ -96,10 +105,6 @@ frappe.ui.form.on('Repair Order', {
         }
     },
 
-    paid_amount: function (frm) {
-        update_payment_status(frm);
-    },
-
     // ========================================
     // 5. DEVICE SELECTION HELPERS
     // ========================================
@@ -185,8 +190,7 @@ function add_status_actions(frm) {
     // Pending Review → Start Repair
     if (status === 'Pending Review') {
         frm.add_custom_button(__('Start Repair'), () => {
-            frm.set_value('status', 'In Progress');
-            frm.save();
+            change_status(frm, 'In Progress');
         }).addClass('btn-primary');
 
         frm.add_custom_button(__('Request More Info'), () => {
@@ -197,13 +201,11 @@ function add_status_actions(frm) {
     // In Progress → Multiple options
     if (status === 'In Progress') {
         frm.add_custom_button(__('Mark as Testing'), () => {
-            frm.set_value('status', 'Testing');
-            frm.save();
+            change_status(frm, 'Testing');
         }).addClass('btn-primary');
 
         frm.add_custom_button(__('Order Parts'), () => {
-            frm.set_value('status', 'Awaiting Parts');
-            frm.save();
+            change_status(frm, 'Awaiting Parts');
         });
 
         frm.add_custom_button(__('Request Customer Approval'), () => {
@@ -214,16 +216,14 @@ function add_status_actions(frm) {
     // Awaiting Parts → Resume
     if (status === 'Awaiting Parts') {
         frm.add_custom_button(__('Parts Received - Resume'), () => {
-            frm.set_value('status', 'In Progress');
-            frm.save();
+            change_status(frm, 'In Progress');
         }).addClass('btn-primary');
     }
 
     // Awaiting Customer Approval → Approved
     if (status === 'Awaiting Customer Approval') {
         frm.add_custom_button(__('Customer Approved'), () => {
-            frm.set_value('status', 'In Progress');
-            frm.save();
+            change_status(frm, 'In Progress');
         }).addClass('btn-primary');
 
         frm.add_custom_button(__('Send Reminder'), () => {
@@ -234,9 +234,7 @@ function add_status_actions(frm) {
     // Testing → Complete
     if (status === 'Testing') {
         frm.add_custom_button(__('Mark as Completed'), () => {
-            frm.set_value('status', 'Completed');
-            frm.set_value('actual_completion', frappe.datetime.now_datetime());
-            frm.save();
+            change_status(frm, 'Completed', { set_actual_completion: 1 });
         }).addClass('btn-primary');
 
         frm.add_custom_button(__('Return to Repair'), () => {
@@ -247,8 +245,7 @@ function add_status_actions(frm) {
                 reqd: 1
             }, (values) => {
                 frm.add_comment('Comment', `Returned to repair: ${values.reason}`);
-                frm.set_value('status', 'In Progress');
-                frm.save();
+                change_status(frm, 'In Progress');
             }, __('Why returning to repair?'));
         });
     }
@@ -260,8 +257,7 @@ function add_status_actions(frm) {
         }).addClass('btn-primary');
 
         frm.add_custom_button(__('Mark Ready for Pickup'), () => {
-            frm.set_value('status', 'Ready for Pickup');
-            frm.save();
+            change_status(frm, 'Ready for Pickup');
         });
     }
 
@@ -292,8 +288,7 @@ function add_status_actions(frm) {
                 reqd: 1
             }, (values) => {
                 frm.add_comment('Comment', `Put on hold: ${values.reason}`);
-                frm.set_value('status', 'On Hold');
-                frm.save();
+                change_status(frm, 'On Hold');
             }, __('Reason for hold'));
         }, __('Actions'));
 
@@ -305,8 +300,7 @@ function add_status_actions(frm) {
                 reqd: 1
             }, (values) => {
                 frm.add_comment('Comment', `Cancelled: ${values.reason}`);
-                frm.set_value('status', 'Cancelled');
-                frm.save();
+                change_status(frm, 'Cancelled');
             }, __('Reason for cancellation'));
         }, __('Actions'));
     }
@@ -314,13 +308,19 @@ function add_status_actions(frm) {
     // On Hold → Resume
     if (status === 'On Hold') {
         frm.add_custom_button(__('Resume Repair'), () => {
-            frm.set_value('status', 'In Progress');
-            frm.save();
+            change_status(frm, 'In Progress');
         }).addClass('btn-primary');
     }
 }
 
 function add_utility_buttons(frm) {
+    // Record Payment (deposits included)
+    if (!frm.is_new() && frm.doc.status !== 'Cancelled' && frm.doc.payment_status !== 'Paid') {
+        frm.add_custom_button(__('Record Payment'), () => {
+            record_payment(frm);
+        });
+    }
+
     // Print Receipt
     frm.add_custom_button(__('Print Receipt'), () => {
         frappe.ui.get_print_settings(false, (print_settings) => {
@@ -388,11 +388,6 @@ function update_field_permissions(frm) {
         frm.set_df_property('technician_notes', 'read_only', 1);
         frm.set_df_property('additional_notes', 'read_only', 1);
     }
-
-    // Payment fields only editable in final stages
-    const payment_editable = ['Completed', 'Ready for Pickup'].includes(status);
-    frm.set_df_property('paid_amount', 'read_only', !payment_editable);
-    frm.set_df_property('payment_status', 'read_only', !payment_editable);
 }
 
 function add_status_indicator(frm) {
@@ -440,23 +435,8 @@ function calculate_totals(frm) {
     frm.set_value('grand_total', total + priority_charge + tax_amount);
 }
 
-function update_payment_status(frm) {
-    const paid = flt(frm.doc.paid_amount);
-    const total = flt(frm.doc.grand_total);
-
-    if (paid === 0) {
-        frm.set_value('payment_status', 'Unpaid');
-    } else if (paid >= total) {
-        frm.set_value('payment_status', 'Paid');
-    } else {
-        frm.set_value('payment_status', 'Partially Paid');
-    }
-}
-
 function mark_as_delivered(frm) {
-    frm.set_value('status', 'Delivered');
-    frm.set_value('actual_completion', frappe.datetime.now_datetime());
-    frm.save().then(() => {
+    change_status(frm, 'Delivered', { set_actual_completion: 1 }).then(() => {
         frappe.show_alert({
             message: __('Repair Order marked as delivered'),
             indicator: 'green'
@@ -464,6 +444,104 @@ function mark_as_delivered(frm) {
     });
 }
 
+// Change the status with a version-checked update instead of a full save.
+// Resolves once the status is written; conflicts are shown to the user.
+function change_status(frm, status, options = {}) {
+    // Unsaved edits go through the regular save
+    if (frm.is_dirty()) {
+        frm.set_value('status', status);
+        if (options.set_actual_completion) {
+            frm.set_value('actual_completion', frappe.datetime.now_datetime());
+        }
+        return frm.save();
+    }
+
+    return new Promise((resolve) => {
+        const apply = (expected) => {
+            frappe.call({
+                method: 'repairbox.repairbox.doctype.repair_order.repair_order.update_status',
+                args: {
+                    repair_order: frm.doc.name,
+                    status: status,
+                    expected_status: expected.status,
+                    expected_modified: expected.modified,
+                    set_actual_completion: options.set_actual_completion || 0
+                },
+                freeze: true,
+                callback: (r) => {
+                    if (r.message && r.message.conflict) {
+                        show_conflict_dialog(frm, r.message.conflict,
+                            __('Change status to {0} anyway?', [__(status)]),
+                            () => apply(r.message.conflict));
+                        return;
+                    }
+                    frm.reload_doc().then(resolve);
+                }
+            });
+        };
+
+        apply({ status: frm.doc.status, modified: frm.doc.modified });
+    });
+}
+
+// Record a payment as a submitted Repair Payment in the ledger. Submitting
+// adds its amount to the paid amount of the order with a relative update,
+// so concurrent payments cannot overwrite each other and need no conflict check
+function record_payment(frm) {
+    frappe.prompt([
+        {
+            label: __('Amount'),
+            fieldname: 'amount',
+            fieldtype: 'Currency',
+            default: frm.doc.outstanding_amount,
+            reqd: 1
+        },
+        {
+            label: __('Mode of Payment'),
+            fieldname: 'mode_of_payment',
+            fieldtype: 'Link',
+            options: 'Mode of Payment'
+        },
+        {
+            label: __('Reference'),
+            fieldname: 'reference',
+            fieldtype: 'Data'
+        }
+    ], (values) => {
+        frappe.call({
+            method: 'repairbox.repairbox.doctype.repair_payment.repair_payment.record_payment',
+            args: Object.assign({ repair_order: frm.doc.name }, values),
+            freeze: true,
+            callback: () => frm.reload_doc()
+        });
+    }, __('Record Payment'));
+}
+
+function show_conflict_dialog(frm, current, question, overwrite) {
+    const dialog = new frappe.ui.Dialog({
+        title: __('Repair Order Changed'),
+        primary_action_label: __('Apply Anyway'),
+        primary_action: () => {
+            dialog.hide();
+            overwrite();
+        },
+        secondary_action_label: __('Reload'),
+        secondary_action: () => {
+            dialog.hide();
+            frm.reload_doc();
+        }
+    });
+
+    dialog.$body.html(`
+        <p>${__('{0} updated this order after you opened it.', [frappe.user.full_name(current.modified_by)])}</p>
+        <p>${__('Status')}: <strong>${__(current.status)}</strong>,
+           ${__('Payment')}: <strong>${__(current.payment_status)}</strong>
+           (${format_currency(current.paid_amount)})</p>
+        <p>${question}</p>
+    `);
+    dialog.show();
+}
+
 function show_customer_approval_dialog(frm) {
     frappe.prompt([
         {
@@ -483,8 +561,7 @@ function show_customer_approval_dialog(frm) {
                 name: frm.doc.name
             },
             callback: () => {
-                frm.set_value('status', 'Awaiting Customer Approval');
-                frm.save();
+                change_status(frm, 'Awaiting Customer Approval');
                 frappe.show_alert({
                     message: __('Approval request sent'),
                     indicator: 'green'
@@ -552,8 +629,7 @@ function notify_customer_ready(frm) {
             name: frm.doc.name
         },
         callback: () => {
-            frm.set_value('status', 'Ready for Pickup');
-            frm.save();
+            change_status(frm, 'Ready for Pickup');
             frappe.show_alert({
                 message: __('Customer notified'),
                 indicator: 'green'
@@ -607,6 +683,7 @@ function fetch_and_populate_checklist(frm) {
             if (r.message && r.message.items && r.message.items.length > 0) {
                 // Clear existing items
                 frm.clear_table('device_inspection');
+                frm.set_value('inspection_template', r.message.template_name);
 
                 // Add items from template
                 r.message.items.forEach(item => {
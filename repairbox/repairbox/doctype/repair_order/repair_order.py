@@ -4,35 +4,150 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import flt, now_datetime, add_to_date
+from frappe.utils import cint, flt, now_datetime, add_to_date
 import hashlib
+import json
 import random
 import string
 
+from repairbox.repairbox.branch import get_default_branch, move_order_branch, validate_branch
+from repairbox.repairbox.doctype.completion_time_stat.completion_time_stat import get_expected_hours
+from repairbox.repairbox.doctype.customer_phone_index.customer_phone_index import find_customers
+from repairbox.repairbox.doctype.inspection_template_resolution.inspection_template_resolution import (
+	get_template_for_device
+)
+from repairbox.repairbox.doctype.repair_status_interval.repair_status_interval import (
+	delete_intervals,
+	record_status_change
+)
+from repairbox.repairbox.doctype.technician_workload.technician_workload import (
+	get_least_loaded_technician,
+	remove_order_workload,
+	update_order_workload,
+	update_status_workload
+)
+from repairbox.repairbox.kanban import clear_kanban_cache
+from repairbox.repairbox.outbox import publish_order_events, publish_status_events
+from repairbox.repairbox.permissions import add_permission_filters
+from repairbox.repairbox.profiling import profiled
+from repairbox.repairbox.realtime import queue_order_update, queue_status_update
+from repairbox.repairbox.inspection_storage import (
+	get_template_items,
+	is_compact_storage_enabled,
+	is_payload_stale,
+	pack_inspection,
+	unpack_inspection
+)
+
+
+# Redis hash holding one cached timeline per Repair Order
+TIMELINE_CACHE_KEY = "repairbox_repair_timeline"
+
+# Header fields returned by get_repair_timeline
+TIMELINE_HEADER_FIELDS = [
+	'name', 'customer', 'customer_name', 'contact_number', 'email',
+	'brand', 'device', 'device_model', 'serial_number',
+	'status', 'priority', 'assigned_to', 'branch',
+	'total_service_amount', 'priority_charge', 'tax_amount', 'grand_total',
+	'paid_amount', 'outstanding_amount', 'payment_status',
+	'tracking_id', 'booking_date', 'expected_completion', 'actual_completion',
+	'additional_notes', 'technician_notes', 'inspection_data', 'owner', 'modified'
+]
+
+# Length of the `defect_summary` Data field
+DEFECT_SUMMARY_LENGTH = 140
+
+class RepairOrderConflictError(frappe.ValidationError):
+	"""The Repair Order changed since the caller read it"""
+
+
+# Fields hidden from customers in public-only mode
+TIMELINE_PRIVATE_FIELDS = [
+	'contact_number', 'email', 'serial_number', 'assigned_to',
+	'technician_notes', 'owner'
+]
+
 
 class RepairOrder(Document):
+	@profiled('RepairOrder.onload')
+	def onload(self):
+		"""Expand compact inspection results for the form"""
+		if self.inspection_data and not self.device_inspection:
+			for idx, row in enumerate(unpack_inspection(self.inspection_data), 1):
+				child = self.append('device_inspection', row)
+				# Sent to the form like rows added on the client, so a save
+				# in row mode inserts them instead of updating missing rows
+				child.name = f"new-device-inspection-item-{idx}"
+				child.set('__islocal', 1)
+
+			if is_payload_stale(self.inspection_data):
+				self.set_onload('inspection_template_changed', 1)
+
+	@profiled('RepairOrder.before_insert')
 	def before_insert(self):
 		"""Generate tracking ID before insert"""
 		self.tracking_id = self.generate_tracking_id()
+
+		if not self.branch:
+			self.branch = get_default_branch()
+
+		if not self.assigned_to and cint(frappe.get_cached_doc('RepairBox Settings').auto_assign_technicians):
+			self.assigned_to = get_least_loaded_technician(self.branch)
 	
+	@profiled('RepairOrder.validate')
 	def validate(self):
 		"""Validation logic"""
 		# Calculate totals
 		self.calculate_totals()
+		self.set_payment_status()
 		
 		# Validate status transitions
 		self.validate_status_change()
+
+		if self.is_new() or self.has_value_changed('branch'):
+			validate_branch(self)
+		
+		self.set_estimated_minutes()
+		self.set_defect_summary()
 		
 		# Auto-set expected completion if not set
 		if not self.expected_completion and self.defects:
 			self.set_expected_completion()
+
+		self.set_inspection_storage()
 	
+	@profiled('RepairOrder.on_update')
 	def on_update(self):
 		"""After save logic"""
 		# Send notifications if status changed
 		if self.has_value_changed('status'):
 			self.notify_status_change()
+
+		previous = self.get_doc_before_save()
+		moved = previous and previous.branch != self.branch
+
+		clear_timeline_cache(self.name)
+		# Boards of the old branch or technician cannot see the card leave, like a deletion
+		clear_kanban_cache(deleted=moved or (previous and previous.assigned_to != self.assigned_to))
+		queue_order_update(self)
+		publish_order_events(self)
+		update_order_workload(self)
+
+		# A new technician starts a new stint in the same status
+		if self.has_value_changed('status') or self.has_value_changed('assigned_to'):
+			record_status_change(self.name)
+
+		if moved:
+			move_order_branch(self.name, self.branch)
+
+	def on_trash(self):
+		"""Drop cached data for the deleted order"""
+		clear_timeline_cache(self.name)
+		clear_kanban_cache(deleted=True)
+		remove_order_workload(self)
+		delete_intervals(self.name)
 	
+	@profiled('RepairOrder.calculate_totals')
 	def calculate_totals(self):
 		"""Calculate pricing totals"""
 		total_service = 0
@@ -54,59 +169,88 @@ class RepairOrder(Document):
 		# Grand total
 		self.grand_total = total_service + priority_charge + self.tax_amount
 	
+	def set_payment_status(self):
+		"""Derive the balance and status from the paid amount kept by Repair Payments"""
+		self.outstanding_amount = flt(self.grand_total) - flt(self.paid_amount)
+		self.payment_status = get_payment_status(self.paid_amount, self.grand_total)
+
+	@profiled('RepairOrder.set_inspection_storage')
+	def set_inspection_storage(self):
+		"""Pack inspection rows into `inspection_data` when compact storage is enabled"""
+		if is_compact_storage_enabled():
+			# Orders loaded without the form have no expanded rows; keep their payload
+			if not self.device_inspection:
+				return
+
+			if not self.inspection_template:
+				self.inspection_template = get_inspection_template(self.device)
+
+			payload = pack_inspection(self.device_inspection, self.inspection_template)
+			self.inspection_data = json.dumps(payload, separators=(',', ':'))
+			self.set('device_inspection', [])
+
+		elif self.device_inspection and self.inspection_data:
+			# Rows expanded from a compact payload are saved as regular rows
+			self.inspection_data = None
+
+	def get_inspection_items(self):
+		"""Get inspection results as row dicts, whichever way they are stored"""
+		if self.inspection_data and not self.device_inspection:
+			return unpack_inspection(self.inspection_data)
+
+		return [
+			{field: row.get(field) for field in ('item_name', 'category', 'is_mandatory', 'status', 'is_defective', 'notes')}
+			for row in self.device_inspection
+		]
+
+	@profiled('RepairOrder.set_estimated_minutes')
+	def set_estimated_minutes(self):
+		"""Sum the estimated time of the defects"""
+		# `estimated_time` is fetched into the rows on save; only look up rows without it
+		missing = [row.defect for row in self.defects if row.defect and not row.estimated_time]
+		estimated_times = dict(frappe.get_all(
+			'Defect',
+			filters={'name': ['in', missing]},
+			fields=['name', 'estimated_time'],
+			as_list=True
+		)) if missing else {}
+
+		self.estimated_minutes = sum(
+			flt(row.estimated_time or estimated_times.get(row.defect))
+			for row in self.defects
+			if row.defect
+		)
+
+	def set_defect_summary(self):
+		"""Keep the defect count and titles on the order, so lists need no child query"""
+		self.defect_count = len(self.defects)
+		self.defect_summary = get_defect_summary(row.defect_title or row.defect for row in self.defects)
+
+	@profiled('RepairOrder.set_expected_completion')
 	def set_expected_completion(self):
-		"""Auto-calculate expected completion based on defects"""
-		total_minutes = 0
-		
-		for defect_row in self.defects:
-			if defect_row.defect:
-				try:
-					defect_doc = frappe.get_doc('Defect', defect_row.defect)
-					if defect_doc.estimated_time:
-						total_minutes += flt(defect_doc.estimated_time)
-				except frappe.DoesNotExistError:
-					continue
-		
-		if total_minutes > 0:
-			# Add buffer (20%)
-			total_minutes = total_minutes * 1.2
-			
-			# Set expected completion
+		"""Auto-calculate expected completion from completion times of past orders"""
+		hours = get_expected_hours(self.device, [row.defect for row in self.defects])
+
+		# Without enough history, use the defect estimates with a 20% buffer
+		if hours is None and flt(self.estimated_minutes) > 0:
+			hours = flt(self.estimated_minutes) * 1.2 / 60
+
+		if hours:
 			self.expected_completion = add_to_date(
 				self.booking_date or now_datetime(),
-				hours=total_minutes / 60
+				hours=hours
 			)
 	
+	@profiled('RepairOrder.validate_status_change')
 	def validate_status_change(self):
 		"""Validate status transitions"""
 		if not self.has_value_changed('status'):
 			return
 		
 		old_status = self.get_doc_before_save().status if self.get_doc_before_save() else None
-		new_status = self.status
-		
-		# Cannot mark as Delivered if payment not complete (unless Manager)
-		if new_status == 'Delivered' and self.payment_status != 'Paid':
-			if 'System Manager' not in frappe.get_roles():
-				frappe.throw(
-					frappe._('Cannot mark as Delivered without full payment. Contact Manager for override.'),
-					title='Payment Required'
-				)
-		
-		# Cannot mark as Completed without defects/services
-		if new_status == 'Completed' and not self.defects:
-			frappe.throw(
-				frappe._('Cannot complete repair without defects/services recorded.'),
-				title='Missing Information'
-			)
-		
-		# Cannot go back to Pending Review from other statuses
-		if old_status and old_status != 'Pending Review' and new_status == 'Pending Review':
-			frappe.throw(
-				frappe._('Cannot return to Pending Review status'),
-				title='Invalid Status Change'
-			)
+		validate_status_transition(old_status, self.status, self.payment_status, bool(self.defects))
 	
+	@profiled('RepairOrder.notify_status_change')
 	def notify_status_change(self):
 		"""Send notification to customer on status change"""
 		# Check if this status should notify customer
@@ -177,7 +321,197 @@ class RepairOrder(Document):
 		return f"RB-{random_part}"
 
 
+def get_defect_summary(titles):
+	"""Comma separated defect titles, cut to fit `defect_summary` (like the backfill patch)"""
+	return ', '.join(title for title in titles if title)[:DEFECT_SUMMARY_LENGTH] or None
+
+
+def get_payment_status(paid_amount, grand_total):
+	"""Payment status for a paid amount, matching the UPDATE in `apply_payment`"""
+	if flt(paid_amount) <= 0:
+		return 'Unpaid'
+	if flt(paid_amount) >= flt(grand_total):
+		return 'Paid'
+	return 'Partially Paid'
+
+
+def validate_status_transition(old_status, new_status, payment_status, has_defects):
+	"""Check that a Repair Order may move from `old_status` to `new_status`"""
+	# Cannot mark as Delivered if payment not complete (unless Manager)
+	if new_status == 'Delivered' and payment_status != 'Paid':
+		if 'System Manager' not in frappe.get_roles():
+			frappe.throw(
+				frappe._('Cannot mark as Delivered without full payment. Contact Manager for override.'),
+				title='Payment Required'
+			)
+	
+	# Cannot mark as Completed without defects/services
+	if new_status == 'Completed' and not has_defects:
+		frappe.throw(
+			frappe._('Cannot complete repair without defects/services recorded.'),
+			title='Missing Information'
+		)
+	
+	# Cannot go back to Pending Review from other statuses
+	if old_status and old_status != 'Pending Review' and new_status == 'Pending Review':
+		frappe.throw(
+			frappe._('Cannot return to Pending Review status'),
+			title='Invalid Status Change'
+		)
+
+
+def on_doctype_update():
+	"""
+	Indexes for kanban columns, dashboards, keyset exports, retention, invoicing
+	and receivables, and for the lists of users restricted to branches or to
+	their assigned orders
+	"""
+	frappe.db.add_index('Repair Order', ['status', 'expected_completion'])
+	frappe.db.add_index('Repair Order', ['booking_date', 'name'])
+	frappe.db.add_index('Repair Order', ['pii_purged', 'booking_date'])
+	frappe.db.add_index('Repair Order', ['status', 'sales_invoice'])
+	frappe.db.add_index('Repair Order', ['outstanding_amount', 'customer', 'status'])
+	frappe.db.add_index('Repair Order', ['branch', 'status', 'expected_completion'])
+	frappe.db.add_index('Repair Order', ['branch', 'booking_date'])
+	frappe.db.add_index('Repair Order', ['branch', 'modified'])
+	frappe.db.add_index('Repair Order', ['assigned_to', 'modified'])
+	frappe.db.add_index('Repair Order', ['device'])
+
+
+@frappe.whitelist()
+@profiled('repair_order.update_status')
+def update_status(repair_order, status, expected_status=None, expected_modified=None, set_actual_completion=0):
+	"""
+	Change the status of a Repair Order without a full document save.
+
+	The write only applies if the order still has `expected_status` and
+	`expected_modified` (the values the caller last saw). Returns
+	`{'modified': ...}` on success, or `{'conflict': {...}}` with the current
+	values when someone else changed the order in between.
+	"""
+	frappe.has_permission('Repair Order', 'write', repair_order, throw=True)
+
+	current = get_conflict_values(repair_order)
+	if expected_status is not None and current.status != expected_status:
+		return {'conflict': current}
+
+	has_defects = status == 'Completed' and frappe.db.exists(
+		'Repair Order Defect', {'parenttype': 'Repair Order', 'parent': repair_order}
+	)
+	validate_status_transition(current.status, status, current.payment_status, has_defects)
+
+	modified = apply_status_update(
+		repair_order,
+		status,
+		expected_status=current.status,
+		expected_modified=expected_modified,
+		set_actual_completion=cint(set_actual_completion),
+		# The payment check above must still hold when the row is written
+		require_paid=status == 'Delivered' and 'System Manager' not in frappe.get_roles()
+	)
+	if not modified:
+		return {'conflict': get_conflict_values(repair_order)}
+
+	if current.status != status and frappe.get_cached_value('Repair Status', status, 'notify_customer'):
+		frappe.get_doc('Repair Order', repair_order).notify_status_change()
+
+	return {'modified': modified}
+
+
+def apply_status_update(
+	repair_order, status, expected_status=None, expected_modified=None,
+	set_actual_completion=False, require_paid=False
+):
+	"""
+	Write the status of a Repair Order if it still has the expected values.
+
+	Uses a single conditional UPDATE instead of locking the row first, and
+	records the change as a Version like a document save would. Returns the
+	new `modified` value, or None if nothing was written.
+	"""
+	if expected_status is None:
+		# Needed to move the workload of the assigned technician
+		expected_status = frappe.db.get_value('Repair Order', repair_order, 'status')
+
+	modified = now_datetime()
+	values = {
+		'name': repair_order,
+		'status': status,
+		'modified': modified,
+		'user': frappe.session.user,
+		'expected_status': expected_status,
+		'expected_modified': expected_modified
+	}
+
+	conditions = ['name = %(name)s']
+	if expected_status is not None:
+		conditions.append('status = %(expected_status)s')
+	if expected_modified:
+		conditions.append('modified = %(expected_modified)s')
+	if require_paid:
+		conditions.append("payment_status = 'Paid'")
+
+	frappe.db.sql("""
+		UPDATE `tabRepair Order`
+		SET status = %(status)s,
+			{actual_completion}
+			modified = %(modified)s,
+			modified_by = %(user)s
+		WHERE {conditions}
+	""".format(
+		actual_completion='actual_completion = %(modified)s,' if set_actual_completion else '',
+		conditions=' AND '.join(conditions)
+	), values)
+
+	if not frappe.db._cursor.rowcount:
+		return None
+
+	clear_timeline_cache(repair_order)
+	clear_kanban_cache()
+	queue_status_update(repair_order, status)
+	publish_status_events(repair_order, status, expected_status)
+	update_status_workload(repair_order, expected_status, status)
+	if status != expected_status:
+		record_status_change(repair_order, modified)
+		add_status_version(repair_order, expected_status, status)
+
+	return modified
+
+
+def add_status_version(repair_order, previous_status, status):
+	"""Add the Version entry a document save would write, so the change shows in the form timeline"""
+	frappe.get_doc({
+		'doctype': 'Version',
+		'ref_doctype': 'Repair Order',
+		'docname': repair_order,
+		'data': frappe.as_json({
+			'added': [],
+			'changed': [['status', previous_status, status]],
+			'removed': [],
+			'row_changed': []
+		})
+	}).insert(ignore_permissions=True)
+
+
+def get_conflict_values(repair_order):
+	"""Current values of a Repair Order, returned to clients whose update conflicted"""
+	current = frappe.db.get_value(
+		'Repair Order',
+		repair_order,
+		['name', 'status', 'paid_amount', 'payment_status', 'modified', 'modified_by'],
+		as_dict=True
+	)
+	if not current:
+		frappe.throw(
+			_('Repair Order {0} not found').format(repair_order),
+			frappe.DoesNotExistError
+		)
+
+	return current
+
+
 @frappe.whitelist()
+@profiled('repair_order.get_my_repairs')
 def get_my_repairs():
 	"""Get repairs assigned to current user (for Dashboard)"""
 	user = frappe.session.user
@@ -188,7 +522,7 @@ def get_my_repairs():
 			'assigned_to': user,
 			'status': ['not in', ['Delivered', 'Cancelled']]
 		},
-		fields=['name', 'customer_name', 'device', 'status', 'priority', 'expected_completion'],
+		fields=['name', 'customer_name', 'device', 'defect_summary', 'status', 'priority', 'expected_completion'],
 		order_by='expected_completion asc'
 	)
 	
@@ -196,14 +530,15 @@ def get_my_repairs():
 
 
 @frappe.whitelist()
+@profiled('repair_order.get_overdue_repairs')
 def get_overdue_repairs():
 	"""Get overdue repairs"""
 	repairs = frappe.get_all(
 		'Repair Order',
-		filters={
+		filters=add_permission_filters({
 			'expected_completion': ['<', now_datetime()],
 			'status': ['not in', ['Delivered', 'Cancelled', 'Completed']]
-		},
+		}),
 		fields=['name', 'customer_name', 'device', 'status', 'expected_completion', 'assigned_to'],
 		order_by='expected_completion asc'
 	)
@@ -212,8 +547,13 @@ def get_overdue_repairs():
 
 
 @frappe.whitelist()
+@profiled('repair_order.quick_create_customer')
 def quick_create_customer(customer_name, contact_number, email=None):
-	"""Quick create customer from Repair Order form"""
+	"""Quick create customer from Repair Order form, reusing a customer with the same number"""
+	existing = get_customer_by_phone(contact_number)
+	if existing:
+		return existing
+
 	customer = frappe.get_doc({
 		'doctype': 'Customer',
 		'customer_name': customer_name,
@@ -228,6 +568,63 @@ def quick_create_customer(customer_name, contact_number, email=None):
 
 
 @frappe.whitelist()
+@profiled('repair_order.lookup_customers_by_phone')
+def lookup_customers_by_phone(phone):
+	"""
+	Find customers by phone number, with their open repairs.
+
+	Customers with the exact number come first (`exact: 1`), then customers
+	whose number only shares the last digits, e.g. one stored without its
+	country code.
+	"""
+	frappe.has_permission('Customer', 'read', throw=True)
+
+	matches = find_customers(phone)
+	if not matches:
+		return []
+
+	names = [customer for customer, exact in matches]
+	customers = {
+		customer.name: customer
+		for customer in frappe.get_all(
+			'Customer',
+			filters={'name': ['in', names]},
+			fields=['name', 'customer_name', 'mobile_no', 'email_id']
+		)
+	}
+
+	open_repairs = {}
+	for repair in frappe.get_all(
+		'Repair Order',
+		filters=add_permission_filters({'customer': ['in', names], 'status': ['not in', ['Delivered', 'Cancelled']]}),
+		fields=['name', 'customer', 'device', 'status', 'expected_completion'],
+		order_by='booking_date desc'
+	):
+		open_repairs.setdefault(repair.pop('customer'), []).append(repair)
+
+	return [
+		dict(customers[customer], exact=int(exact), open_repairs=open_repairs.get(customer, []))
+		for customer, exact in matches
+		if customer in customers
+	]
+
+
+def get_customer_by_phone(phone):
+	"""The one customer with this number, if exactly one can be told apart"""
+	matches = find_customers(phone)
+	exact = [customer for customer, is_exact in matches if is_exact]
+
+	if len(exact) == 1:
+		return exact[0]
+
+	if not exact and len(matches) == 1:
+		return matches[0][0]
+
+	return None
+
+
+@frappe.whitelist()
+@profiled('repair_order.get_inspection_checklist')
 def get_inspection_checklist(device):
 	"""
 	Get inspection checklist items for a device.
@@ -240,43 +637,19 @@ def get_inspection_checklist(device):
 	if not device:
 		return []
 
-	# Get device type from the device
-	device_type = frappe.db.get_value('Device', device, 'device_type')
-
-	# Strategy 1: Look for template specific to this device
-	template_result = frappe.db.sql("""
-		SELECT name FROM `tabInspection Checklist Template`
-		WHERE device = %s AND is_active = 1
-		ORDER BY is_default DESC
-		LIMIT 1
-	""", (device,), as_dict=True)
-	template = template_result[0].name if template_result else None
-
-	# Strategy 2: Fallback to device type template
-	if not template and device_type:
-		# Find template by device_type where device is not set (general template)
-		template_result = frappe.db.sql("""
-			SELECT name FROM `tabInspection Checklist Template`
-			WHERE device_type = %s
-			AND (device IS NULL OR device = '')
-			AND is_active = 1
-			ORDER BY is_default DESC
-			LIMIT 1
-		""", (device_type,), as_dict=True)
-		template = template_result[0].name if template_result else None
+	template = get_inspection_template(device)
 
 	if not template:
 		return []
 
-	# Get checklist items from the template
-	template_doc = frappe.get_doc('Inspection Checklist Template', template)
+	# Get checklist items from the cached template items
 	checklist_items = []
 
-	for item in template_doc.checklist_items:
+	for item_name, category, is_mandatory in get_template_items(template)['items']:
 		checklist_items.append({
-			'item_name': item.item_name,
-			'category': item.category,
-			'is_mandatory': item.is_mandatory,
+			'item_name': item_name,
+			'category': category,
+			'is_mandatory': is_mandatory,
 			'status': '',
 			'is_defective': 0,
 			'notes': ''
@@ -286,3 +659,124 @@ def get_inspection_checklist(device):
 		'template_name': template,
 		'items': checklist_items
 	}
+
+
+@frappe.whitelist()
+@profiled('repair_order.get_repair_timeline')
+def get_repair_timeline(repair_order, public_only=0):
+	"""
+	Get the full history of a repair order in one call.
+
+	Returns the order header, the `device_inspection` and `defects` child rows
+	and the Repair Logs in chronological order with the full name of the user
+	who wrote them. The result is built with four queries and cached until the
+	order or one of its logs changes.
+
+	With `public_only`, internal fields and non-public logs are stripped so the
+	result can be shown to the customer.
+	"""
+	timeline = frappe.cache().hget(TIMELINE_CACHE_KEY, repair_order)
+
+	if timeline is None:
+		timeline = build_repair_timeline(repair_order)
+		if not timeline:
+			frappe.throw(
+				_('Repair Order {0} not found').format(repair_order),
+				frappe.DoesNotExistError
+			)
+		frappe.cache().hset(TIMELINE_CACHE_KEY, repair_order, timeline)
+
+	# Check permission against the cached header instead of reloading the order
+	frappe.has_permission(
+		'Repair Order', 'read',
+		doc=frappe.get_doc(dict(timeline['order'], doctype='Repair Order')),
+		throw=True
+	)
+
+	if cint(public_only):
+		timeline = get_public_timeline(timeline)
+
+	return timeline
+
+
+def build_repair_timeline(repair_order):
+	"""Load the timeline data for a repair order, or None if it does not exist"""
+	order = frappe.db.get_value(
+		'Repair Order', repair_order, TIMELINE_HEADER_FIELDS, as_dict=True
+	)
+	if not order:
+		return None
+
+	child_filters = {'parenttype': 'Repair Order', 'parent': repair_order}
+
+	inspection_data = order.pop('inspection_data')
+	if inspection_data:
+		device_inspection = [
+			dict(row, idx=idx) for idx, row in enumerate(unpack_inspection(inspection_data), 1)
+		]
+	else:
+		device_inspection = frappe.get_all(
+			'Device Inspection Item',
+			filters=dict(child_filters, parentfield='device_inspection'),
+			fields=['idx', 'item_name', 'category', 'status', 'is_defective', 'is_mandatory', 'notes'],
+			order_by='idx asc'
+		)
+
+	defects = frappe.get_all(
+		'Repair Order Defect',
+		filters=dict(child_filters, parentfield='defects'),
+		fields=['idx', 'defect', 'defect_title', 'estimated_time', 'cost_amount', 'selling_price'],
+		order_by='idx asc'
+	)
+
+	logs = frappe.db.sql("""
+		SELECT
+			log.name, log.log_date, log.status, log.notes,
+			log.is_public, log.notify_customer, log.updated_by,
+			COALESCE(usr.full_name, log.updated_by) AS updated_by_name
+		FROM `tabRepair Log` log
+		LEFT JOIN `tabUser` usr ON usr.name = log.updated_by
+		WHERE log.repair_order = %s
+		ORDER BY log.log_date ASC, log.creation ASC
+	""", (repair_order,), as_dict=True)
+
+	return {
+		'order': order,
+		'device_inspection': device_inspection,
+		'defects': defects,
+		'logs': logs
+	}
+
+
+def get_public_timeline(timeline):
+	"""Strip internal fields and logs from a timeline before showing it to customers"""
+	order = {k: v for k, v in timeline['order'].items() if k not in TIMELINE_PRIVATE_FIELDS}
+
+	defects = [
+		{k: v for k, v in row.items() if k != 'cost_amount'}
+		for row in timeline['defects']
+	]
+
+	logs = [
+		{k: v for k, v in log.items() if k != 'updated_by'}
+		for log in timeline['logs']
+		if log.is_public
+	]
+
+	return {
+		'order': order,
+		'device_inspection': timeline['device_inspection'],
+		'defects': defects,
+		'logs': logs
+	}
+
+
+def clear_timeline_cache(repair_order):
+	"""Invalidate the cached timeline of a repair order"""
+	if repair_order:
+		frappe.cache().hdel(TIMELINE_CACHE_KEY, repair_order)
+
+
+def get_inspection_template(device):
+	"""Get the Inspection Checklist Template that applies to a device, if any"""
+	return get_template_for_device(device)
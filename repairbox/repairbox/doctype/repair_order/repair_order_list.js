@@ -0,0 +1,152 @@
+// Copyright (c) 2026, Me and contributors
+// For license information, please see license.txt
+
+frappe.provide('repairbox.kanban');
+
+// ========================================
+// REPAIR STATUS KANBAN BOARD
+// ========================================
+//
+// The "Repair Status" board loads its cards from get_kanban_data, one grouped
+// query for all columns, instead of the generic list API. Later refreshes
+// pass the `modified` cursor of the last response and merge the changed
+// cards. Boards with filters from the filter bar keep the stock loading,
+// since the endpoint always returns the whole board.
+
+repairbox.kanban.BOARD = 'Repair Status';
+repairbox.kanban.METHOD = 'repairbox.repairbox.kanban.get_kanban_data';
+
+repairbox.kanban.is_repair_board = function (listview) {
+    return listview.view_name === 'Kanban'
+        && listview.board_name === repairbox.kanban.BOARD
+        && !(listview.filters && listview.filters.length);
+};
+
+repairbox.kanban.setup = function (listview) {
+    const get_call_args = listview.get_call_args.bind(listview);
+    const prepare_data = listview.prepare_data.bind(listview);
+
+    listview.get_call_args = function () {
+        if (!repairbox.kanban.is_repair_board(this)) {
+            return get_call_args();
+        }
+        return {
+            method: repairbox.kanban.METHOD,
+            args: { limit_per_column: this.page_length }
+        };
+    };
+
+    listview.prepare_data = function (r) {
+        const board = r.message || {};
+        if (!repairbox.kanban.is_repair_board(this) || !board.columns) {
+            return prepare_data(r);
+        }
+
+        this.repairbox_board = {
+            modified: board.modified,
+            statuses: board.columns.map(column => column.status),
+            counts: {},
+            cards: {}
+        };
+        board.columns.forEach(column => {
+            this.repairbox_board.counts[column.status] = column.count;
+            column.cards.forEach(card => {
+                this.repairbox_board.cards[card.name] = card;
+            });
+        });
+        this.data = Object.values(this.repairbox_board.cards);
+    };
+};
+
+// Show the total of every column, which may exceed the cards loaded
+repairbox.kanban.render_counts = function (listview) {
+    const board = listview.repairbox_board;
+    if (!board || !listview.$result) {
+        return;
+    }
+
+    board.statuses.forEach(status => {
+        const $header = listview.$result
+            .find(`.kanban-column[data-column-value="${CSS.escape(status)}"] .kanban-column-header`);
+        let $count = $header.find('.repairbox-column-count');
+        if (!$count.length) {
+            $count = $('<span class="repairbox-column-count text-muted small ml-2"></span>').appendTo($header);
+        }
+        $count.text(board.counts[status] || 0);
+    });
+};
+
+// Fetch the cards changed since the last response and merge them into the board
+repairbox.kanban.refresh_changes = function (listview) {
+    const board = listview.repairbox_board;
+    if (!board || !repairbox.kanban.is_repair_board(listview)) {
+        return listview.refresh();
+    }
+
+    return frappe.xcall(repairbox.kanban.METHOD, {
+        limit_per_column: listview.page_length,
+        since: board.modified
+    }).then(delta => {
+        if (delta.full) {
+            listview.prepare_data({ message: delta });
+            listview.render();
+            repairbox.kanban.render_counts(listview);
+            return;
+        }
+
+        board.modified = delta.modified;
+        if (!delta.changed) {
+            return;
+        }
+
+        Object.assign(board.counts, delta.counts);
+        (delta.cards || []).forEach(card => {
+            if (board.statuses.includes(card.status)) {
+                board.cards[card.name] = card;
+            } else {
+                // Moved off the board
+                delete board.cards[card.name];
+            }
+        });
+        listview.data = Object.values(board.cards);
+        listview.render();
+        repairbox.kanban.render_counts(listview);
+    });
+};
+
+// Update open lists and boards from realtime pushes (see repairbox.js)
+// instead of reloading them on a timer
+repairbox.kanban.listen = function (listview) {
+    const namespace = `.repairbox_${listview.view_name}`;
+    const is_shown = () => listview.$result && listview.$result.is(':visible');
+    const refresh = frappe.utils.debounce(() => {
+        if (!is_shown()) {
+            return;
+        }
+        if (repairbox.kanban.is_repair_board(listview)) {
+            repairbox.kanban.refresh_changes(listview);
+        } else {
+            listview.refresh();
+        }
+    }, 300);
+
+    $(document)
+        .off(namespace)
+        .on(`repairbox:order_update${namespace}`, refresh)
+        .on(`repairbox:resync${namespace}`, () => is_shown() && listview.refresh());
+};
+
+frappe.listview_settings['Repair Order'] = {
+    onload: function (listview) {
+        if (listview.view_name === 'Kanban') {
+            repairbox.kanban.setup(listview);
+        }
+        repairbox.kanban.listen(listview);
+    },
+
+    refresh: function (listview) {
+        if (repairbox.kanban.is_repair_board(listview)) {
+            repairbox.kanban.render_counts(listview);
+        }
+    }
+};
@@ -1,9 +1,149 @@
 # Copyright (c) 2026, Me and contributors
 # For license information, please see license.txt
 
-# import frappe
-from frappe.tests.utils import FrappeTestCase
+import frappe
+from frappe.utils import add_to_date, now_datetime
 
+from repairbox.repairbox.doctype.repair_order.repair_order import (
+	get_inspection_checklist,
+	get_my_repairs,
+	get_overdue_repairs,
+	update_status
+)
+from repairbox.tests.utils import (
+	TEST_DEVICE,
+	QueryBudgetTestCase,
+	make_repair_order,
+	make_test_records,
+	set_event_consumers
+)
 
-# class TestRepairOrder(FrappeTestCase):
-# 	pass
+# Query budgets, measured with warm metadata caches on the full path: orders
+# assigned to a technician and one event consumer enabled. Totals, payment
+# status, the defect summary and the branch are set on the document or read
+# from cache and cost no query of their own.
+STATUS_INTERVAL_QUERIES = 2  # close the open stint, open the next one
+WORKLOAD_QUERIES = 1  # one load upsert per technician
+TECHNICIAN_QUERIES = 1  # `assigned_to` link check
+EVENT_QUERIES = 1  # one insert per event for all consumers
+
+INSERT_BUDGET = 25 + STATUS_INTERVAL_QUERIES + WORKLOAD_QUERIES + TECHNICIAN_QUERIES + EVENT_QUERIES
+SAVE_BUDGET = 25 + TECHNICIAN_QUERIES
+STATUS_CHANGE_BUDGET = 28 + STATUS_INTERVAL_QUERIES + TECHNICIAN_QUERIES + EVENT_QUERIES
+
+# Extra queries allowed per additional defect row (insert and link check)
+QUERIES_PER_DEFECT = 2
+
+
+class TestRepairOrder(QueryBudgetTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+		set_event_consumers('file')
+		# Warm metadata and settings caches so budgets only cover the operation
+		make_repair_order(assigned_to=frappe.session.user).insert()
+
+	@classmethod
+	def tearDownClass(cls):
+		set_event_consumers('')
+		super().tearDownClass()
+
+	def test_insert_query_budget(self):
+		doc = make_repair_order(defects=2, assigned_to=frappe.session.user)
+		with self.assertQueryBudget(INSERT_BUDGET, 'Repair Order insert'):
+			doc.insert()
+
+	def test_insert_queries_per_defect(self):
+		self.assertQueriesPerRow(
+			QUERIES_PER_DEFECT,
+			lambda defects: make_repair_order(defects=defects).insert(),
+			operation='Repair Order insert'
+		)
+
+	def test_expected_completion_from_defects(self):
+		doc = make_repair_order(defects=2).insert()
+		# 30 + 60 minutes with a 20% buffer
+		self.assertEqual(
+			doc.expected_completion,
+			add_to_date(doc.booking_date, minutes=108)
+		)
+
+	def test_defect_summary(self):
+		doc = make_repair_order(defects=2).insert()
+		self.assertEqual(doc.defect_count, 2)
+		self.assertEqual(doc.defect_summary, 'Test Repair 1, Test Repair 2')
+
+	def test_save_query_budget(self):
+		doc = make_repair_order(defects=2, assigned_to=frappe.session.user).insert()
+		doc = frappe.get_doc('Repair Order', doc.name)
+		doc.technician_notes = 'Screen replaced'
+		with self.assertQueryBudget(SAVE_BUDGET, 'Repair Order save'):
+			doc.save()
+
+	def test_save_queries_per_defect(self):
+		def load(defects):
+			doc = make_repair_order(defects=defects).insert()
+			doc = frappe.get_doc('Repair Order', doc.name)
+			doc.technician_notes = 'Checked'
+			doc.expected_completion = None
+			return doc
+
+		self.assertQueriesPerRow(
+			QUERIES_PER_DEFECT,
+			lambda doc: doc.save(),
+			setup=load,
+			operation='Repair Order save'
+		)
+
+	def test_status_change_query_budget(self):
+		doc = make_repair_order(defects=2, assigned_to=frappe.session.user).insert()
+		doc = frappe.get_doc('Repair Order', doc.name)
+		doc.status = 'In Progress'
+		with self.assertQueryBudget(STATUS_CHANGE_BUDGET, 'Repair Order status change'):
+			doc.save()
+
+	def test_update_status_conflict(self):
+		doc = make_repair_order().insert()
+		self.assertIn('modified', update_status(doc.name, 'In Progress', expected_status='Pending Review'))
+
+		# A second writer that still saw Pending Review gets the current values back
+		result = update_status(doc.name, 'On Hold', expected_status='Pending Review')
+		self.assertEqual(result['conflict']['status'], 'In Progress')
+		self.assertEqual(frappe.db.get_value('Repair Order', doc.name, 'status'), 'In Progress')
+
+	def test_update_status_adds_version(self):
+		doc = make_repair_order().insert()
+		update_status(doc.name, 'In Progress', expected_status='Pending Review')
+
+		version = frappe.get_last_doc('Version', filters={'ref_doctype': 'Repair Order', 'docname': doc.name})
+		self.assertEqual(frappe.parse_json(version.data).changed, [['status', 'Pending Review', 'In Progress']])
+
+	def test_get_inspection_checklist_query_budget(self):
+		get_inspection_checklist(TEST_DEVICE)
+		with self.assertQueryBudget(2, 'get_inspection_checklist'):
+			get_inspection_checklist(TEST_DEVICE)
+
+	def test_get_my_repairs_query_budget(self):
+		make_repair_order(assigned_to=frappe.session.user).insert()
+		with self.assertQueryBudget(2, 'get_my_repairs'):
+			get_my_repairs()
+
+	def test_get_my_repairs_queries_per_order(self):
+		def assign(orders):
+			for _ in range(orders):
+				make_repair_order(assigned_to=frappe.session.user).insert()
+
+		self.assertQueriesPerRow(0, lambda _: get_my_repairs(), setup=assign, operation='get_my_repairs')
+
+	def test_get_overdue_repairs_query_budget(self):
+		make_repair_order(expected_completion=add_to_date(now_datetime(), days=-1)).insert()
+		with self.assertQueryBudget(2, 'get_overdue_repairs'):
+			get_overdue_repairs()
+
+	def test_get_overdue_repairs_queries_per_order(self):
+		def make_overdue(orders):
+			for _ in range(orders):
+				make_repair_order(expected_completion=add_to_date(now_datetime(), days=-1)).insert()
+
+		self.assertQueriesPerRow(0, lambda _: get_overdue_repairs(), setup=make_overdue, operation='get_overdue_repairs')
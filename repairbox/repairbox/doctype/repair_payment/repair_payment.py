@@ -0,0 +1,115 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import cint, flt, now_datetime
+
+from repairbox.repairbox.doctype.repair_order.repair_order import clear_timeline_cache
+from repairbox.repairbox.kanban import clear_kanban_cache
+from repairbox.repairbox.outbox import publish_payment_event
+from repairbox.repairbox.permissions import get_repair_order_conditions
+
+DEFAULT_RECEIVABLES_LIMIT = 100
+MAX_RECEIVABLES_LIMIT = 500
+
+
+class RepairPayment(Document):
+	def validate(self):
+		"""Only positive payments against orders that are not cancelled"""
+		if flt(self.amount) <= 0:
+			frappe.throw(_('Payment amount must be greater than zero'))
+
+		if frappe.db.get_value('Repair Order', self.repair_order, 'status') == 'Cancelled':
+			frappe.throw(_('Cannot record a payment for cancelled Repair Order {0}').format(self.repair_order))
+
+	def on_submit(self):
+		apply_payment(self.repair_order, self.amount)
+		publish_payment_event(self, 'payment_recorded')
+
+	def on_cancel(self):
+		apply_payment(self.repair_order, -flt(self.amount))
+		publish_payment_event(self, 'payment_cancelled')
+
+
+def apply_payment(repair_order, amount):
+	"""
+	Add `amount` to the paid amount of a Repair Order with a relative UPDATE.
+
+	Earlier payments are never read again, and concurrent payments of the
+	same order both count since each adds to the stored total.
+	"""
+	# MariaDB assigns left to right with the new values, Postgres uses the old
+	# ones; paid_amount is assigned last so both read the previous total
+	frappe.db.sql("""
+		UPDATE `tabRepair Order`
+		SET outstanding_amount = grand_total - (paid_amount + %(amount)s),
+			payment_status = CASE
+				WHEN paid_amount + %(amount)s <= 0 THEN 'Unpaid'
+				WHEN paid_amount + %(amount)s >= grand_total THEN 'Paid'
+				ELSE 'Partially Paid'
+			END,
+			modified = %(modified)s,
+			modified_by = %(user)s,
+			paid_amount = paid_amount + %(amount)s
+		WHERE name = %(name)s
+	""", {
+		'name': repair_order,
+		'amount': flt(amount),
+		'modified': now_datetime(),
+		'user': frappe.session.user
+	})
+
+	clear_timeline_cache(repair_order)
+	clear_kanban_cache()
+
+
+@frappe.whitelist()
+def record_payment(repair_order, amount, mode_of_payment=None, reference=None):
+	"""Record and submit a payment from the Repair Order form"""
+	payment = frappe.get_doc({
+		'doctype': 'Repair Payment',
+		'repair_order': repair_order,
+		'amount': flt(amount),
+		'mode_of_payment': mode_of_payment,
+		'reference': reference
+	})
+	payment.insert()
+	payment.submit()
+
+	return frappe.db.get_value(
+		'Repair Order', repair_order,
+		['paid_amount', 'outstanding_amount', 'payment_status', 'modified'],
+		as_dict=True
+	)
+
+
+@frappe.whitelist()
+def get_receivables(limit=DEFAULT_RECEIVABLES_LIMIT, offset=0):
+	"""
+	Outstanding balance per customer, largest first.
+
+	Reads only the orders with a balance from the (outstanding_amount,
+	customer, status) index; users restricted to branches or to their
+	assigned orders only get the balances of those orders.
+	"""
+	frappe.has_permission('Repair Order', 'report', throw=True)
+	conditions = get_repair_order_conditions()
+
+	return frappe.db.sql("""
+		SELECT customer, COUNT(*) AS orders, SUM(outstanding_amount) AS outstanding_amount
+		FROM `tabRepair Order`
+		WHERE outstanding_amount > 0 AND status != 'Cancelled' {conditions}
+		GROUP BY customer
+		ORDER BY outstanding_amount DESC, customer ASC
+		LIMIT %(limit)s OFFSET %(offset)s
+	""".format(conditions=f'AND {conditions}' if conditions else ''), {
+		'limit': min(cint(limit) or DEFAULT_RECEIVABLES_LIMIT, MAX_RECEIVABLES_LIMIT),
+		'offset': cint(offset)
+	}, as_dict=True)
+
+
+def on_doctype_update():
+	"""Index for the list of users restricted to branches, sorted by payment date"""
+	frappe.db.add_index('Repair Payment', ['branch', 'payment_date'])
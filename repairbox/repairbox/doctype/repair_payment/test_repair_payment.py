@@ -0,0 +1,38 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.repairbox.doctype.repair_payment.repair_payment import record_payment
+from repairbox.tests.utils import make_repair_order, make_test_records
+
+
+class TestRepairPayment(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+
+	def test_payments_update_order(self):
+		doc = make_repair_order(defects=1).insert()
+
+		result = record_payment(doc.name, 10)
+		self.assertEqual(result.payment_status, 'Partially Paid')
+		self.assertEqual(result.outstanding_amount, doc.grand_total - 10)
+
+		result = record_payment(doc.name, doc.grand_total - 10)
+		self.assertEqual(result.payment_status, 'Paid')
+		self.assertEqual(result.outstanding_amount, 0)
+
+	def test_cancel_reverses_payment(self):
+		doc = make_repair_order(defects=1).insert()
+		record_payment(doc.name, doc.grand_total)
+
+		payment = frappe.get_last_doc('Repair Payment', filters={'repair_order': doc.name})
+		payment.cancel()
+
+		self.assertEqual(
+			frappe.db.get_value('Repair Order', doc.name, ['paid_amount', 'payment_status']),
+			(0, 'Unpaid')
+		)
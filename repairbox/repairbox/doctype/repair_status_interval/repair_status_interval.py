@@ -0,0 +1,111 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now_datetime
+
+
+class RepairStatusInterval(Document):
+	pass
+
+
+def get_hours_expression(start, end):
+	"""SQL for the hours between two datetime columns or parameters"""
+	if frappe.db.db_type == 'postgres':
+		return f"EXTRACT(EPOCH FROM ({end} - {start})) / 3600"
+
+	return f"TIMESTAMPDIFF(SECOND, {start}, {end}) / 3600"
+
+
+def record_status_change(repair_order, changed_on=None):
+	"""
+	Close the open stint of a Repair Order and open one for its current status.
+
+	Call after the new status (or technician) is written. The new stint takes
+	the status, technician and branch from the order row, so callers writing
+	the status directly do not need to read the order first.
+	"""
+	changed_on = changed_on or now_datetime()
+	close_open_interval(repair_order, changed_on)
+
+	frappe.db.sql("""
+		INSERT INTO `tabRepair Status Interval`
+			(name, repair_order, status, technician, branch, started_on, creation, modified, owner, modified_by)
+		SELECT %(name)s, name, status, assigned_to, branch, %(changed_on)s, %(now)s, %(now)s, %(user)s, %(user)s
+		FROM `tabRepair Order`
+		WHERE name = %(repair_order)s
+	""", {
+		'name': frappe.generate_hash(length=10),
+		'repair_order': repair_order,
+		'changed_on': changed_on,
+		'now': now_datetime(),
+		'user': frappe.session.user
+	})
+
+
+def close_open_interval(repair_order, ended_on=None):
+	"""End the open stint of a Repair Order, if any"""
+	frappe.db.sql("""
+		UPDATE `tabRepair Status Interval`
+		SET ended_on = %(ended_on)s,
+			duration_hours = {hours}
+		WHERE repair_order = %(repair_order)s AND ended_on IS NULL
+	""".format(hours=get_hours_expression('started_on', '%(ended_on)s')), {
+		'repair_order': repair_order,
+		'ended_on': ended_on or now_datetime()
+	})
+
+
+def delete_intervals(repair_order):
+	frappe.db.delete('Repair Status Interval', {'repair_order': repair_order})
+
+
+def rebuild_all():
+	"""
+	Rebuild all stints from the Repair Log history.
+
+	Every log that changed the status starts a stint that ends at the next
+	change; orders without logs get one open stint from their booking date.
+	Stints take the currently assigned technician, since past assignments
+	are not recorded.
+	"""
+	frappe.db.delete('Repair Status Interval')
+
+	values = {'now': now_datetime(), 'user': frappe.session.user}
+	frappe.db.sql("""
+		INSERT INTO `tabRepair Status Interval`
+			(name, repair_order, status, technician, branch, started_on, ended_on, duration_hours,
+			creation, modified, owner, modified_by)
+		SELECT spans.name, spans.repair_order, spans.status, ro.assigned_to, ro.branch, spans.log_date,
+			spans.next_log_date, {hours}, %(now)s, %(now)s, %(user)s, %(user)s
+		FROM (
+			SELECT name, repair_order, status, log_date,
+				LEAD(log_date) OVER (PARTITION BY repair_order ORDER BY log_date, creation) AS next_log_date
+			FROM (
+				SELECT name, repair_order, status, log_date, creation,
+					LAG(status) OVER (PARTITION BY repair_order ORDER BY log_date, creation) AS previous_status
+				FROM `tabRepair Log`
+				WHERE status IS NOT NULL AND status != ''
+			) logs
+			WHERE previous_status IS NULL OR previous_status != status
+		) spans
+		JOIN `tabRepair Order` ro ON ro.name = spans.repair_order
+	""".format(hours=get_hours_expression('spans.log_date', 'spans.next_log_date')), values)
+
+	frappe.db.sql("""
+		INSERT INTO `tabRepair Status Interval`
+			(name, repair_order, status, technician, branch, started_on, creation, modified, owner, modified_by)
+		SELECT ro.name, ro.name, ro.status, ro.assigned_to, ro.branch, COALESCE(ro.booking_date, ro.creation),
+			%(now)s, %(now)s, %(user)s, %(user)s
+		FROM `tabRepair Order` ro
+		WHERE NOT EXISTS (SELECT 1 FROM `tabRepair Log` log WHERE log.repair_order = ro.name)
+	""", values)
+
+
+def on_doctype_update():
+	"""Indexes for closing the open stint and for the Time in Status report"""
+	frappe.db.add_index('Repair Status Interval', ['repair_order', 'ended_on'])
+	frappe.db.add_index('Repair Status Interval', ['status', 'started_on'])
+	frappe.db.add_index('Repair Status Interval', ['technician', 'started_on'])
+	frappe.db.add_index('Repair Status Interval', ['branch', 'status', 'started_on'])
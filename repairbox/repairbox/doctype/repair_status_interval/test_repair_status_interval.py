@@ -0,0 +1,41 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.repairbox.doctype.repair_order.repair_order import update_status
+from repairbox.tests.utils import make_repair_order, make_test_records
+
+
+class TestRepairStatusInterval(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+
+	def test_status_changes_close_stints(self):
+		doc = make_repair_order().insert()
+		update_status(doc.name, 'In Progress', expected_status='Pending Review')
+		update_status(doc.name, 'Testing', expected_status='In Progress')
+
+		stints = get_stints(doc.name)
+		self.assertEqual([stint.status for stint in stints], ['Pending Review', 'In Progress', 'Testing'])
+		self.assertTrue(all(stint.ended_on for stint in stints[:-1]))
+		self.assertIsNone(stints[-1].ended_on)
+
+	def test_save_without_status_change_keeps_stint(self):
+		doc = make_repair_order().insert()
+		doc.technician_notes = 'Checked'
+		doc.save()
+
+		self.assertEqual(len(get_stints(doc.name)), 1)
+
+
+def get_stints(repair_order):
+	return frappe.get_all(
+		'Repair Status Interval',
+		filters={'repair_order': repair_order},
+		fields=['status', 'started_on', 'ended_on'],
+		order_by='started_on asc, creation asc'
+	)
@@ -0,0 +1,17 @@
+// Copyright (c) 2026, Me and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('RepairBox Settings', {
+    refresh(frm) {
+        if (frm.doc.invoice_company && frm.doc.default_invoice_item) {
+            frm.add_custom_button(__('Invoice Delivered Orders'), () => {
+                frappe.call('repairbox.repairbox.invoicing.enqueue_invoicing').then(() => {
+                    frappe.show_alert({
+                        message: __('Invoicing started in the background'),
+                        indicator: 'green'
+                    });
+                });
+            });
+        }
+    }
+});
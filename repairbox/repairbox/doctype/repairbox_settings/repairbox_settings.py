@@ -0,0 +1,25 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class RepairBoxSettings(Document):
+	def on_update(self):
+		"""Convert existing data when the storage mode or the phone country code changes"""
+		if self.has_value_changed('compact_inspection_storage'):
+			frappe.enqueue(
+				'repairbox.repairbox.inspection_storage.migrate_inspection_storage',
+				queue='long',
+				timeout=3600,
+				enqueue_after_commit=True
+			)
+
+		if self.has_value_changed('default_country_code'):
+			frappe.enqueue(
+				'repairbox.repairbox.doctype.customer_phone_index.customer_phone_index.rebuild_all',
+				queue='long',
+				timeout=3600,
+				enqueue_after_commit=True
+			)
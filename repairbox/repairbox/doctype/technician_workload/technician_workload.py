@@ -0,0 +1,283 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, now_datetime
+
+TECHNICIAN_ROLE = "Technician"
+
+# Orders in these statuses have no remaining repair work
+CLOSED_STATUSES = ('Completed', 'Ready for Pickup', 'Delivered', 'Cancelled')
+
+
+class TechnicianWorkload(Document):
+	pass
+
+
+def get_order_load(technician, status, estimated_minutes):
+	"""`(technician, minutes, orders)` a Repair Order adds to a workload"""
+	if not technician or status in CLOSED_STATUSES:
+		return None
+
+	return technician, flt(estimated_minutes), 1
+
+
+def update_order_workload(doc):
+	"""Move the load of a saved Repair Order between technicians as needed"""
+	previous = doc.get_doc_before_save()
+	before = get_order_load(previous.assigned_to, previous.status, previous.estimated_minutes) if previous else None
+	after = get_order_load(doc.assigned_to, doc.status, doc.estimated_minutes)
+	apply_load_change(before, after)
+
+
+def update_status_workload(repair_order, old_status, new_status):
+	"""Apply the load change of a status written directly to the database"""
+	if (old_status in CLOSED_STATUSES) == (new_status in CLOSED_STATUSES):
+		return
+
+	technician, estimated_minutes = frappe.db.get_value(
+		'Repair Order', repair_order, ['assigned_to', 'estimated_minutes']
+	)
+	apply_load_change(
+		get_order_load(technician, old_status, estimated_minutes),
+		get_order_load(technician, new_status, estimated_minutes)
+	)
+
+
+def remove_order_workload(doc):
+	"""Drop the load of a deleted Repair Order"""
+	apply_load_change(get_order_load(doc.assigned_to, doc.status, doc.estimated_minutes), None)
+
+
+def apply_load_change(before, after):
+	"""Subtract the `before` load and add the `after` load with relative updates"""
+	if before == after:
+		return
+
+	if before:
+		add_load(before[0], -before[1], -before[2])
+	if after:
+		add_load(*after)
+
+
+def add_load(technician, minutes, orders):
+	"""
+	Add to the load of one technician in a single upsert, creating the
+	workload row on first use. Concurrent first loads of a technician both
+	count, since the second one finds the row the first inserted.
+	"""
+	conflict = (
+		'ON CONFLICT (name) DO UPDATE SET'
+		if frappe.db.db_type == 'postgres' else
+		'ON DUPLICATE KEY UPDATE'
+	)
+	frappe.db.sql(f"""
+		INSERT INTO `tabTechnician Workload`
+			(name, technician, is_available, branch, load_minutes, open_orders,
+			creation, modified, owner, modified_by)
+		SELECT %(technician)s, %(technician)s,
+			CASE WHEN EXISTS (
+				SELECT 1
+				FROM `tabUser` usr
+				JOIN `tabHas Role` role ON role.parent = usr.name AND role.parenttype = 'User'
+				WHERE usr.name = %(technician)s AND role.role = %(role)s AND usr.enabled = 1
+			) THEN 1 ELSE 0 END,
+			(
+				SELECT perm.for_value
+				FROM `tabUser Permission` perm
+				WHERE perm.user = %(technician)s AND perm.allow = 'Branch'
+				ORDER BY perm.is_default DESC, perm.for_value ASC
+				LIMIT 1
+			),
+			GREATEST(%(minutes)s, 0), GREATEST(%(orders)s, 0),
+			%(now)s, %(now)s, %(user)s, %(user)s
+		{conflict}
+			load_minutes = `tabTechnician Workload`.load_minutes + %(minutes)s,
+			open_orders = `tabTechnician Workload`.open_orders + %(orders)s
+	""", {
+		'technician': technician,
+		'minutes': minutes,
+		'orders': orders,
+		'role': TECHNICIAN_ROLE,
+		'now': now_datetime(),
+		'user': frappe.session.user
+	})
+
+
+def get_least_loaded_technician(branch=None):
+	"""
+	Get the available technician with the least remaining work.
+
+	For an order of a `branch`, technicians of that branch come first, then
+	technicians without a branch. Reads the first entry of the (branch,
+	is_available, load_minutes) index, so the cost does not grow with the
+	number of orders.
+	"""
+	if not branch:
+		return get_first_available()
+
+	return get_first_available('branch = %(branch)s', branch) or get_first_available('branch IS NULL')
+
+
+def get_first_available(condition=None, branch=None):
+	result = frappe.db.sql("""
+		SELECT technician
+		FROM `tabTechnician Workload`
+		WHERE is_available = 1 {condition}
+		ORDER BY load_minutes ASC, open_orders ASC, technician ASC
+		LIMIT 1
+	""".format(condition=f'AND {condition}' if condition else ''), {'branch': branch})
+
+	return result[0][0] if result else None
+
+
+@frappe.whitelist()
+def get_technician_workloads():
+	"""Get the load of every technician, least loaded first (for managers)"""
+	frappe.has_permission('Technician Workload', 'read', throw=True)
+
+	return frappe.db.sql("""
+		SELECT wl.technician, COALESCE(usr.full_name, wl.technician) AS technician_name,
+			wl.is_available, wl.load_minutes, wl.open_orders
+		FROM `tabTechnician Workload` wl
+		LEFT JOIN `tabUser` usr ON usr.name = wl.technician
+		ORDER BY wl.is_available DESC, wl.load_minutes ASC, wl.technician ASC
+	""", as_dict=True)
+
+
+def rebuild_all():
+	"""
+	Recompute all workloads from the open orders.
+
+	For migrations and benchmark data only: loads added by orders saved during
+	the rebuild can be lost. Keeps the availability of existing rows, adds
+	rows for technicians who have none yet and sets the branch of every
+	technician.
+	"""
+	loads = get_open_order_loads()
+
+	existing = set(frappe.get_all('Technician Workload', pluck='name'))
+	branches = get_technician_branches()
+	frappe.db.sql("""
+		UPDATE `tabTechnician Workload`
+		SET load_minutes = 0, open_orders = 0, branch = NULL
+	""")
+	for technician in existing & (set(loads) | set(branches)):
+		minutes, orders = loads.get(technician, (0, 0))
+		frappe.db.set_value(
+			'Technician Workload', technician,
+			{'load_minutes': minutes, 'open_orders': orders, 'branch': branches.get(technician)},
+			update_modified=False
+		)
+
+	technicians = set(get_technicians())
+	insert_workloads([
+		(technician, *loads.get(technician, (0, 0)))
+		for technician in sorted((technicians | set(loads)) - existing)
+	])
+
+
+def report_workload_drift():
+	"""
+	Log workloads that differ from their open orders (daily check).
+
+	Only reads: loads are kept by relative updates as orders change, and a
+	report leaves any fix (`rebuild_all`) to a quiet moment. Returns the
+	drifted `(technician, load_minutes, open_orders, expected_minutes, expected_orders)`.
+	"""
+	loads = get_open_order_loads()
+	drift = []
+	for technician, minutes, orders in frappe.db.sql("""
+		SELECT name, load_minutes, open_orders
+		FROM `tabTechnician Workload`
+	"""):
+		expected_minutes, expected_orders = loads.pop(technician, (0, 0))
+		if flt(minutes) != flt(expected_minutes) or orders != expected_orders:
+			drift.append((technician, flt(minutes), orders, flt(expected_minutes), expected_orders))
+
+	# Technicians with open orders but no workload row
+	drift += [(technician, 0, 0, flt(minutes), orders) for technician, (minutes, orders) in loads.items()]
+
+	if drift:
+		frappe.log_error(
+			title=f'Technician Workload drift for {len(drift)} technicians',
+			message='\n'.join(
+				f'{technician}: {minutes} min / {orders} orders, open orders add up to '
+				f'{expected_minutes} min / {expected_orders} orders'
+				for technician, minutes, orders, expected_minutes, expected_orders in drift
+			)
+		)
+
+	return drift
+
+
+def get_open_order_loads():
+	"""`technician -> (minutes, orders)` of the open orders assigned to each technician"""
+	return {
+		technician: (minutes, orders)
+		for technician, minutes, orders in frappe.db.sql("""
+			SELECT assigned_to, COALESCE(SUM(estimated_minutes), 0), COUNT(*)
+			FROM `tabRepair Order`
+			WHERE assigned_to IS NOT NULL AND assigned_to != ''
+			AND status NOT IN %s
+			GROUP BY assigned_to
+		""", (CLOSED_STATUSES,))
+	}
+
+
+def get_technicians():
+	"""Enabled users with the Technician role"""
+	return frappe.db.sql_list("""
+		SELECT DISTINCT usr.name
+		FROM `tabUser` usr
+		JOIN `tabHas Role` role ON role.parent = usr.name AND role.parenttype = 'User'
+		WHERE role.role = %s AND usr.enabled = 1
+	""", TECHNICIAN_ROLE)
+
+
+def get_technician_branches():
+	"""Default branch of every user restricted to branches, from their User Permissions"""
+	branches = {}
+	for user, branch in frappe.db.sql("""
+		SELECT user, for_value
+		FROM `tabUser Permission`
+		WHERE allow = 'Branch'
+		ORDER BY is_default DESC, for_value ASC
+	"""):
+		branches.setdefault(user, branch)
+
+	return branches
+
+
+def insert_workloads(workloads):
+	"""Insert rows for `(technician, load_minutes, open_orders)`"""
+	if not workloads:
+		return
+
+	# Only technicians are auto-assigned; others only carry the load of manual assignments
+	technicians = set(get_technicians())
+	branches = get_technician_branches()
+	now = now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		'Technician Workload',
+		fields=[
+			'name', 'technician', 'is_available', 'branch', 'load_minutes', 'open_orders',
+			'creation', 'modified', 'owner', 'modified_by'
+		],
+		values=[
+			(
+				technician, technician, int(technician in technicians), branches.get(technician),
+				minutes, orders, now, now, user, user
+			)
+			for technician, minutes, orders in workloads
+		],
+		ignore_duplicates=True
+	)
+
+
+def on_doctype_update():
+	"""Indexes read by get_least_loaded_technician"""
+	frappe.db.add_index('Technician Workload', ['is_available', 'load_minutes'])
+	frappe.db.add_index('Technician Workload', ['branch', 'is_available', 'load_minutes'])
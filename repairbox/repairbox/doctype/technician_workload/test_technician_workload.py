@@ -0,0 +1,123 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import flt
+
+from repairbox.repairbox.doctype.technician_workload.technician_workload import (
+	TECHNICIAN_ROLE,
+	add_load,
+	get_least_loaded_technician,
+	get_open_order_loads,
+	report_workload_drift
+)
+from repairbox.tests.utils import make_repair_order, make_test_records
+
+TEST_BRANCH = '_Test RepairBox Workload Branch'
+TEST_TECHNICIANS = ('test_workload_1@example.com', 'test_workload_2@example.com')
+
+
+class TestTechnicianWorkload(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+		if not frappe.db.exists('Branch', TEST_BRANCH):
+			frappe.get_doc({'doctype': 'Branch', 'branch': TEST_BRANCH}).insert()
+		for technician in TEST_TECHNICIANS:
+			make_technician(technician)
+
+	def test_first_loads_create_and_add_up(self):
+		technician = f'{frappe.generate_hash(length=8)}@example.com'
+		add_load(technician, 30, 1)
+		add_load(technician, 45, 1)
+		add_load(technician, -30, -1)
+
+		self.assertEqual(get_load(technician), (45, 1))
+		# Not a technician, so never auto-assigned
+		self.assertEqual(frappe.db.get_value('Technician Workload', technician, 'is_available'), 0)
+		frappe.db.delete('Technician Workload', {'name': technician})
+
+	def test_load_follows_assignment_and_status(self):
+		first, second = TEST_TECHNICIANS
+		first_before, second_before = get_load(first), get_load(second)
+
+		# 30 + 60 minutes
+		doc = make_repair_order(defects=2, assigned_to=first, branch=TEST_BRANCH).insert()
+		self.assertEqual(get_load(first), added(first_before, 90, 1))
+
+		doc.assigned_to = second
+		doc.save()
+		self.assertEqual(get_load(first), first_before)
+		self.assertEqual(get_load(second), added(second_before, 90, 1))
+
+		doc.status = 'Cancelled'
+		doc.save()
+		self.assertEqual(get_load(second), second_before)
+
+	def test_auto_assigns_least_loaded_technician_of_branch(self):
+		make_repair_order(defects=2, assigned_to=TEST_TECHNICIANS[0], branch=TEST_BRANCH).insert()
+		expected = min(TEST_TECHNICIANS, key=lambda technician: (*get_load(technician), technician))
+		self.assertEqual(get_least_loaded_technician(TEST_BRANCH), expected)
+
+		set_auto_assign(1)
+		try:
+			doc = make_repair_order(branch=TEST_BRANCH).insert()
+		finally:
+			set_auto_assign(0)
+
+		self.assertEqual(doc.assigned_to, expected)
+
+	def test_report_workload_drift(self):
+		technician = TEST_TECHNICIANS[0]
+		make_repair_order(assigned_to=technician, branch=TEST_BRANCH).insert()
+		self.assertNotIn(technician, [row[0] for row in report_workload_drift()])
+
+		minutes, orders = get_load(technician)
+		add_load(technician, 15, 0)
+		try:
+			drift = {row[0]: row for row in report_workload_drift()}
+			self.assertEqual(drift[technician], (technician, minutes + 15, orders, minutes, orders))
+			# Reported, not fixed
+			self.assertEqual(get_load(technician), (minutes + 15, orders))
+		finally:
+			add_load(technician, -15, 0)
+
+
+def make_technician(email):
+	if not frappe.db.exists('User', email):
+		frappe.get_doc({
+			'doctype': 'User',
+			'email': email,
+			'first_name': email.split('@')[0],
+			'send_welcome_email': 0,
+			'roles': [{'role': TECHNICIAN_ROLE}]
+		}).insert(ignore_permissions=True)
+
+	if not frappe.db.exists('User Permission', {'user': email, 'allow': 'Branch', 'for_value': TEST_BRANCH}):
+		frappe.get_doc({
+			'doctype': 'User Permission',
+			'user': email,
+			'allow': 'Branch',
+			'for_value': TEST_BRANCH
+		}).insert(ignore_permissions=True)
+
+	# Rows get their branch and availability when first created
+	frappe.db.delete('Technician Workload', {'name': email})
+	add_load(email, *get_open_order_loads().get(email, (0, 0)))
+
+
+def set_auto_assign(enabled):
+	settings = frappe.get_single('RepairBox Settings')
+	settings.auto_assign_technicians = enabled
+	settings.save()
+
+
+def get_load(technician):
+	load = frappe.db.get_value('Technician Workload', technician, ['load_minutes', 'open_orders'])
+	return (flt(load[0]), load[1]) if load else (0, 0)
+
+
+def added(load, minutes, orders):
+	return load[0] + minutes, load[1] + orders
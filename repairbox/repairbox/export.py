@@ -0,0 +1,281 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Streaming file exports.
+
+Rows are written one at a time to a file, or to a spooled temporary file for
+downloads, which stays in memory for small exports and moves to disk for
+large ones. Neither the rows nor the encoded file are ever held in memory as
+a whole.
+
+`export_repair_orders` reads Repair Orders in keyset-ordered chunks and loads
+the child rows of each chunk with one query per child table:
+
+	bench --site <site> repairbox-export-orders --from-date 2026-09-01 --to-date 2026-09-30 --format xlsx
+"""
+
+import csv
+import io
+import json
+import tempfile
+
+import frappe
+from frappe.utils import add_days, getdate
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import FileWrapper
+
+from repairbox.repairbox.branch import get_user_branches
+from repairbox.repairbox.inspection_storage import ROW_FIELDS, unpack_inspection
+
+# Exports larger than this are spooled to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+
+BLOCK_SIZE = 64 * 1024
+
+FILE_FORMATS = {
+	'csv': 'text/csv; charset=utf-8',
+	'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+	'jsonl': 'application/x-ndjson'
+}
+
+ORDER_FIELDS = [
+	'name', 'customer', 'customer_name', 'contact_number', 'email',
+	'brand', 'device', 'device_model', 'serial_number',
+	'status', 'priority', 'assigned_to', 'branch',
+	'total_service_amount', 'priority_charge', 'tax_amount', 'grand_total',
+	'paid_amount', 'payment_status', 'tracking_id',
+	'booking_date', 'expected_completion', 'actual_completion'
+]
+
+DEFECT_FIELDS = ['defect', 'defect_title', 'estimated_time', 'cost_amount', 'selling_price']
+
+INSPECTION_FIELDS = list(ROW_FIELDS)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class CSVWriter:
+	def __init__(self, fileobj):
+		self.text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='', write_through=True)
+		self.writer = csv.writer(self.text)
+
+	def write_row(self, row):
+		self.writer.writerow(row)
+
+	def close(self):
+		# Leave the underlying file open for the caller
+		self.text.detach()
+
+
+class XLSXWriter:
+	"""Write-only workbook, openpyxl keeps only the current row in memory"""
+
+	def __init__(self, fileobj):
+		from openpyxl import Workbook
+
+		self.fileobj = fileobj
+		self.workbook = Workbook(write_only=True)
+		self.sheet = self.workbook.create_sheet()
+
+	def write_row(self, row):
+		self.sheet.append(row)
+
+	def close(self):
+		self.workbook.save(self.fileobj)
+
+
+class JSONLWriter:
+	def __init__(self, fileobj):
+		self.fileobj = fileobj
+
+	def write_record(self, record):
+		self.fileobj.write(json.dumps(record, default=str).encode() + b'\n')
+
+	def close(self):
+		pass
+
+
+WRITERS = {'csv': CSVWriter, 'xlsx': XLSXWriter, 'jsonl': JSONLWriter}
+
+
+def get_writer(file_format, fileobj):
+	if file_format not in WRITERS:
+		frappe.throw(frappe._('Unsupported export format: {0}').format(file_format))
+
+	return WRITERS[file_format](fileobj)
+
+
+def stream_csv(filename, header, rows):
+	"""Download response with `header` and the `rows` iterable as CSV"""
+	spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+	writer = CSVWriter(spool)
+	writer.write_row(header)
+	for row in rows:
+		writer.write_row(row)
+	writer.close()
+
+	return file_response(spool, f'{filename}.csv', FILE_FORMATS['csv'])
+
+
+def file_response(spool, filename, mimetype):
+	"""Response sending an open file from the start and closing it afterwards"""
+	spool.seek(0)
+	return Response(
+		FileWrapper(spool, BLOCK_SIZE),
+		mimetype=mimetype,
+		headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+		direct_passthrough=True
+	)
+
+
+# Repair Orders
+
+@frappe.whitelist()
+def download_repair_orders(from_date=None, to_date=None, status=None, file_format='csv'):
+	"""Download Repair Orders with their defects and inspection rows, of the user's branches"""
+	frappe.has_permission('Repair Order', 'export', throw=True)
+
+	spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+	export_repair_orders(
+		spool, file_format, from_date=from_date, to_date=to_date, status=status,
+		branches=get_user_branches()
+	)
+
+	return file_response(spool, f'repair-orders.{file_format}', FILE_FORMATS[file_format])
+
+
+def export_repair_orders(
+	fileobj, file_format='csv', from_date=None, to_date=None, status=None, branches=None,
+	chunk_size=DEFAULT_CHUNK_SIZE
+):
+	"""
+	Write Repair Orders booked in the date range to the binary `fileobj`.
+
+	CSV and XLSX follow the Data Export layout: the first defect and
+	inspection row share the line of their order, further rows follow on
+	lines with empty order columns. JSON Lines writes one object per order
+	with nested `defects` and `inspection` lists. Returns the order count.
+	"""
+	writer = get_writer(file_format, fileobj)
+	if file_format != 'jsonl':
+		writer.write_row(
+			ORDER_FIELDS
+			+ [f'defects.{field}' for field in DEFECT_FIELDS]
+			+ [f'inspection.{field}' for field in INSPECTION_FIELDS]
+		)
+
+	count = 0
+	for orders in iter_order_chunks(from_date, to_date, status, branches, chunk_size):
+		for order in orders:
+			if file_format == 'jsonl':
+				writer.write_record(order)
+			else:
+				for row in flatten_order(order):
+					writer.write_row(row)
+
+		count += len(orders)
+
+	writer.close()
+	return count
+
+
+def iter_order_chunks(from_date=None, to_date=None, status=None, branches=None, chunk_size=DEFAULT_CHUNK_SIZE):
+	"""
+	Yield lists of orders with their child rows, in (booking_date, name) order.
+
+	Each chunk continues after the last order of the previous one, so every
+	query reads only its own rows from the (booking_date, name) index.
+	"""
+	values = {
+		'from_date': getdate(from_date) if from_date else None,
+		'to_date': add_days(getdate(to_date), 1) if to_date else None,
+		'status': status,
+		'branches': tuple(branches or ()),
+		'limit': chunk_size,
+		'last_date': None,
+		'last_name': None
+	}
+
+	conditions = []
+	if from_date:
+		conditions.append('booking_date >= %(from_date)s')
+	if to_date:
+		conditions.append('booking_date < %(to_date)s')
+	if status:
+		conditions.append('status = %(status)s')
+	if branches:
+		conditions.append('branch IN %(branches)s')
+
+	while True:
+		keyset = ['(booking_date > %(last_date)s OR (booking_date = %(last_date)s AND name > %(last_name)s))'] \
+			if values['last_name'] else []
+
+		orders = frappe.db.sql("""
+			SELECT {fields}, inspection_data
+			FROM `tabRepair Order`
+			{where}
+			ORDER BY booking_date ASC, name ASC
+			LIMIT %(limit)s
+		""".format(
+			fields=', '.join(ORDER_FIELDS),
+			where=f"WHERE {' AND '.join(conditions + keyset)}" if conditions or keyset else ''
+		), values, as_dict=True)
+
+		if not orders:
+			return
+
+		add_child_rows(orders)
+		yield orders
+
+		if len(orders) < chunk_size:
+			return
+
+		values['last_date'] = orders[-1].booking_date
+		values['last_name'] = orders[-1].name
+
+
+def add_child_rows(orders):
+	"""Attach defects and inspection rows to a chunk with one query per child table"""
+	names = tuple(order.name for order in orders)
+	defects, inspection = {}, {}
+
+	for row in frappe.db.sql("""
+		SELECT parent, {fields}
+		FROM `tabRepair Order Defect`
+		WHERE parenttype = 'Repair Order' AND parentfield = 'defects' AND parent IN %(names)s
+		ORDER BY parent, idx
+	""".format(fields=', '.join(DEFECT_FIELDS)), {'names': names}, as_dict=True):
+		defects.setdefault(row.pop('parent'), []).append(row)
+
+	for row in frappe.db.sql("""
+		SELECT parent, {fields}
+		FROM `tabDevice Inspection Item`
+		WHERE parenttype = 'Repair Order' AND parentfield = 'device_inspection' AND parent IN %(names)s
+		ORDER BY parent, idx
+	""".format(fields=', '.join(INSPECTION_FIELDS)), {'names': names}, as_dict=True):
+		inspection.setdefault(row.pop('parent'), []).append(row)
+
+	for order in orders:
+		payload = order.pop('inspection_data')
+		order.defects = defects.get(order.name, [])
+		# Orders saved with compact storage have no inspection rows
+		order.inspection = inspection.get(order.name) or unpack_inspection(payload)
+
+
+def flatten_order(order):
+	"""Lines of one order in the Data Export layout"""
+	empty_order = [None] * len(ORDER_FIELDS)
+	for idx in range(max(len(order.defects), len(order.inspection), 1)):
+		line = [order.get(field) for field in ORDER_FIELDS] if idx == 0 else list(empty_order)
+		line += get_child_values(order.defects, idx, DEFECT_FIELDS)
+		line += get_child_values(order.inspection, idx, INSPECTION_FIELDS)
+		yield line
+
+
+def get_child_values(rows, idx, fields):
+	if idx >= len(rows):
+		return [None] * len(fields)
+
+	return [rows[idx].get(field) for field in fields]
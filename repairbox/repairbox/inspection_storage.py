@@ -0,0 +1,253 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Compact storage for device inspection results.
+
+In compact mode a Repair Order keeps its inspection results in the
+`inspection_data` JSON field instead of one Device Inspection Item row per
+checklist item. A typical payload looks like:
+
+	{
+		"v": 1,
+		"template": "Smartphone Standard Inspection",
+		"fingerprint": "3f9a1c2e",
+		"rows": [
+			[["Screen", "Display", 1], "Pass"],
+			[["Housing", "Body", 0], "Fail", 1, "Cracked corner"]
+		]
+	}
+
+Each row is `[[item_name, category, is_mandatory], status, is_defective, notes]`
+with trailing empty values dropped. Rows carry the identity of their item
+rather than its position in the template, so editing or deleting the
+template never changes recorded results; the fingerprint only tells the
+form that the template changed since.
+"""
+
+import hashlib
+import json
+
+import frappe
+from frappe.utils import cint, now_datetime
+
+PAYLOAD_VERSION = 1
+
+# Redis hash caching the items of each Inspection Checklist Template
+TEMPLATE_ITEMS_CACHE_KEY = "repairbox_inspection_template_items"
+
+ROW_FIELDS = ('item_name', 'category', 'is_mandatory', 'status', 'is_defective', 'notes')
+
+
+def is_compact_storage_enabled():
+	"""Check whether new inspection results are stored in compact mode"""
+	if frappe.flags.repairbox_compact_inspection is not None:
+		return bool(frappe.flags.repairbox_compact_inspection)
+
+	return bool(cint(frappe.get_cached_doc('RepairBox Settings').compact_inspection_storage))
+
+
+def get_template_items(template):
+	"""Get the cached `(item_name, category, is_mandatory)` items and fingerprint of a template"""
+	if not template:
+		return None
+
+	cached = frappe.cache().hget(TEMPLATE_ITEMS_CACHE_KEY, template)
+	if cached is not None:
+		return cached
+
+	items = [
+		(row.item_name, row.category, cint(row.is_mandatory))
+		for row in frappe.get_all(
+			'Inspection Checklist Item',
+			filters={'parenttype': 'Inspection Checklist Template', 'parent': template},
+			fields=['item_name', 'category', 'is_mandatory'],
+			order_by='idx asc'
+		)
+	]
+	cached = {'items': items, 'fingerprint': get_fingerprint(items)}
+	frappe.cache().hset(TEMPLATE_ITEMS_CACHE_KEY, template, cached)
+
+	return cached
+
+
+def clear_template_items_cache(template):
+	"""Invalidate the cached items of a template"""
+	if template:
+		frappe.cache().hdel(TEMPLATE_ITEMS_CACHE_KEY, template)
+
+
+def get_fingerprint(items):
+	"""Short hash of the template items, used to detect edited templates"""
+	if not items:
+		return None
+
+	return hashlib.sha1(
+		json.dumps([list(item) for item in items], separators=(',', ':')).encode()
+	).hexdigest()[:8]
+
+
+def pack_inspection(rows, template=None):
+	"""Build the compact payload for a list of inspection rows"""
+	template_items = get_template_items(template)
+
+	packed_rows = []
+	for row in rows:
+		packed = [
+			[row.get('item_name'), row.get('category'), cint(row.get('is_mandatory'))],
+			row.get('status') or '', cint(row.get('is_defective')), row.get('notes') or ''
+		]
+		while len(packed) > 1 and not packed[-1]:
+			packed.pop()
+		packed_rows.append(packed)
+
+	return {
+		'v': PAYLOAD_VERSION,
+		'template': template if template_items else None,
+		'fingerprint': template_items['fingerprint'] if template_items else None,
+		'rows': packed_rows
+	}
+
+
+def unpack_inspection(payload):
+	"""Expand a compact payload back into a list of inspection row dicts"""
+	if not payload:
+		return []
+
+	rows = []
+	for packed in parse_payload(payload).get('rows') or []:
+		item = packed[0]
+		values = list(packed[1:]) + [''] * (3 - len(packed[1:]))
+		rows.append(dict(zip(ROW_FIELDS, (
+			item[0], item[1], cint(item[2]),
+			values[0], cint(values[1]), values[2]
+		))))
+
+	return rows
+
+
+def parse_payload(payload):
+	if isinstance(payload, str):
+		payload = json.loads(payload)
+
+	if payload.get('v') != PAYLOAD_VERSION:
+		frappe.throw(frappe._('Unsupported inspection data version: {0}').format(payload.get('v')))
+
+	return payload
+
+
+def is_payload_stale(payload):
+	"""Check whether the template items changed since the payload was packed"""
+	if not payload:
+		return False
+
+	payload = parse_payload(payload)
+	if not payload.get('template'):
+		return False
+
+	template_items = get_template_items(payload['template'])
+	return not template_items or template_items['fingerprint'] != payload.get('fingerprint')
+
+
+def migrate_inspection_storage(batch_size=500):
+	"""Convert existing Repair Orders to the storage mode selected in RepairBox Settings"""
+	if is_compact_storage_enabled():
+		migrate_to_compact(batch_size)
+	else:
+		migrate_to_rows(batch_size)
+
+
+def migrate_to_compact(batch_size=500):
+	"""Pack Device Inspection Item rows into `inspection_data`, one batch per commit"""
+	from repairbox.repairbox.doctype.repair_order.repair_order import get_inspection_template
+
+	last_name = ''
+	while True:
+		orders = frappe.db.sql("""
+			SELECT name, device, inspection_template
+			FROM `tabRepair Order`
+			WHERE name > %s
+			AND name IN (
+				SELECT parent FROM `tabDevice Inspection Item`
+				WHERE parenttype = 'Repair Order'
+			)
+			ORDER BY name
+			LIMIT %s
+		""", (last_name, batch_size), as_dict=True)
+
+		if not orders:
+			break
+
+		names = [order.name for order in orders]
+		rows_by_order = {}
+		for row in frappe.get_all(
+			'Device Inspection Item',
+			filters={'parenttype': 'Repair Order', 'parent': ['in', names]},
+			fields=['parent'] + list(ROW_FIELDS),
+			order_by='parent asc, idx asc'
+		):
+			rows_by_order.setdefault(row.parent, []).append(row)
+
+		for order in orders:
+			template = order.inspection_template or get_inspection_template(order.device)
+			payload = pack_inspection(rows_by_order.get(order.name, []), template)
+			frappe.db.set_value(
+				'Repair Order', order.name,
+				{'inspection_data': json.dumps(payload, separators=(',', ':')), 'inspection_template': template},
+				update_modified=False
+			)
+
+		frappe.db.delete('Device Inspection Item', {
+			'parenttype': 'Repair Order',
+			'parent': ['in', names]
+		})
+		frappe.db.commit()
+
+		last_name = names[-1]
+
+
+def migrate_to_rows(batch_size=500):
+	"""Expand `inspection_data` payloads back into Device Inspection Item rows"""
+	last_name = ''
+	while True:
+		orders = frappe.db.sql("""
+			SELECT name, inspection_data
+			FROM `tabRepair Order`
+			WHERE name > %s
+			AND inspection_data IS NOT NULL AND inspection_data != ''
+			ORDER BY name
+			LIMIT %s
+		""", (last_name, batch_size), as_dict=True)
+
+		if not orders:
+			break
+
+		now = now_datetime()
+		values = []
+		for order in orders:
+			for idx, row in enumerate(unpack_inspection(order.inspection_data), 1):
+				values.append((
+					frappe.generate_hash(length=10), now, now, 'Administrator', 'Administrator',
+					order.name, 'Repair Order', 'device_inspection', idx,
+					row['item_name'], row['category'], row['is_mandatory'],
+					row['status'], row['is_defective'], row['notes']
+				))
+
+		if values:
+			frappe.db.bulk_insert(
+				'Device Inspection Item',
+				fields=[
+					'name', 'creation', 'modified', 'owner', 'modified_by',
+					'parent', 'parenttype', 'parentfield', 'idx'
+				] + list(ROW_FIELDS),
+				values=values
+			)
+
+		frappe.db.sql("""
+			UPDATE `tabRepair Order`
+			SET inspection_data = NULL
+			WHERE name IN %s
+		""", (tuple(order.name for order in orders),))
+		frappe.db.commit()
+
+		last_name = orders[-1].name
@@ -0,0 +1,164 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Batch intake of Repair Orders taken in while a counter was offline.
+
+The counter queues every intake with a key it generates itself and sends
+the queue as one batch once it is back online:
+
+	POST /api/method/repairbox.repairbox.intake.sync_intakes
+	{"intakes": [{"intake_key": "c2f1...", "customer_name": "...", "contact_number": "...",
+		"device": "...", "defects": [{"defect": "..."}], "device_inspection": [...]}]}
+
+Customers are looked up by phone number and created when missing, then the
+order is inserted with the key in its unique `intake_key` field. The whole
+batch is one transaction, with a savepoint per intake so a failing intake
+does not undo the others. Keys that were already synced return the
+existing order, so a counter can resend a batch whose response it never
+got without creating duplicates.
+"""
+
+import frappe
+from frappe import _
+
+from repairbox.repairbox.doctype.repair_order.repair_order import quick_create_customer
+
+MAX_BATCH_SIZE = 200
+
+# Repair Order fields a counter may set
+ORDER_FIELDS = (
+	'brand', 'device', 'device_model', 'serial_number', 'device_password',
+	'priority', 'assigned_to', 'branch', 'booking_date', 'expected_completion',
+	'additional_notes', 'inspection_template'
+)
+
+DEFECT_FIELDS = ('defect',)
+
+INSPECTION_FIELDS = ('item_name', 'category', 'is_mandatory', 'status', 'is_defective', 'notes')
+
+
+@frappe.whitelist(methods=['POST'])
+def sync_intakes(intakes):
+	"""
+	Create the Repair Orders of a batch of offline intakes.
+
+	Returns one result per intake, in order: `status` is "Created", "Exists"
+	(the key was synced before) or "Failed" with an `error` message, along
+	with the order `name` and `tracking_id` when there is one.
+	"""
+	frappe.has_permission('Repair Order', 'create', throw=True)
+
+	intakes = frappe.parse_json(intakes) or []
+	if len(intakes) > MAX_BATCH_SIZE:
+		frappe.throw(_('Send at most {0} intakes per batch').format(MAX_BATCH_SIZE))
+
+	for intake in intakes:
+		if not (intake or {}).get('intake_key'):
+			frappe.throw(_('Every intake needs an intake_key'))
+
+	synced = get_synced_orders([intake['intake_key'] for intake in intakes])
+
+	results = []
+	for intake in intakes:
+		key = intake['intake_key']
+		if key in synced:
+			results.append(get_result(key, 'Exists', synced[key]))
+			continue
+
+		result = create_intake(frappe._dict(intake))
+		if result['status'] == 'Created':
+			# The same key twice in one batch
+			synced[key] = frappe._dict(result)
+
+		results.append(result)
+
+	return results
+
+
+def get_synced_orders(keys):
+	"""Orders already created for any of the keys, with one query"""
+	return {
+		order.intake_key: order
+		for order in frappe.get_all(
+			'Repair Order',
+			filters={'intake_key': ['in', keys]},
+			fields=['name', 'tracking_id', 'customer', 'intake_key']
+		)
+	} if keys else {}
+
+
+def create_intake(intake):
+	"""Insert the customer and order of one intake, or report why it failed"""
+	frappe.db.savepoint('repair_order_intake')
+	try:
+		doc = frappe.get_doc(get_order_values(intake))
+		doc.insert()
+	except frappe.UniqueValidationError:
+		# Synced by a concurrent request since the batch was checked
+		frappe.db.rollback(save_point='repair_order_intake')
+		existing = get_synced_orders([intake.intake_key]).get(intake.intake_key)
+		if existing:
+			return get_result(intake.intake_key, 'Exists', existing)
+
+		return get_result(intake.intake_key, 'Failed', error=get_error_message())
+	except Exception:
+		frappe.db.rollback(save_point='repair_order_intake')
+		return get_result(intake.intake_key, 'Failed', error=get_error_message())
+
+	return get_result(intake.intake_key, 'Created', doc)
+
+
+def get_order_values(intake):
+	values = {field: intake.get(field) for field in ORDER_FIELDS if intake.get(field) is not None}
+	values.update({
+		'doctype': 'Repair Order',
+		'intake_key': intake.intake_key,
+		'customer': get_customer(intake),
+		'contact_number': intake.contact_number,
+		'email': intake.email,
+		'status': 'Pending Review',
+		'defects': [
+			{field: row.get(field) for field in DEFECT_FIELDS}
+			for row in intake.get('defects') or []
+		],
+		'device_inspection': [
+			{field: row.get(field) for field in INSPECTION_FIELDS}
+			for row in intake.get('device_inspection') or []
+		]
+	})
+
+	return values
+
+
+def get_customer(intake):
+	"""The given customer, or the customer with the intake's phone number, created if needed"""
+	if intake.customer:
+		if not frappe.db.exists('Customer', intake.customer):
+			frappe.throw(_('Customer {0} not found').format(intake.customer), frappe.DoesNotExistError)
+		return intake.customer
+
+	if not (intake.customer_name and intake.contact_number):
+		frappe.throw(_('Either a customer or a customer name and contact number is required'))
+
+	return quick_create_customer(intake.customer_name, intake.contact_number, intake.email)
+
+
+def get_error_message():
+	"""Message of the error being handled, returned with the intake instead of shown to the user"""
+	messages = frappe.local.message_log
+	frappe.local.message_log = []
+	if messages:
+		return frappe.parse_json(messages[-1]).get('message')
+
+	return frappe.get_traceback().strip().splitlines()[-1]
+
+
+def get_result(intake_key, status, order=None, error=None):
+	result = {'intake_key': intake_key, 'status': status}
+	if order:
+		result.update({'name': order.name, 'tracking_id': order.tracking_id, 'customer': order.customer})
+	if error:
+		result['error'] = error
+
+	return result
@@ -0,0 +1,195 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Batch Sales Invoices for delivered Repair Orders (requires ERPNext).
+
+Every delivered order without an invoice gets one Sales Invoice with a row
+per defect (item from the defect, or the default invoice item) and one for
+the priority charge. The invoice name is written back to the order in the
+same transaction, and each chunk is committed, so a stopped run is resumed
+by simply running again and no order is invoiced twice:
+
+	bench --site <site> execute repairbox.repairbox.invoicing.invoice_delivered_orders
+"""
+
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt, getdate
+
+# Redis key of the Defect -> Item map
+ITEM_MAP_CACHE_KEY = "repairbox_defect_item_map"
+
+DEFAULT_CHUNK_SIZE = 100
+
+# Runs stop after this long; the next run continues with the remaining orders
+MAX_RUN_SECONDS = 50 * 60
+
+
+@frappe.whitelist()
+def enqueue_invoicing():
+	"""Start invoicing delivered orders in the background (month-end closing)"""
+	frappe.only_for('System Manager')
+	validate_invoicing_setup()
+
+	frappe.enqueue(
+		'repairbox.repairbox.invoicing.invoice_delivered_orders',
+		queue='long',
+		timeout=MAX_RUN_SECONDS + 600,
+		job_id='repairbox_invoice_delivered_orders',
+		deduplicate=True
+	)
+
+
+def invoice_delivered_orders_daily():
+	"""Scheduled run, when enabled in RepairBox Settings"""
+	if cint(frappe.db.get_single_value('RepairBox Settings', 'auto_invoice_delivered')):
+		invoice_delivered_orders()
+
+
+def invoice_delivered_orders(chunk_size=DEFAULT_CHUNK_SIZE, max_seconds=MAX_RUN_SECONDS):
+	"""Invoice delivered orders in committed chunks; returns `(invoiced, failed)` counts"""
+	settings = validate_invoicing_setup()
+	item_map = get_item_map()
+	started = time.monotonic()
+	invoiced, failed = 0, 0
+	last_name = ''
+
+	while time.monotonic() - started < max_seconds:
+		orders = get_uninvoiced_orders(last_name, chunk_size)
+		if not orders:
+			break
+
+		defects = get_defect_rows([order.name for order in orders])
+		for order in orders:
+			if create_invoice(order, defects.get(order.name, []), item_map, settings):
+				invoiced += 1
+			else:
+				failed += 1
+
+		frappe.db.commit()
+		# Failed orders keep no invoice, skip past them for the rest of this run
+		last_name = orders[-1].name
+
+	return invoiced, failed
+
+
+def validate_invoicing_setup():
+	if 'erpnext' not in frappe.get_installed_apps():
+		frappe.throw(_('Invoicing Repair Orders requires ERPNext'))
+
+	settings = frappe.get_cached_doc('RepairBox Settings')
+	if not settings.invoice_company or not settings.default_invoice_item:
+		frappe.throw(_('Set the invoice company and default invoice item in RepairBox Settings'))
+
+	return settings
+
+
+def get_uninvoiced_orders(last_name, limit):
+	"""Next delivered orders without an invoice, read from the (status, sales_invoice) index"""
+	return frappe.db.sql("""
+		SELECT name, customer, priority, priority_charge, actual_completion
+		FROM `tabRepair Order`
+		WHERE status = 'Delivered'
+		AND (sales_invoice IS NULL OR sales_invoice = '')
+		AND name > %(last_name)s
+		ORDER BY name ASC
+		LIMIT %(limit)s
+	""", {'last_name': last_name, 'limit': limit}, as_dict=True)
+
+
+def get_defect_rows(orders):
+	"""Defect rows of a chunk of orders with one query"""
+	rows = {}
+	for row in frappe.db.sql("""
+		SELECT parent, defect, defect_title, selling_price
+		FROM `tabRepair Order Defect`
+		WHERE parenttype = 'Repair Order' AND parentfield = 'defects' AND parent IN %(orders)s
+		ORDER BY parent, idx
+	""", {'orders': tuple(orders)}, as_dict=True):
+		rows.setdefault(row.parent, []).append(row)
+
+	return rows
+
+
+def create_invoice(order, defects, item_map, settings):
+	"""Insert the invoice of one order and link it, or log why it failed"""
+	frappe.db.savepoint('repair_order_invoice')
+	try:
+		invoice = frappe.get_doc(get_invoice_values(order, defects, item_map, settings))
+		invoice.set_missing_values()
+		invoice.insert(ignore_permissions=True)
+		if cint(settings.submit_invoices):
+			invoice.submit()
+
+		# Another run may have invoiced the order since it was read
+		frappe.db.sql("""
+			UPDATE `tabRepair Order`
+			SET sales_invoice = %(invoice)s
+			WHERE name = %(order)s AND (sales_invoice IS NULL OR sales_invoice = '')
+		""", {'invoice': invoice.name, 'order': order.name})
+		if not frappe.db._cursor.rowcount:
+			frappe.db.rollback(save_point='repair_order_invoice')
+			return False
+	except Exception:
+		frappe.db.rollback(save_point='repair_order_invoice')
+		frappe.log_error(
+			f'Could not invoice Repair Order {order.name}',
+			reference_doctype='Repair Order',
+			reference_name=order.name
+		)
+		return False
+
+	return True
+
+
+def get_invoice_values(order, defects, item_map, settings):
+	items = [
+		{
+			'item_code': item_map.get(row.defect) or settings.default_invoice_item,
+			'description': row.defect_title or row.defect,
+			'qty': 1,
+			'rate': flt(row.selling_price)
+		}
+		for row in defects
+	]
+
+	if flt(order.priority_charge):
+		items.append({
+			'item_code': settings.priority_charge_item or settings.default_invoice_item,
+			'description': _('Priority Charge ({0})').format(order.priority),
+			'qty': 1,
+			'rate': flt(order.priority_charge)
+		})
+
+	return {
+		'doctype': 'Sales Invoice',
+		'company': settings.invoice_company,
+		'customer': order.customer,
+		'posting_date': getdate(order.actual_completion) if order.actual_completion else None,
+		'set_posting_time': 1 if order.actual_completion else 0,
+		'taxes_and_charges': settings.invoice_taxes_template,
+		'remarks': _('Repair Order {0}').format(order.name),
+		'items': items
+	}
+
+
+def get_item_map():
+	"""Invoice item of every Defect that has one, cached until a Defect item changes"""
+	item_map = frappe.cache().get_value(ITEM_MAP_CACHE_KEY)
+	if item_map is None:
+		item_map = dict(frappe.get_all(
+			'Defect',
+			filters={'item': ['is', 'set']},
+			fields=['name', 'item'],
+			as_list=True
+		))
+		frappe.cache().set_value(ITEM_MAP_CACHE_KEY, item_map)
+
+	return item_map
+
+
+def clear_item_map_cache():
+	frappe.cache().delete_value(ITEM_MAP_CACHE_KEY)
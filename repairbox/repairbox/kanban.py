@@ -0,0 +1,211 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Kanban board data for Repair Orders.
+
+`get_kanban_data` returns the per-status card counts and the first cards of
+every column of the "Repair Status" board from one grouped query. Every
+response carries a `modified` cursor, the server time of the last committed
+Repair Order change; boards that are already open pass it back as `since` and
+only get the cards that changed after it.
+
+Users restricted to branches or to their assigned orders (technicians) get
+boards of those orders only, cached separately from other users' boards.
+"""
+
+import frappe
+from frappe.utils import add_to_date, cint, get_datetime, now_datetime
+
+from repairbox.repairbox.permissions import add_permission_filters, get_permission_scope, get_repair_order_conditions
+
+KANBAN_BOARD = "Repair Status"
+
+# Redis hash with one cached board per permission scope and column size
+KANBAN_CACHE_KEY = "repairbox_kanban_board"
+
+# Timestamps of the last Repair Order change and deletion
+KANBAN_LAST_CHANGE_KEY = "repairbox_kanban_last_change"
+KANBAN_LAST_DELETE_KEY = "repairbox_kanban_last_delete"
+
+KANBAN_COLUMNS_CACHE_KEY = "repairbox_kanban_columns"
+
+# `device_image` is the WebP thumbnail of the device
+CARD_FIELDS = [
+	'name', 'customer_name', 'device', 'device_image', 'status', 'priority',
+	'expected_completion', 'assigned_to', 'branch', 'defect_count', 'defect_summary', 'modified'
+]
+
+# Delta queries look back a little further than `since` so changes committed
+# slightly out of order are not missed; clients merge cards by name
+DELTA_OVERLAP_SECONDS = 5
+
+DEFAULT_CARDS_PER_COLUMN = 20
+MAX_CARDS_PER_COLUMN = 100
+
+# Deltas with more changed cards than this are answered with the full board
+MAX_DELTA_CARDS = 500
+
+
+@frappe.whitelist()
+def get_kanban_data(limit_per_column=DEFAULT_CARDS_PER_COLUMN, since=None):
+	"""
+	Get Repair Order kanban data.
+
+	Without `since`, returns the full board: columns in board order, each with
+	its total count and first `limit_per_column` cards by expected completion.
+
+	With `since` (the `modified` cursor of the previous response), returns the
+	current counts and only the cards modified after it, including cards that
+	left the board. If nothing changed, no query is made at all. After a
+	deletion, or with more than MAX_DELTA_CARDS changed cards, the full board
+	is returned instead.
+	"""
+	frappe.has_permission('Repair Order', 'read', throw=True)
+
+	limit = min(cint(limit_per_column) or DEFAULT_CARDS_PER_COLUMN, MAX_CARDS_PER_COLUMN)
+	conditions = get_repair_order_conditions()
+
+	if since:
+		since = get_datetime(since)
+		last_delete = frappe.cache().get_value(KANBAN_LAST_DELETE_KEY)
+
+		# Deleted cards cannot be found by `modified`, reload the whole board
+		if not last_delete or get_datetime(last_delete) <= since:
+			delta = get_kanban_delta(since, conditions)
+			if delta:
+				return delta
+
+	key = f'{get_permission_scope()}:{limit}'
+	board = frappe.cache().hget(KANBAN_CACHE_KEY, key)
+	if board is None:
+		board = build_kanban_board(limit, conditions)
+		frappe.cache().hset(KANBAN_CACHE_KEY, key, board)
+
+	return board
+
+
+def build_kanban_board(limit, conditions=None):
+	"""
+	Load counts and the first `limit` cards of every column in one query.
+
+	`conditions` are the permission conditions of the user, see
+	`get_repair_order_conditions`.
+	"""
+	columns = get_kanban_columns()
+	board = {
+		'full': True,
+		# Read before the query, so changes committed meanwhile are in the next delta
+		'modified': get_change_cursor(),
+		'columns': [{'status': status, 'count': 0, 'cards': []} for status in columns]
+	}
+
+	if not columns:
+		return board
+
+	by_status = {column['status']: column for column in board['columns']}
+
+	cards = frappe.db.sql("""
+		SELECT {fields}, column_count
+		FROM (
+			SELECT {fields},
+				ROW_NUMBER() OVER (
+					PARTITION BY status
+					ORDER BY expected_completion IS NULL, expected_completion, name
+				) AS position,
+				COUNT(*) OVER (PARTITION BY status) AS column_count
+			FROM `tabRepair Order`
+			WHERE status IN %(statuses)s {conditions}
+		) cards
+		WHERE position <= %(limit)s
+		ORDER BY status, position
+	""".format(
+		fields=', '.join(CARD_FIELDS),
+		conditions=f'AND {conditions}' if conditions else ''
+	), {
+		'statuses': tuple(columns),
+		'limit': limit
+	}, as_dict=True)
+
+	for card in cards:
+		column = by_status[card.status]
+		column['count'] = card.pop('column_count')
+		column['cards'].append(card)
+
+	return board
+
+
+def get_kanban_delta(since, conditions=None):
+	"""Get current column counts and the cards modified after `since`, or None if too many changed"""
+	last_change = frappe.cache().get_value(KANBAN_LAST_CHANGE_KEY)
+	if last_change and get_datetime(last_change) <= since:
+		return {'full': False, 'changed': False, 'modified': str(since)}
+
+	cursor = last_change or str(now_datetime())
+
+	# Cards that moved off the board are included so clients can drop them
+	cards = frappe.get_all(
+		'Repair Order',
+		filters=add_permission_filters({'modified': ['>', add_to_date(since, seconds=-DELTA_OVERLAP_SECONDS)]}),
+		fields=CARD_FIELDS,
+		order_by='modified asc',
+		limit=MAX_DELTA_CARDS + 1
+	)
+	if len(cards) > MAX_DELTA_CARDS:
+		return None
+
+	columns = get_kanban_columns()
+
+	counts = dict(frappe.db.sql("""
+		SELECT status, COUNT(*)
+		FROM `tabRepair Order`
+		WHERE status IN %(statuses)s {conditions}
+		GROUP BY status
+	""".format(conditions=f'AND {conditions}' if conditions else ''), {
+		'statuses': tuple(columns)
+	})) if columns else {}
+
+	return {
+		'full': False,
+		'changed': True,
+		'modified': cursor,
+		'counts': {status: counts.get(status, 0) for status in columns},
+		'cards': cards
+	}
+
+
+def get_kanban_columns():
+	"""Get the active column statuses of the Repair Status board, in board order"""
+	columns = frappe.cache().get_value(KANBAN_COLUMNS_CACHE_KEY)
+	if columns is not None:
+		return columns
+
+	columns = frappe.get_all(
+		'Kanban Board Column',
+		filters={'parenttype': 'Kanban Board', 'parent': KANBAN_BOARD, 'status': 'Active'},
+		order_by='`order` asc, idx asc',
+		pluck='column_name'
+	)
+
+	if not columns:
+		columns = frappe.get_all('Repair Status', order_by='sort_order asc', pluck='name')
+
+	frappe.cache().set_value(KANBAN_COLUMNS_CACHE_KEY, columns, expires_in_sec=300)
+	return columns
+
+
+def get_change_cursor():
+	"""Server time of the last committed Repair Order change, returned to clients as `since`"""
+	return frappe.cache().get_value(KANBAN_LAST_CHANGE_KEY) or str(now_datetime())
+
+
+def clear_kanban_cache(deleted=False):
+	"""Invalidate cached boards once the current Repair Order change is committed"""
+	def invalidate():
+		now = str(now_datetime())
+		frappe.cache().delete_value(KANBAN_CACHE_KEY)
+		frappe.cache().set_value(KANBAN_LAST_CHANGE_KEY, now)
+		if deleted:
+			frappe.cache().set_value(KANBAN_LAST_DELETE_KEY, now)
+
+	frappe.db.after_commit.add(invalidate)
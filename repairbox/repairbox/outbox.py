@@ -0,0 +1,331 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Transactional outbox of Repair Order events for external integrations.
+
+Status changes, completions, payments and repair logs are written as
+Repair Event rows in the same transaction as the change itself, one row per
+enabled consumer, so an event exists if and only if the change was
+committed. Nothing is sent from the save path: after commit a deduplicated
+background job drains the pending events of every consumer in batches,
+oldest first, and a cron job picks up retries and anything missed.
+
+Consumers are registered by apps in the `repairbox_event_consumers` hook,
+name -> dotted path of a class whose instances have a `send(event)`
+method, and enabled by name in RepairBox Settings:
+
+	repairbox_event_consumers = {"crm": "my_app.crm.RepairEventConsumer"}
+
+`event` is a dict with the event `id`, its `event` name, `repair_order`,
+`reference_doctype`, `reference_name`, `payload` and `created`. Delivery is
+at least once: an event whose send raised is retried with exponential
+backoff, and the later events of the same Repair Order wait so each
+consumer sees the events of an order in order. Events of other orders are
+not held up. After MAX_ATTEMPTS the event is marked Failed and the next
+event of its order is sent.
+Consumers should ignore an `id` they already processed. Events are ordered
+when written, so an event of a transaction that commits late may follow
+newer ones; order payloads carry `modified` to tell.
+"""
+
+import json
+import os
+
+import frappe
+from frappe.utils import add_to_date, cint, now_datetime
+
+DISPATCH_JOB_ID = "repairbox_event_dispatch"
+
+BATCH_SIZE = 100
+
+# Batches per consumer in one job run, before yielding the worker
+MAX_BATCHES = 20
+
+MAX_ATTEMPTS = 10
+
+# Delay before the first retry, doubled on every further attempt
+RETRY_BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 3600
+
+# Sent events are kept this long for inspection, Failed events long enough
+# to be retried
+SENT_RETENTION_DAYS = 7
+FAILED_RETENTION_DAYS = 30
+
+# Repair Order fields sent with every order event. Contact details are left
+# out: events outlive the PII retention of their order, and consumers can
+# read them from `customer`.
+ORDER_FIELDS = (
+	'customer', 'customer_name', 'tracking_id',
+	'status', 'priority', 'assigned_to', 'branch', 'expected_completion', 'actual_completion',
+	'grand_total', 'paid_amount', 'outstanding_amount', 'payment_status', 'modified'
+)
+
+COMPLETED_STATUS = 'Completed'
+
+
+def get_enabled_consumers():
+	"""Names of the consumers enabled in settings that an installed app registers"""
+	registered = frappe.get_hooks('repairbox_event_consumers') or {}
+	names = (frappe.get_cached_doc('RepairBox Settings').event_consumers or '').split()
+	return [name for name in dict.fromkeys(names) if name in registered]
+
+
+def get_consumer(name):
+	"""New instance of a registered consumer, the last app's registration winning"""
+	return frappe.get_attr(frappe.get_hooks('repairbox_event_consumers')[name][-1])()
+
+
+# Writing events
+
+def publish_order_events(doc):
+	"""Events of a saved Repair Order: creation, status changes and completion"""
+	previous = doc.get_doc_before_save()
+	if (previous and previous.status == doc.status) or not get_enabled_consumers():
+		return
+
+	payload = get_order_payload(doc)
+	if previous:
+		payload['previous_status'] = previous.status
+
+	publish_event('order_created' if not previous else 'status_changed', doc.name, payload)
+	if previous and doc.status == COMPLETED_STATUS:
+		publish_event('order_completed', doc.name, payload)
+
+
+def publish_status_events(repair_order, status, previous_status):
+	"""Events of a status change written directly to the database"""
+	if status == previous_status or not get_enabled_consumers():
+		return
+
+	payload = get_order_payload(frappe.db.get_value('Repair Order', repair_order, ORDER_FIELDS, as_dict=True))
+	payload['previous_status'] = previous_status
+
+	publish_event('status_changed', repair_order, payload)
+	if status == COMPLETED_STATUS:
+		publish_event('order_completed', repair_order, payload)
+
+
+def publish_log_event(log):
+	"""Event of a new Repair Log, with whether the customer should hear about it"""
+	publish_event('log_added', log.repair_order, {
+		'status': log.status,
+		'previous_status': log.previous_status,
+		'notes': log.notes,
+		'is_public': cint(log.is_public),
+		'notify_customer': cint(log.notify_customer),
+		'updated_by': log.updated_by,
+		'log_date': log.log_date
+	}, reference=log)
+
+
+def publish_payment_event(payment, event):
+	"""Event of a submitted or cancelled Repair Payment, with the resulting balance of the order"""
+	if not get_enabled_consumers():
+		return
+
+	payload = get_order_payload(
+		frappe.db.get_value('Repair Order', payment.repair_order, ORDER_FIELDS, as_dict=True)
+	)
+	payload.update({
+		'amount': payment.amount,
+		'mode_of_payment': payment.mode_of_payment,
+		'reference': payment.reference,
+		'payment_date': payment.payment_date
+	})
+	publish_event(event, payment.repair_order, payload, reference=payment)
+
+
+def get_order_payload(order):
+	return {field: order.get(field) for field in ORDER_FIELDS} if order else {}
+
+
+def publish_event(event, repair_order, payload, reference=None):
+	"""Write an event for every enabled consumer in the current transaction"""
+	consumers = get_enabled_consumers()
+	if not consumers:
+		return
+
+	now = now_datetime()
+	user = frappe.session.user
+	payload = frappe.as_json(payload, indent=None)
+	reference_doctype, reference_name = (reference.doctype, reference.name) if reference else (None, None)
+
+	frappe.db.bulk_insert(
+		'Repair Event',
+		fields=[
+			'event', 'repair_order', 'reference_doctype', 'reference_name', 'payload',
+			'consumer', 'status', 'attempts', 'creation', 'modified', 'owner', 'modified_by'
+		],
+		values=[
+			(event, repair_order, reference_doctype, reference_name, payload,
+				consumer, 'Pending', 0, now, now, user, user)
+			for consumer in consumers
+		]
+	)
+
+	if not frappe.flags.get('repairbox_events_published'):
+		frappe.flags.repairbox_events_published = True
+		frappe.db.after_commit.add(enqueue_dispatch)
+		frappe.db.after_rollback.add(discard_published_flag)
+
+
+def discard_published_flag():
+	frappe.flags.pop('repairbox_events_published', None)
+
+
+# Dispatching events
+
+def enqueue_dispatch():
+	"""Start the dispatcher unless it is already queued; also run by the scheduler for retries"""
+	discard_published_flag()
+	frappe.enqueue(
+		'repairbox.repairbox.outbox.dispatch_events',
+		queue='default',
+		job_id=DISPATCH_JOB_ID,
+		deduplicate=True
+	)
+
+
+def dispatch_events():
+	"""Drain the pending events of every enabled consumer, committing after each batch"""
+	for name in get_enabled_consumers():
+		consumer = get_consumer(name)
+		for _batch in range(MAX_BATCHES):
+			more = dispatch_batch(name, consumer)
+			frappe.db.commit()
+			if not more:
+				break
+
+
+def dispatch_batch(name, consumer):
+	"""
+	Send the next batch of pending events of consumer `name`, oldest first.
+
+	Orders with an event waiting for its retry are left out, and an order
+	whose event fails during the batch is skipped for the rest of it, so
+	later events of an order are never delivered before an earlier one.
+	Returns whether more events may be waiting.
+	"""
+	now = now_datetime()
+	events = frappe.db.sql("""
+		SELECT name, event, repair_order, reference_doctype, reference_name,
+			payload, attempts, next_attempt_on, creation
+		FROM `tabRepair Event`
+		WHERE consumer = %(consumer)s AND status = 'Pending'
+		AND (repair_order IS NULL OR repair_order NOT IN (
+			SELECT repair_order FROM `tabRepair Event`
+			WHERE consumer = %(consumer)s AND status = 'Pending'
+			AND next_attempt_on > %(now)s AND repair_order IS NOT NULL
+		))
+		ORDER BY name
+		LIMIT %(limit)s
+	""", {'consumer': name, 'now': now, 'limit': BATCH_SIZE}, as_dict=True)
+
+	sent = []
+	blocked_orders = set()
+	for event in events:
+		if event.repair_order in blocked_orders:
+			continue
+
+		try:
+			consumer.send(get_message(event))
+		except Exception:
+			if record_failure(name, event, now):
+				blocked_orders.add(event.repair_order)
+			continue
+
+		sent.append(event.name)
+
+	if sent:
+		frappe.db.sql("""
+			UPDATE `tabRepair Event`
+			SET status = 'Sent', sent_on = %(now)s, modified = %(now)s
+			WHERE name IN %(names)s
+		""", {'now': now, 'names': tuple(sent)})
+
+	return len(events) == BATCH_SIZE
+
+
+def get_message(event):
+	return {
+		'id': event.name,
+		'event': event.event,
+		'repair_order': event.repair_order,
+		'reference_doctype': event.reference_doctype,
+		'reference_name': event.reference_name,
+		'payload': json.loads(event.payload or '{}'),
+		'created': str(event.creation)
+	}
+
+
+def record_failure(name, event, now):
+	"""Schedule the retry of a failed send; returns False once the event is given up"""
+	error = frappe.get_traceback()
+	attempts = cint(event.attempts) + 1
+	retry = attempts < MAX_ATTEMPTS
+
+	frappe.db.sql("""
+		UPDATE `tabRepair Event`
+		SET attempts = %(attempts)s, status = %(status)s, next_attempt_on = %(next_attempt_on)s,
+			last_error = %(error)s, modified = %(now)s
+		WHERE name = %(name)s
+	""", {
+		'name': event.name,
+		'attempts': attempts,
+		'status': 'Pending' if retry else 'Failed',
+		'next_attempt_on': add_to_date(now, seconds=get_backoff_seconds(attempts)) if retry else None,
+		'error': error.strip().splitlines()[-1],
+		'now': now
+	})
+
+	if not retry:
+		frappe.log_error(title=f'Repair Event {event.name} not delivered to {name}', message=error)
+
+	return retry
+
+
+def get_backoff_seconds(attempts):
+	return min(RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+
+
+@frappe.whitelist(methods=['POST'])
+def retry_failed_events(consumer=None):
+	"""Queue the Failed events, of one consumer or all, for delivery again"""
+	frappe.only_for('System Manager')
+
+	filters = {'status': 'Failed'}
+	if consumer:
+		filters['consumer'] = consumer
+
+	frappe.db.set_value('Repair Event', filters, {'status': 'Pending', 'attempts': 0, 'next_attempt_on': None})
+	frappe.db.after_commit.add(enqueue_dispatch)
+
+
+def purge_old_events():
+	"""Delete Sent events older than SENT_RETENTION_DAYS and Failed ones older than FAILED_RETENTION_DAYS"""
+	now = now_datetime()
+	for status, days in (('Sent', SENT_RETENTION_DAYS), ('Failed', FAILED_RETENTION_DAYS)):
+		frappe.db.sql("""
+			DELETE FROM `tabRepair Event`
+			WHERE status = %s AND creation < %s
+		""", (status, add_to_date(now, days=-days)))
+
+
+# Consumers
+
+class FileConsumer:
+	"""
+	Appends every event as a line of JSON to a file, for testing
+	integrations: `repairbox_event_file` in site config, or
+	logs/repairbox_events.jsonl in the site folder.
+	"""
+
+	def __init__(self):
+		self.path = frappe.conf.get('repairbox_event_file') or frappe.get_site_path('logs', 'repairbox_events.jsonl')
+
+	def send(self, event):
+		os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+		with open(self.path, 'a') as f:
+			f.write(json.dumps(event, default=str) + '\n')
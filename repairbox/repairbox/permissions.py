@@ -0,0 +1,123 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Permission hooks of Repair Orders and their records.
+
+Two restrictions are combined, both as plain predicates the indexes can
+match:
+
+- users with User Permissions on Branch only see their branches (see `branch`)
+- technicians only see the orders assigned to them, `assigned_to = <user>`,
+  and the Repair Logs and status intervals of those orders; technicians who
+  also hold a manager role see everything
+
+Whether a user is a restricted technician is decided once per request from
+the roles Frappe caches per user, so list views, counts and the checks of
+single documents do not query roles again.
+"""
+
+import frappe
+
+from repairbox.repairbox.branch import (
+	add_branch_filter,
+	get_branch_condition,
+	get_branch_scope,
+	has_branch_permission
+)
+from repairbox.repairbox.doctype.technician_workload.technician_workload import TECHNICIAN_ROLE
+
+# Technicians holding one of these roles are not restricted to their orders
+MANAGER_ROLES = ('System Manager',)
+
+
+def is_restricted_technician(user=None):
+	"""Whether `user` only sees the orders assigned to them, resolved once per request"""
+	user = user or frappe.session.user
+	technicians = frappe.flags.setdefault('repairbox_restricted_technicians', {})
+
+	if user not in technicians:
+		roles = set(frappe.get_roles(user))
+		technicians[user] = TECHNICIAN_ROLE in roles and not roles.intersection(MANAGER_ROLES)
+
+	return technicians[user]
+
+
+def get_repair_order_conditions(user=None, alias=None):
+	"""SQL restricting Repair Orders to the ones `user` may see, or '' without restriction"""
+	user = user or frappe.session.user
+	table = alias or '`tabRepair Order`'
+
+	conditions = [get_branch_condition('Repair Order', user, alias=table)]
+	if is_restricted_technician(user):
+		conditions.append(f'{table}.assigned_to = {frappe.db.escape(user)}')
+
+	return ' AND '.join(condition for condition in conditions if condition)
+
+
+def get_order_record_conditions(doctype, user=None):
+	"""SQL restricting records of Repair Orders (logs, status intervals) to the orders `user` may see"""
+	user = user or frappe.session.user
+
+	conditions = [get_branch_condition(doctype, user)]
+	if is_restricted_technician(user):
+		# Resolved from the (assigned_to, modified) index of Repair Order
+		conditions.append(
+			'`tab{0}`.repair_order IN (SELECT name FROM `tabRepair Order` WHERE assigned_to = {1})'.format(
+				doctype, frappe.db.escape(user)
+			)
+		)
+
+	return ' AND '.join(condition for condition in conditions if condition)
+
+
+def add_permission_filters(filters, user=None):
+	"""Add the restrictions of `user` to `frappe.get_all` filters of Repair Order"""
+	user = user or frappe.session.user
+	add_branch_filter(filters, user)
+
+	if is_restricted_technician(user):
+		filters['assigned_to'] = user
+
+	return filters
+
+
+def get_permission_scope(user=None):
+	"""Cache namespace of the Repair Orders `user` sees"""
+	user = user or frappe.session.user
+	scope = get_branch_scope(user)
+	return f'{scope}:{user}' if is_restricted_technician(user) else scope
+
+
+# Hooks
+
+def repair_order_query(user=None):
+	return get_repair_order_conditions(user)
+
+
+def repair_log_query(user=None):
+	return get_order_record_conditions('Repair Log', user)
+
+
+def repair_payment_query(user=None):
+	return get_branch_condition('Repair Payment', user or frappe.session.user)
+
+
+def repair_status_interval_query(user=None):
+	return get_order_record_conditions('Repair Status Interval', user)
+
+
+def has_permission(doc, ptype=None, user=None):
+	"""Check one record against the branch and technician restrictions"""
+	user = user or frappe.session.user
+	if not has_branch_permission(doc, ptype, user):
+		return False
+
+	if doc.doctype not in ('Repair Order', 'Repair Log', 'Repair Status Interval') or not is_restricted_technician(user):
+		return True
+
+	if doc.doctype == 'Repair Order':
+		# Technicians take in orders that may be auto-assigned to someone else
+		return ptype == 'create' or doc.get('assigned_to') == user
+
+	return bool(doc.repair_order) and frappe.db.get_value('Repair Order', doc.repair_order, 'assigned_to') == user
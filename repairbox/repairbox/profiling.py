@@ -0,0 +1,174 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Opt-in profiling of RepairBox hot paths.
+
+Functions decorated with `profiled` record their wall time, query count and
+rows returned (not rows read by the database) into a Redis ring buffer when "Enable Profiling" is checked in
+RepairBox Settings. A scheduled job flushes the buffer every few minutes into
+RepairBox Profile Summary records with per-target percentiles.
+
+When profiling is disabled the decorator costs one attribute lookup per call.
+"""
+
+import json
+import math
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import frappe
+from frappe.utils import cint, flt, now_datetime
+
+# Redis list used as ring buffer, newest samples first
+SAMPLES_CACHE_KEY = "repairbox_profile_samples"
+RING_BUFFER_SIZE = 20000
+
+
+def profiled(target):
+	"""Decorator recording timings of `target` when profiling is enabled"""
+	def decorator(fn):
+		@wraps(fn)
+		def wrapper(*args, **kwargs):
+			if not is_profiling_enabled():
+				return fn(*args, **kwargs)
+
+			with profile(target):
+				return fn(*args, **kwargs)
+
+		return wrapper
+
+	return decorator
+
+
+def is_profiling_enabled():
+	"""Check the profiling switch, read once per request"""
+	enabled = getattr(frappe.local, 'repairbox_profiling_enabled', None)
+	if enabled is None:
+		enabled = bool(cint(frappe.get_cached_doc('RepairBox Settings').enable_profiling))
+		frappe.local.repairbox_profiling_enabled = enabled
+
+	return enabled
+
+
+@contextmanager
+def profile(target):
+	"""Measure wall time, queries and rows returned of the enclosed block and buffer the sample"""
+	counter = None
+	try:
+		with measure() as counter:
+			yield counter
+	finally:
+		if counter is not None:
+			frappe.cache().lpush(SAMPLES_CACHE_KEY, json.dumps([
+				target, round(counter.elapsed_ms, 3), counter.queries, counter.rows
+			]))
+			frappe.cache().ltrim(SAMPLES_CACHE_KEY, 0, RING_BUFFER_SIZE - 1)
+
+
+@contextmanager
+def measure():
+	"""
+	Measure wall time, queries and rows returned of the enclosed block without
+	recording it. The query counter is installed by the outermost measurement
+	and removed again when it ends.
+	"""
+	active_profiles = get_active_profiles()
+	restore = None if active_profiles else install_query_counter()
+	counter = frappe._dict(queries=0, rows=0, elapsed_ms=0)
+	active_profiles.append(counter)
+	start = time.perf_counter()
+
+	try:
+		yield counter
+	finally:
+		counter.elapsed_ms = (time.perf_counter() - start) * 1000
+		active_profiles.remove(counter)
+		if restore:
+			restore()
+
+
+def get_active_profiles():
+	"""Profiles currently measuring, innermost last"""
+	if not hasattr(frappe.local, 'repairbox_active_profiles'):
+		frappe.local.repairbox_active_profiles = []
+
+	return frappe.local.repairbox_active_profiles
+
+
+def install_query_counter():
+	"""
+	Wrap `frappe.db.sql` of the current connection to count queries and rows
+	returned for active profiles. Returns a function that removes the wrapper.
+	"""
+	db = frappe.db
+	own_sql = db.__dict__.get('sql')
+	sql = db.sql
+
+	def counted_sql(*args, **kwargs):
+		result = sql(*args, **kwargs)
+
+		profiles = getattr(frappe.local, 'repairbox_active_profiles', None)
+		if profiles:
+			rows = len(result) if isinstance(result, (list, tuple)) else 0
+			for active in profiles:
+				active.queries += 1
+				active.rows += rows
+
+		return result
+
+	def restore():
+		if own_sql is not None:
+			db.sql = own_sql
+		else:
+			db.__dict__.pop('sql', None)
+
+	db.sql = counted_sql
+	return restore
+
+
+def flush_profile_samples():
+	"""Aggregate buffered samples into RepairBox Profile Summary records (scheduled)"""
+	cache = frappe.cache()
+	samples = cache.lrange(SAMPLES_CACHE_KEY, 0, -1)
+	if not samples:
+		return
+
+	# New samples are pushed to the head; drop only the ones read above
+	cache.ltrim(SAMPLES_CACHE_KEY, 0, -(len(samples) + 1))
+
+	by_target = {}
+	for sample in samples:
+		target, elapsed_ms, queries, rows = json.loads(sample)
+		by_target.setdefault(target, []).append((elapsed_ms, queries, rows))
+
+	period_end = now_datetime()
+	last_flush = cache.get_value('repairbox_profile_last_flush')
+	cache.set_value('repairbox_profile_last_flush', str(period_end))
+
+	for target, target_samples in by_target.items():
+		timings = sorted(sample[0] for sample in target_samples)
+		queries = [sample[1] for sample in target_samples]
+		rows = [sample[2] for sample in target_samples]
+
+		frappe.get_doc({
+			'doctype': 'RepairBox Profile Summary',
+			'target': target,
+			'period_start': last_flush,
+			'period_end': period_end,
+			'calls': len(timings),
+			'p50_ms': percentile(timings, 50),
+			'p95_ms': percentile(timings, 95),
+			'p99_ms': percentile(timings, 99),
+			'max_ms': timings[-1],
+			'avg_queries': flt(sum(queries) / len(queries), 2),
+			'max_queries': max(queries),
+			'avg_rows': flt(sum(rows) / len(rows), 2)
+		}).insert(ignore_permissions=True)
+
+
+def percentile(sorted_values, pct):
+	"""Nearest-rank percentile of an already sorted list"""
+	index = math.ceil(pct / 100 * len(sorted_values)) - 1
+	return sorted_values[max(0, min(index, len(sorted_values) - 1))]
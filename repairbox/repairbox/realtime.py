@@ -0,0 +1,202 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Realtime push of Repair Order changes.
+
+Status, assignment and priority changes are published as the
+`repairbox_order_update` event so technician screens and counter displays
+can update incrementally instead of polling. Each message carries compact
+diffs of the changed orders:
+
+	{"orders": [{"n": "RO-2026-00042", "s": "Testing", "m": "2026-10-19 10:12:03.120000"}]}
+
+where `n` is the order name, `m` its `modified` value and `s`, `a`, `p` the
+new status, assigned technician and priority (only the keys that changed).
+
+Diffs go to the room of the order's branch, joined by the users of that
+branch, to the room of users who see all branches, and to the user rooms of
+the technicians involved. Restricted technicians join no branch room (see
+`get_realtime_rooms` and realtime/handlers.js), so they only hear about
+their own orders.
+
+Changes are appended to a Redis list after commit. The first change after a
+publish records its time and schedules one short background job, which
+waits until the coalescing window (RepairBox Settings) has passed since that
+change. Every change committed until then is merged into its message, so a
+burst of saves on the same order becomes a single event. The job clears the
+schedule and takes the list in one transaction, so a change committed
+meanwhile schedules the next job instead of being lost.
+"""
+
+import json
+import time
+
+import frappe
+from frappe.utils import flt
+
+from repairbox.repairbox.branch import ALL_BRANCHES, get_user_branches
+from repairbox.repairbox.permissions import is_restricted_technician
+
+EVENT = "repairbox_order_update"
+
+# Fields pushed to clients and their short keys
+TRACKED_FIELDS = {
+	'status': 's',
+	'assigned_to': 'a',
+	'priority': 'p'
+}
+
+# Redis list of committed entries waiting for the next publish
+PENDING_CACHE_KEY = "repairbox_realtime_pending"
+
+# Time of the first change waiting for the queued publish job
+SCHEDULED_CACHE_KEY = "repairbox_realtime_scheduled"
+
+# A lost job only delays updates until the flag expires
+SCHEDULED_TTL_SECONDS = 60
+
+DEFAULT_COALESCE_SECONDS = 2
+
+# The publish job holds a short queue worker for the rest of the window
+MAX_COALESCE_SECONDS = 10
+
+BRANCH_ROOM_PREFIX = "repairbox_branch:"
+
+
+def get_branch_room(branch=None):
+	"""Room of the Repair Orders of a branch, or of all branches"""
+	return f'{BRANCH_ROOM_PREFIX}{branch or ALL_BRANCHES}'
+
+
+@frappe.whitelist()
+def get_realtime_rooms():
+	"""Branch rooms the session user may join; called by the socket.io handler"""
+	if frappe.session.user == 'Guest' or is_restricted_technician():
+		return []
+
+	branches = get_user_branches()
+	return [get_branch_room(branch) for branch in branches] if branches else [get_branch_room()]
+
+
+def get_coalesce_seconds():
+	"""Window over which changes are merged into one event"""
+	value = frappe.get_cached_doc('RepairBox Settings').realtime_coalesce_seconds
+	seconds = DEFAULT_COALESCE_SECONDS if value is None else flt(value)
+	return min(max(seconds, 0), MAX_COALESCE_SECONDS)
+
+
+def queue_order_update(doc):
+	"""Queue the tracked changes of a saved Repair Order for publishing"""
+	previous = doc.get_doc_before_save()
+	diff = {
+		key: doc.get(fieldname)
+		for fieldname, key in TRACKED_FIELDS.items()
+		if not previous or previous.get(fieldname) != doc.get(fieldname)
+	}
+	if not diff:
+		return
+
+	users = {doc.assigned_to, previous.assigned_to if previous else None}
+	branches = {doc.branch, previous.branch if previous else None}
+	queue_diff(doc.name, diff, doc.modified, users, branches)
+
+
+def queue_status_update(repair_order, status):
+	"""Queue a status change written directly to the database"""
+	assigned_to, branch, modified = frappe.db.get_value(
+		'Repair Order', repair_order, ['assigned_to', 'branch', 'modified']
+	) or (None, None, None)
+	queue_diff(repair_order, {'s': status}, modified, {assigned_to}, {branch})
+
+
+def queue_diff(repair_order, diff, modified, users, branches):
+	"""Buffer a diff for the current transaction and hand it over after commit"""
+	buffer = frappe.flags.setdefault('repairbox_realtime_buffer', {})
+
+	if not buffer:
+		frappe.db.after_commit.add(flush_transaction_buffer)
+		frappe.db.after_rollback.add(discard_transaction_buffer)
+
+	entry = buffer.setdefault(repair_order, {'diff': {}, 'users': set(), 'branches': set()})
+	entry['diff'].update(diff)
+	entry['diff']['n'] = repair_order
+	entry['diff']['m'] = str(modified)
+	entry['users'].update(user for user in users if user)
+	entry['branches'].update(branch for branch in branches if branch)
+
+
+def flush_transaction_buffer():
+	"""Append the committed diffs of this transaction to the shared list and schedule a publish"""
+	buffer = frappe.flags.pop('repairbox_realtime_buffer', None)
+	if not buffer:
+		return
+
+	cache = frappe.cache()
+	cache.pipeline().rpush(cache.make_key(PENDING_CACHE_KEY), *(
+		json.dumps({'diff': entry['diff'], 'users': sorted(entry['users']), 'branches': sorted(entry['branches'])})
+		for entry in buffer.values()
+	)).execute()
+
+	window = get_coalesce_seconds()
+	if cache.set(
+		cache.make_key(SCHEDULED_CACHE_KEY), time.time(), nx=True, ex=int(window) + SCHEDULED_TTL_SECONDS
+	):
+		frappe.enqueue('repairbox.repairbox.realtime.publish_pending_updates', queue='short', window=window)
+
+
+def discard_transaction_buffer():
+	"""Drop diffs of a rolled back transaction"""
+	frappe.flags.pop('repairbox_realtime_buffer', None)
+
+
+def publish_pending_updates(window=DEFAULT_COALESCE_SECONDS):
+	"""
+	Wait until `window` seconds have passed since the first pending change,
+	then publish everything committed since the last run, merged per order,
+	as one event per room.
+	"""
+	cache = frappe.cache()
+	scheduled_at = cache.get(cache.make_key(SCHEDULED_CACHE_KEY))
+	if scheduled_at:
+		# Time spent in the queue counts towards the window
+		remaining = flt(scheduled_at) + window - time.time()
+		if remaining > 0:
+			time.sleep(min(remaining, MAX_COALESCE_SECONDS))
+
+	pipeline = cache.pipeline()
+	pipeline.delete(cache.make_key(SCHEDULED_CACHE_KEY))
+	pipeline.lrange(cache.make_key(PENDING_CACHE_KEY), 0, -1)
+	pipeline.delete(cache.make_key(PENDING_CACHE_KEY))
+	_, entries, _ = pipeline.execute()
+
+	merged = {}
+	for entry in entries:
+		entry = json.loads(entry)
+		pending = merged.setdefault(entry['diff']['n'], {'diff': {}, 'users': set(), 'branches': set()})
+		pending['diff'].update(entry['diff'])
+		pending['users'].update(entry['users'])
+		pending['branches'].update(entry['branches'])
+
+	if merged:
+		publish(list(merged.values()))
+
+
+def publish(entries):
+	"""Publish diffs to the rooms of their branches and of the technicians involved"""
+	by_room = {}
+	for entry in entries:
+		rooms = {get_branch_room()} | {get_branch_room(branch) for branch in entry['branches']}
+		for room in rooms:
+			by_room.setdefault(room, []).append(entry['diff'])
+
+	for room, diffs in by_room.items():
+		frappe.publish_realtime(EVENT, {'orders': diffs}, room=room)
+
+	by_user = {}
+	for entry in entries:
+		for user in entry['users']:
+			by_user.setdefault(user, []).append(entry['diff'])
+
+	for user, diffs in by_user.items():
+		frappe.publish_realtime(EVENT, {'orders': diffs}, user=user)
@@ -0,0 +1,183 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, flt, getdate, now_datetime
+
+from repairbox.repairbox.export import stream_csv
+from repairbox.repairbox.kanban import KANBAN_LAST_CHANGE_KEY
+from repairbox.repairbox.permissions import get_permission_scope, get_repair_order_conditions
+
+# Results are also keyed by the last Repair Order change, so they expire
+# early only to free memory
+CACHE_KEY_PREFIX = "repairbox_technician_productivity"
+CACHE_SECONDS = 3600
+
+GROUP_BY_FIELDS = {
+	'Technician': ['technician'],
+	'Month': ['month'],
+	'Technician and Month': ['technician', 'month']
+}
+
+VALUE_COLUMNS = [
+	{'fieldname': 'orders', 'label': 'Orders', 'fieldtype': 'Int', 'width': 90},
+	{'fieldname': 'completed_orders', 'label': 'Completed', 'fieldtype': 'Int', 'width': 100},
+	{'fieldname': 'revenue', 'label': 'Revenue', 'fieldtype': 'Currency', 'width': 130},
+	{'fieldname': 'cost', 'label': 'Cost', 'fieldtype': 'Currency', 'width': 130},
+	{'fieldname': 'margin', 'label': 'Margin', 'fieldtype': 'Currency', 'width': 130},
+	{'fieldname': 'margin_percent', 'label': 'Margin %', 'fieldtype': 'Percent', 'width': 100},
+	{'fieldname': 'avg_turnaround_hours', 'label': 'Avg Turnaround (Hours)', 'fieldtype': 'Float', 'width': 170}
+]
+
+
+def execute(filters=None):
+	filters = frappe._dict(filters or {})
+	group_by = get_group_by(filters)
+
+	return get_columns(group_by), get_cached_data(filters, group_by)
+
+
+def get_group_by(filters):
+	return GROUP_BY_FIELDS.get(filters.group_by) or GROUP_BY_FIELDS['Technician and Month']
+
+
+def get_columns(group_by):
+	columns = []
+	if 'technician' in group_by:
+		columns.append({
+			'fieldname': 'technician', 'label': _('Technician'),
+			'fieldtype': 'Link', 'options': 'User', 'width': 200
+		})
+	if 'month' in group_by:
+		columns.append({'fieldname': 'month', 'label': _('Month'), 'fieldtype': 'Data', 'width': 100})
+
+	return columns + [dict(column, label=_(column['label'])) for column in VALUE_COLUMNS]
+
+
+def get_cached_data(filters, group_by):
+	"""Report rows, cached per filter set until the next Repair Order change"""
+	key = get_cache_key(filters, group_by)
+	data = frappe.cache().get_value(key)
+	if data is None:
+		data = [process_row(row) for row in frappe.db.sql(*get_query(filters, group_by), as_dict=True)]
+		frappe.cache().set_value(key, data, expires_in_sec=CACHE_SECONDS)
+
+	return data
+
+
+def get_cache_key(filters, group_by):
+	"""Key of the filter set, namespaced by the orders the user sees"""
+	state = json.dumps({
+		'filters': get_query_values(filters),
+		'group_by': group_by,
+		'scope': get_permission_scope(),
+		'last_change': frappe.cache().get_value(KANBAN_LAST_CHANGE_KEY)
+	}, sort_keys=True, default=str)
+
+	return f'{CACHE_KEY_PREFIX}:{hashlib.sha1(state.encode()).hexdigest()}'
+
+
+def get_query_values(filters):
+	values = {
+		'from_date': getdate(filters.from_date or add_days(now_datetime(), -365)),
+		'to_date': add_days(getdate(filters.to_date or now_datetime()), 1)
+	}
+	if filters.technician:
+		values['technician'] = filters.technician
+	if filters.branch:
+		values['branch'] = filters.branch
+
+	return values
+
+
+def get_query(filters, group_by):
+	"""
+	One grouped query over Repair Order and its defect rows.
+
+	Defect rows are summed per order first, so order counts and turnaround
+	are not multiplied by the number of defects. Users restricted to
+	branches or to their assigned orders only get those orders.
+	"""
+	values = get_query_values(filters)
+
+	conditions = [
+		'ro.booking_date >= %(from_date)s',
+		'ro.booking_date < %(to_date)s',
+		"ro.status != 'Cancelled'"
+	]
+	if values.get('technician'):
+		conditions.append('ro.assigned_to = %(technician)s')
+	if values.get('branch'):
+		conditions.append('ro.branch = %(branch)s')
+
+	permission_conditions = get_repair_order_conditions(alias='ro')
+	if permission_conditions:
+		conditions.append(permission_conditions)
+
+	if frappe.db.db_type == 'postgres':
+		month = "TO_CHAR(ro.booking_date, 'YYYY-MM')"
+		turnaround = "EXTRACT(EPOCH FROM (ro.actual_completion - ro.booking_date)) / 3600"
+	else:
+		values['month_format'] = '%Y-%m'
+		month = "DATE_FORMAT(ro.booking_date, %(month_format)s)"
+		turnaround = "TIMESTAMPDIFF(SECOND, ro.booking_date, ro.actual_completion) / 3600"
+
+	group_fields = {'technician': 'ro.assigned_to', 'month': month}
+	select = ', '.join(f'{group_fields[field]} AS {field}' for field in group_by)
+
+	query = """
+		SELECT {select},
+			COUNT(*) AS orders,
+			SUM(CASE WHEN ro.actual_completion IS NOT NULL THEN 1 ELSE 0 END) AS completed_orders,
+			SUM(COALESCE(defects.revenue, 0)) AS revenue,
+			SUM(COALESCE(defects.cost, 0)) AS cost,
+			AVG(CASE WHEN ro.actual_completion > ro.booking_date THEN {turnaround} END) AS avg_turnaround_hours
+		FROM `tabRepair Order` ro
+		LEFT JOIN (
+			SELECT parent, SUM(selling_price) AS revenue, SUM(cost_amount) AS cost
+			FROM `tabRepair Order Defect`
+			WHERE parenttype = 'Repair Order' AND parentfield = 'defects'
+			GROUP BY parent
+		) defects ON defects.parent = ro.name
+		WHERE {conditions}
+		GROUP BY {group_by}
+		ORDER BY {group_by}
+	""".format(
+		select=select,
+		turnaround=turnaround,
+		conditions=' AND '.join(conditions),
+		group_by=', '.join(group_fields[field] for field in group_by)
+	)
+
+	return query, values
+
+
+def process_row(row):
+	row.revenue = flt(row.revenue, 2)
+	row.cost = flt(row.cost, 2)
+	row.margin = flt(row.revenue - row.cost, 2)
+	row.margin_percent = flt(row.margin * 100 / row.revenue, 2) if row.revenue else 0
+	row.avg_turnaround_hours = flt(row.avg_turnaround_hours, 2)
+	return row
+
+
+@frappe.whitelist()
+def export(filters=None):
+	"""Download the report as CSV, reading the grouped rows with an unbuffered cursor"""
+	frappe.has_permission('Repair Order', 'report', throw=True)
+
+	filters = frappe._dict(frappe.parse_json(filters) or {})
+	group_by = get_group_by(filters)
+	columns = get_columns(group_by)
+
+	def rows():
+		with frappe.db.unbuffered_cursor():
+			for row in frappe.db.sql(*get_query(filters, group_by), as_dict=True, as_iterator=True):
+				row = process_row(row)
+				yield [row.get(column['fieldname']) for column in columns]
+
+	return stream_csv('technician-productivity', [column['label'] for column in columns], rows())
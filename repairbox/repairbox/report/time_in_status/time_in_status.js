@@ -0,0 +1,46 @@
+// Copyright (c) 2026, Me and contributors
+// For license information, please see license.txt
+
+frappe.query_reports['Time in Status'] = {
+    filters: [
+        {
+            fieldname: 'from_date',
+            label: __('From Date'),
+            fieldtype: 'Date',
+            default: frappe.datetime.add_months(frappe.datetime.get_today(), -1),
+            reqd: 1
+        },
+        {
+            fieldname: 'to_date',
+            label: __('To Date'),
+            fieldtype: 'Date',
+            default: frappe.datetime.get_today(),
+            reqd: 1
+        },
+        {
+            fieldname: 'status',
+            label: __('Status'),
+            fieldtype: 'Link',
+            options: 'Repair Status'
+        },
+        {
+            fieldname: 'technician',
+            label: __('Technician'),
+            fieldtype: 'Link',
+            options: 'User'
+        },
+        {
+            fieldname: 'branch',
+            label: __('Branch'),
+            fieldtype: 'Link',
+            options: 'Branch'
+        },
+        {
+            fieldname: 'group_by',
+            label: __('Group By'),
+            fieldtype: 'Select',
+            options: ['Status', 'Technician', 'Status and Technician', 'Branch and Status'],
+            default: 'Status'
+        }
+    ]
+};
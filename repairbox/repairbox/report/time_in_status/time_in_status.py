@@ -0,0 +1,124 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, flt, getdate, now_datetime
+
+from repairbox.repairbox.doctype.repair_status_interval.repair_status_interval import get_hours_expression
+from repairbox.repairbox.permissions import get_order_record_conditions
+
+GROUP_BY_FIELDS = {
+	'Status': ['status'],
+	'Technician': ['technician'],
+	'Status and Technician': ['status', 'technician'],
+	'Branch and Status': ['branch', 'status']
+}
+
+
+def execute(filters=None):
+	filters = frappe._dict(filters or {})
+	group_by = GROUP_BY_FIELDS.get(filters.group_by) or GROUP_BY_FIELDS['Status']
+
+	data = get_data(filters, group_by)
+	return get_columns(group_by), data, None, get_chart(data, group_by)
+
+
+def get_columns(group_by):
+	columns = []
+	if 'branch' in group_by:
+		columns.append({
+			'fieldname': 'branch', 'label': _('Branch'),
+			'fieldtype': 'Link', 'options': 'Branch', 'width': 160
+		})
+	if 'status' in group_by:
+		columns.append({
+			'fieldname': 'status', 'label': _('Status'),
+			'fieldtype': 'Link', 'options': 'Repair Status', 'width': 200
+		})
+	if 'technician' in group_by:
+		columns.append({
+			'fieldname': 'technician', 'label': _('Technician'),
+			'fieldtype': 'Link', 'options': 'User', 'width': 200
+		})
+
+	return columns + [
+		{'fieldname': 'stints', 'label': _('Stints'), 'fieldtype': 'Int', 'width': 90},
+		{'fieldname': 'open_stints', 'label': _('Still Open'), 'fieldtype': 'Int', 'width': 100},
+		{'fieldname': 'avg_hours', 'label': _('Average (Hours)'), 'fieldtype': 'Float', 'width': 130},
+		{'fieldname': 'max_hours', 'label': _('Longest (Hours)'), 'fieldtype': 'Float', 'width': 130},
+		{'fieldname': 'total_hours', 'label': _('Total (Hours)'), 'fieldtype': 'Float', 'width': 130}
+	]
+
+
+def get_data(filters, group_by):
+	"""
+	Aggregate the stints started in the date range in the database.
+
+	Open stints count up to now. The date range is matched on the
+	(status, started_on), (technician, started_on) and (branch, status,
+	started_on) indexes, so only stints in the range are read. Users
+	restricted to branches or to their assigned orders only get the stints
+	of those orders.
+	"""
+	values = {
+		'from_date': getdate(filters.from_date or add_days(now_datetime(), -30)),
+		'to_date': add_days(getdate(filters.to_date or now_datetime()), 1),
+		'now': now_datetime()
+	}
+
+	conditions = ['started_on >= %(from_date)s', 'started_on < %(to_date)s']
+	if filters.status:
+		conditions.append('status = %(status)s')
+		values['status'] = filters.status
+	if filters.technician:
+		conditions.append('technician = %(technician)s')
+		values['technician'] = filters.technician
+	if filters.branch:
+		conditions.append('branch = %(branch)s')
+		values['branch'] = filters.branch
+
+	permission_conditions = get_order_record_conditions('Repair Status Interval')
+	if permission_conditions:
+		conditions.append(permission_conditions)
+
+	duration = 'COALESCE(duration_hours, {open_hours})'.format(
+		open_hours=get_hours_expression('started_on', '%(now)s')
+	)
+	group_fields = ', '.join(group_by)
+
+	data = frappe.db.sql("""
+		SELECT {group_fields},
+			COUNT(*) AS stints,
+			SUM(CASE WHEN ended_on IS NULL THEN 1 ELSE 0 END) AS open_stints,
+			AVG({duration}) AS avg_hours,
+			MAX({duration}) AS max_hours,
+			SUM({duration}) AS total_hours
+		FROM `tabRepair Status Interval`
+		WHERE {conditions}
+		GROUP BY {group_fields}
+		ORDER BY avg_hours DESC
+	""".format(
+		group_fields=group_fields,
+		duration=duration,
+		conditions=' AND '.join(conditions)
+	), values, as_dict=True)
+
+	for row in data:
+		for field in ('avg_hours', 'max_hours', 'total_hours'):
+			row[field] = flt(row[field], 2)
+
+	return data
+
+
+def get_chart(data, group_by):
+	if not data:
+		return None
+
+	return {
+		'data': {
+			'labels': [' / '.join(str(row[field] or _('Unassigned')) for field in group_by) for row in data[:20]],
+			'datasets': [{'name': _('Average (Hours)'), 'values': [row.avg_hours for row in data[:20]]}]
+		},
+		'type': 'bar'
+	}
@@ -0,0 +1,128 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Scrubbing of customer data from old Repair Orders.
+
+Once the retention period set in RepairBox Settings has passed, the contact
+number, email, serial number and device password of delivered and cancelled
+orders are cleared, and the change history that still holds them is
+deleted. Orders are processed in batches with a commit after each batch, so
+no lock is held for long, and the position reached is saved so a run that
+stops early is resumed by the next one.
+"""
+
+import json
+import time
+
+import frappe
+from frappe.utils import add_days, cint, get_datetime, now_datetime
+
+from repairbox.repairbox.doctype.repair_order.repair_order import TIMELINE_CACHE_KEY
+
+# Only orders in these statuses are scrubbed
+RETENTION_STATUSES = ('Delivered', 'Cancelled')
+
+PII_FIELDS = ('contact_number', 'email', 'serial_number', 'device_password')
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Runs stop after this long and continue from the checkpoint on the next run
+MAX_RUN_SECONDS = 20 * 60
+
+
+def purge_expired_pii(batch_size=DEFAULT_BATCH_SIZE, max_seconds=MAX_RUN_SECONDS):
+	"""Scrub orders past the retention period (daily, long queue)"""
+	retention_days = cint(frappe.db.get_single_value('RepairBox Settings', 'pii_retention_days'))
+	if retention_days <= 0:
+		return 0
+
+	cutoff = add_days(now_datetime(), -retention_days)
+	checkpoint = get_checkpoint()
+	started = time.monotonic()
+	purged = 0
+
+	while time.monotonic() - started < max_seconds:
+		batch = get_next_batch(cutoff, checkpoint, batch_size)
+		if batch:
+			scrub_orders([name for name, booking_date in batch])
+			purged += len(batch)
+			checkpoint = batch[-1]
+
+		# A short batch ends the pass, the next run starts from the oldest orders again
+		done = len(batch) < batch_size
+		set_checkpoint(None if done else checkpoint)
+		frappe.db.commit()
+
+		if done:
+			break
+
+	return purged
+
+
+def get_next_batch(cutoff, checkpoint, batch_size):
+	"""Next `(name, booking_date)` to scrub, read from the (pii_purged, booking_date) index"""
+	values = {
+		'cutoff': cutoff,
+		'statuses': RETENTION_STATUSES,
+		'limit': batch_size
+	}
+
+	keyset = ''
+	if checkpoint:
+		keyset = 'AND (booking_date > %(last_date)s OR (booking_date = %(last_date)s AND name > %(last_name)s))'
+		values['last_name'], values['last_date'] = checkpoint
+
+	return frappe.db.sql("""
+		SELECT name, booking_date
+		FROM `tabRepair Order`
+		WHERE pii_purged = 0
+		AND booking_date < %(cutoff)s
+		AND status IN %(statuses)s
+		{keyset}
+		ORDER BY booking_date ASC, name ASC
+		LIMIT %(limit)s
+	""".format(keyset=keyset), values)
+
+
+def scrub_orders(names):
+	"""Clear the personal fields of a batch of orders with one UPDATE per table"""
+	names = tuple(names)
+
+	frappe.db.sql("""
+		UPDATE `tabRepair Order`
+		SET {fields}, pii_purged = 1
+		WHERE name IN %(names)s
+	""".format(fields=', '.join(f'{field} = NULL' for field in PII_FIELDS)), {'names': names})
+
+	# Password fields keep their encrypted value in __Auth
+	frappe.db.sql("""
+		DELETE FROM `__Auth`
+		WHERE doctype = 'Repair Order' AND fieldname = 'device_password' AND name IN %(names)s
+	""", {'names': names})
+
+	# Version diffs still hold the previous values
+	frappe.db.sql("""
+		DELETE FROM `tabVersion`
+		WHERE ref_doctype = 'Repair Order' AND docname IN %(names)s
+	""", {'names': names})
+
+	frappe.cache().hdel(TIMELINE_CACHE_KEY, list(names))
+
+
+def get_checkpoint():
+	"""`(name, booking_date)` of the last order scrubbed by an unfinished run"""
+	value = frappe.db.get_single_value('RepairBox Settings', 'pii_purge_checkpoint')
+	if not value:
+		return None
+
+	name, booking_date = json.loads(value)
+	return name, get_datetime(booking_date)
+
+
+def set_checkpoint(checkpoint):
+	frappe.db.set_single_value(
+		'RepairBox Settings',
+		'pii_purge_checkpoint',
+		json.dumps(checkpoint, default=str) if checkpoint else None
+	)
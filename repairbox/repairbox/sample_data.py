@@ -162,11 +162,16 @@ def create_repair_order(customer):
     
     ro.technician_notes = """DIAGNOSTIC: Screen shattered, back glass cracked, battery 78% health (swollen), water corrosion on port, camera lens scratched. PLAN: Water treatment, battery replacement, screen/back glass/camera lens replacement, full testing."""
     
-    # Payment
-    ro.paid_amount = 400.00
-    ro.payment_status = "Partially Paid"
-    
     ro.insert(ignore_permissions=True)
+
+    # Deposit
+    frappe.get_doc({
+        "doctype": "Repair Payment",
+        "repair_order": ro.name,
+        "amount": 400.00,
+        "remarks": "Deposit"
+    }).insert(ignore_permissions=True).submit()
+    ro.reload()
     frappe.db.commit()
     
     return ro
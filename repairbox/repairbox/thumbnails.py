@@ -0,0 +1,174 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Thumbnail variants of Device images.
+
+When the image of a Device changes, a background job stores two fixed-size
+variants as File attachments of the Device, next to the original:
+
+- `thumbnail`, a JPEG for print formats (PDF rendering has no WebP support)
+- `thumbnail_webp`, a WebP for kanban cards and lists; it is the image field
+  of Device, and Repair Orders keep it in `device_image`, their image field
+
+Existing images are converted by a command running several processes:
+
+	bench --site <site> repairbox-generate-thumbnails --workers 4
+"""
+
+import io
+import multiprocessing
+import os
+
+import frappe
+from frappe.utils import cint
+
+THUMBNAIL_SIZE = (240, 240)
+
+# Device field, file suffix, Pillow format and save options of each variant
+VARIANTS = (
+	('thumbnail', 'thumb.jpg', 'JPEG', {'quality': 85, 'optimize': True}),
+	('thumbnail_webp', 'thumb.webp', 'WEBP', {'quality': 80, 'method': 6})
+)
+
+VARIANT_FIELDS = tuple(variant[0] for variant in VARIANTS)
+
+
+def queue_device_variants(doc):
+	"""Regenerate the variants of a saved Device whose image changed"""
+	if not doc.has_value_changed('image'):
+		return
+
+	# New devices without an image
+	if not (doc.image or doc.thumbnail or doc.thumbnail_webp):
+		return
+
+	frappe.enqueue(
+		'repairbox.repairbox.thumbnails.generate_device_variants',
+		device=doc.name,
+		job_id=f'repairbox_device_thumbnails::{doc.name}',
+		deduplicate=True,
+		enqueue_after_commit=True
+	)
+
+
+def generate_device_variants(device):
+	"""Replace the variant files of one Device with ones made from its current image"""
+	image = frappe.db.get_value('Device', device, 'image')
+	delete_variant_files(device)
+
+	values = dict.fromkeys(VARIANT_FIELDS)
+	original = get_image_file(image) if image else None
+	if original:
+		for fieldname, file_url in make_variants(device, original).items():
+			values[fieldname] = file_url
+
+	frappe.db.set_value('Device', device, values, update_modified=False)
+	update_order_images(device, values['thumbnail_webp'])
+
+
+def update_order_images(device, thumbnail):
+	"""Refresh the `device_image` of the Repair Orders of a device, fetched on save otherwise"""
+	frappe.db.sql("""
+		UPDATE `tabRepair Order`
+		SET device_image = %s
+		WHERE device = %s
+	""", (thumbnail, device))
+
+
+def get_image_file(file_url):
+	"""File document of a local image, or None for external or missing files"""
+	name = frappe.db.get_value('File', {'file_url': file_url, 'is_folder': 0}, 'name')
+	return frappe.get_doc('File', name) if name else None
+
+
+def make_variants(device, original):
+	"""Save every variant of `original` and return their URLs by Device field"""
+	from PIL import Image, ImageOps, UnidentifiedImageError
+
+	try:
+		image = Image.open(io.BytesIO(original.get_content()))
+		# Phone photos are stored sideways with an orientation tag
+		image = ImageOps.exif_transpose(image)
+	except (UnidentifiedImageError, OSError):
+		frappe.log_error(f'Cannot read the image of Device {device}', reference_doctype='Device', reference_name=device)
+		return {}
+
+	thumbnail = ImageOps.fit(image.convert('RGB'), THUMBNAIL_SIZE, Image.LANCZOS)
+	stem = os.path.splitext(original.file_name or device)[0]
+
+	urls = {}
+	for fieldname, suffix, image_format, options in VARIANTS:
+		content = io.BytesIO()
+		thumbnail.save(content, image_format, **options)
+		urls[fieldname] = frappe.get_doc({
+			'doctype': 'File',
+			'file_name': f'{stem}-{suffix}',
+			'content': content.getvalue(),
+			'attached_to_doctype': 'Device',
+			'attached_to_name': device,
+			'attached_to_field': fieldname,
+			'is_private': original.is_private
+		}).save(ignore_permissions=True).file_url
+
+	return urls
+
+
+def delete_variant_files(device):
+	for name in frappe.get_all(
+		'File',
+		filters={
+			'attached_to_doctype': 'Device',
+			'attached_to_name': device,
+			'attached_to_field': ['in', VARIANT_FIELDS]
+		},
+		pluck='name'
+	):
+		frappe.delete_doc('File', name, ignore_permissions=True)
+
+
+def backfill(workers=4, force=False):
+	"""Generate the variants of all Devices with an image, in `workers` processes"""
+	filters = {'image': ['is', 'set']}
+	if not cint(force):
+		filters['thumbnail_webp'] = ['is', 'not set']
+
+	devices = frappe.get_all('Device', filters=filters, pluck='name', order_by='name asc')
+	if not devices:
+		print("No Device images to convert")
+		return
+
+	workers = max(min(cint(workers), len(devices)), 1)
+	batches = [devices[idx::workers] for idx in range(workers)]
+
+	ctx = multiprocessing.get_context('spawn')
+	with ctx.Pool(workers) as pool:
+		failed = pool.starmap(backfill_worker, [
+			(frappe.local.site, frappe.local.sites_path, batch) for batch in batches
+		])
+
+	failed = [device for batch in failed for device in batch]
+	print(f"Converted {len(devices) - len(failed)} Device images, {len(failed)} failed")
+	for device in failed:
+		print(f"  {device}")
+
+
+def backfill_worker(site, sites_path, devices):
+	"""Convert the images of `devices` in a separate process and return the ones that failed"""
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	frappe.set_user('Administrator')
+
+	failed = []
+	try:
+		for device in devices:
+			try:
+				generate_device_variants(device)
+				frappe.db.commit()
+			except Exception:
+				frappe.db.rollback()
+				failed.append(device)
+	finally:
+		frappe.destroy()
+
+	return failed
@@ -0,0 +1,72 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.repairbox.branch import (
+	get_branch_condition,
+	get_branch_scope,
+	get_user_branches,
+	has_branch_permission
+)
+from repairbox.tests.utils import make_repair_order, make_test_records
+
+TEST_BRANCHES = ('_Test RepairBox Branch 1', '_Test RepairBox Branch 2')
+TEST_USER = 'test@example.com'
+
+
+class TestBranch(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+		for branch in TEST_BRANCHES:
+			if not frappe.db.exists('Branch', branch):
+				frappe.get_doc({'doctype': 'Branch', 'branch': branch}).insert()
+
+	def setUp(self):
+		self.permission = frappe.get_doc({
+			'doctype': 'User Permission',
+			'user': TEST_USER,
+			'allow': 'Branch',
+			'for_value': TEST_BRANCHES[0]
+		}).insert(ignore_permissions=True)
+
+	def tearDown(self):
+		# Also drops the cached branches of the user
+		self.permission.delete(ignore_permissions=True)
+
+	def test_branch_condition(self):
+		self.assertEqual(
+			get_branch_condition('Repair Order', TEST_USER),
+			f"`tabRepair Order`.branch IN ('{TEST_BRANCHES[0]}')"
+		)
+		self.assertEqual(get_branch_condition('Repair Order', 'Administrator'), '')
+		self.assertEqual(get_branch_scope(TEST_USER), TEST_BRANCHES[0])
+
+	def test_deleted_permission_drops_branch(self):
+		self.assertEqual(get_user_branches(TEST_USER), [TEST_BRANCHES[0]])
+		self.permission.delete(ignore_permissions=True)
+		self.assertEqual(get_user_branches(TEST_USER), [])
+
+		# Deleted again by tearDown
+		self.setUp()
+
+	def test_has_permission(self):
+		own = make_repair_order(branch=TEST_BRANCHES[0]).insert()
+		other = make_repair_order(branch=TEST_BRANCHES[1]).insert()
+
+		self.assertTrue(has_branch_permission(own, 'read', TEST_USER))
+		self.assertFalse(has_branch_permission(other, 'read', TEST_USER))
+		self.assertTrue(has_branch_permission(other, 'read', 'Administrator'))
+
+	def test_records_follow_order_branch(self):
+		doc = make_repair_order(branch=TEST_BRANCHES[0]).insert()
+		doc.branch = TEST_BRANCHES[1]
+		doc.save()
+
+		self.assertEqual(
+			set(frappe.get_all('Repair Status Interval', filters={'repair_order': doc.name}, pluck='branch')),
+			{TEST_BRANCHES[1]}
+		)
@@ -0,0 +1,40 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import io
+import json
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.repairbox.export import ORDER_FIELDS, export_repair_orders, flatten_order
+from repairbox.tests.utils import make_repair_order, make_test_records
+
+
+class TestExport(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+
+	def test_jsonl_includes_child_rows(self):
+		doc = make_repair_order(defects=2).insert()
+
+		output = io.BytesIO()
+		export_repair_orders(output, 'jsonl', from_date=doc.booking_date, to_date=doc.booking_date, chunk_size=2)
+
+		records = [json.loads(line) for line in output.getvalue().splitlines()]
+		record = next(record for record in records if record['name'] == doc.name)
+		self.assertEqual(len(record['defects']), 2)
+
+	def test_flatten_order(self):
+		order = frappe._dict(
+			name='RO-1', defects=[{'defect': 'Screen'}, {'defect': 'Battery'}], inspection=[]
+		)
+
+		lines = list(flatten_order(order))
+		self.assertEqual(len(lines), 2)
+		self.assertEqual(lines[0][0], 'RO-1')
+		# Further child rows leave the order columns empty
+		self.assertIsNone(lines[1][0])
+		self.assertEqual(lines[1][len(ORDER_FIELDS)], 'Battery')
@@ -0,0 +1,19 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import json
+
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.repairbox.inspection_storage import pack_inspection, unpack_inspection
+
+ROWS = [
+	{'item_name': 'Screen', 'category': 'Display', 'is_mandatory': 1, 'status': 'Pass', 'is_defective': 0, 'notes': ''},
+	{'item_name': 'Housing', 'category': 'Body', 'is_mandatory': 0, 'status': 'Fail', 'is_defective': 1, 'notes': 'Cracked corner'}
+]
+
+
+class TestInspectionStorage(FrappeTestCase):
+	def test_rows_keep_their_items(self):
+		payload = json.dumps(pack_inspection(ROWS))
+		self.assertEqual(unpack_inspection(payload), ROWS)
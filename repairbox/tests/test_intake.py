@@ -0,0 +1,48 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.repairbox.intake import sync_intakes
+from repairbox.tests.utils import TEST_DEVICE, get_test_defect, make_test_records
+
+
+class TestIntake(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+
+	def test_replayed_batch_creates_no_duplicates(self):
+		key = frappe.generate_hash(length=16)
+		batch = [
+			make_intake(key),
+			# Same customer by phone number, in the same batch
+			make_intake(f'{key}-2'),
+			# Unknown device, fails without undoing the others
+			make_intake(f'{key}-3', device='_Test RepairBox Missing Device')
+		]
+
+		results = sync_intakes(batch)
+		self.assertEqual([result['status'] for result in results], ['Created', 'Created', 'Failed'])
+		self.assertEqual(results[0]['customer'], results[1]['customer'])
+		self.assertTrue(results[2]['error'])
+
+		replayed = sync_intakes(batch[:2])
+		self.assertEqual([result['status'] for result in replayed], ['Exists', 'Exists'])
+		self.assertEqual(replayed[0]['name'], results[0]['name'])
+		self.assertEqual(frappe.db.count('Repair Order', {'intake_key': ['like', f'{key}%']}), 2)
+
+
+def make_intake(intake_key, **kwargs):
+	intake = {
+		'intake_key': intake_key,
+		'customer_name': 'Offline Counter Customer',
+		'contact_number': '+216 20 987 654',
+		'device': TEST_DEVICE,
+		'defects': [{'defect': get_test_defect(1)}],
+		'device_inspection': [{'item_name': 'Screen', 'category': 'Display', 'status': 'Pass'}]
+	}
+	intake.update(kwargs)
+	return intake
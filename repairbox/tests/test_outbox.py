@@ -0,0 +1,112 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from repairbox.repairbox.outbox import (
+	FAILED_RETENTION_DAYS,
+	dispatch_batch,
+	publish_event,
+	purge_old_events
+)
+from repairbox.tests.utils import make_repair_order, make_test_records, set_event_consumers
+
+
+class FlakyConsumer:
+	def __init__(self, failing_order=None):
+		self.failing_order = failing_order
+		self.events = []
+
+	def send(self, event):
+		if event['repair_order'] == self.failing_order:
+			raise ConnectionError('gateway down')
+		self.events.append(event)
+
+
+class TestOutbox(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+
+	def setUp(self):
+		set_event_consumers('file')
+		frappe.db.delete('Repair Event', {'consumer': 'file'})
+
+	def tearDown(self):
+		set_event_consumers('')
+
+	def get_events(self, repair_order):
+		return frappe.get_all(
+			'Repair Event',
+			filters={'repair_order': repair_order, 'consumer': 'file'},
+			fields=['name', 'event', 'status', 'attempts', 'last_error'],
+			order_by='name asc'
+		)
+
+	def test_events_written_with_order(self):
+		doc = make_repair_order().insert()
+		doc.status = 'In Progress'
+		doc.save()
+
+		self.assertEqual(
+			[event.event for event in self.get_events(doc.name)],
+			['order_created', 'status_changed']
+		)
+
+	def test_retry_keeps_order(self):
+		doc = make_repair_order().insert()
+		doc.status = 'In Progress'
+		doc.save()
+		other = make_repair_order().insert()
+
+		# Only the events of the failing order wait
+		consumer = FlakyConsumer(failing_order=doc.name)
+		dispatch_batch('file', consumer)
+		first, second = self.get_events(doc.name)
+		self.assertEqual((first.status, first.attempts), ('Pending', 1))
+		self.assertIn('gateway down', first.last_error)
+		self.assertEqual(second.attempts, 0)
+		self.assertEqual([event['repair_order'] for event in consumer.events], [other.name])
+
+		# Nothing of the order is sent before the retry of its first event is due
+		consumer = FlakyConsumer()
+		dispatch_batch('file', consumer)
+		self.assertEqual(consumer.events, [])
+
+		frappe.db.set_value('Repair Event', first.name, 'next_attempt_on', None)
+		dispatch_batch('file', consumer)
+		self.assertEqual([event['id'] for event in consumer.events], [first.name, second.name])
+		self.assertEqual({event.status for event in self.get_events(doc.name)}, {'Sent'})
+
+	def test_events_without_order_are_sent(self):
+		publish_event('test_event', None, {})
+
+		consumer = FlakyConsumer()
+		dispatch_batch('file', consumer)
+		self.assertEqual([event['event'] for event in consumer.events], ['test_event'])
+
+	def test_payload_leaves_out_contact_details(self):
+		doc = make_repair_order(contact_number='+216 20 123 456').insert()
+
+		payload = frappe.parse_json(frappe.db.get_value('Repair Event', {'repair_order': doc.name}, 'payload'))
+		self.assertEqual(payload.customer, doc.customer)
+		self.assertNotIn('contact_number', payload)
+		self.assertNotIn('email', payload)
+
+	def test_purge_old_events(self):
+		doc = make_repair_order().insert()
+		event = self.get_events(doc.name)[0].name
+
+		frappe.db.set_value('Repair Event', event, {
+			'status': 'Failed',
+			'creation': add_days(now_datetime(), 1 - FAILED_RETENTION_DAYS)
+		}, update_modified=False)
+		purge_old_events()
+		self.assertTrue(frappe.db.exists('Repair Event', event))
+
+		frappe.db.set_value('Repair Event', event, 'creation', add_days(now_datetime(), -FAILED_RETENTION_DAYS - 1))
+		purge_old_events()
+		self.assertFalse(frappe.db.exists('Repair Event', event))
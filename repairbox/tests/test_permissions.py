@@ -0,0 +1,57 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from repairbox.repairbox.permissions import (
+	get_repair_order_conditions,
+	has_permission,
+	repair_log_query,
+	repair_status_interval_query
+)
+from repairbox.tests.utils import make_repair_order, make_test_records
+
+TEST_TECHNICIAN = 'repairbox-technician@example.com'
+
+
+class TestPermissions(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+		if not frappe.db.exists('User', TEST_TECHNICIAN):
+			frappe.get_doc({
+				'doctype': 'User',
+				'email': TEST_TECHNICIAN,
+				'first_name': 'RepairBox Technician',
+				'send_welcome_email': 0,
+				'roles': [{'role': 'Technician'}]
+			}).insert(ignore_permissions=True)
+
+	def setUp(self):
+		frappe.flags.pop('repairbox_restricted_technicians', None)
+
+	def test_technician_conditions(self):
+		self.assertEqual(
+			get_repair_order_conditions(TEST_TECHNICIAN),
+			f"`tabRepair Order`.assigned_to = '{TEST_TECHNICIAN}'"
+		)
+		self.assertIn(f"WHERE assigned_to = '{TEST_TECHNICIAN}'", repair_log_query(TEST_TECHNICIAN))
+		self.assertIn(f"WHERE assigned_to = '{TEST_TECHNICIAN}'", repair_status_interval_query(TEST_TECHNICIAN))
+		self.assertEqual(get_repair_order_conditions('Administrator'), '')
+
+	def test_technician_sees_assigned_orders(self):
+		own = make_repair_order(assigned_to=TEST_TECHNICIAN).insert()
+		other = make_repair_order(assigned_to='Administrator').insert()
+
+		self.assertTrue(has_permission(own, 'read', TEST_TECHNICIAN))
+		self.assertFalse(has_permission(other, 'read', TEST_TECHNICIAN))
+
+		frappe.set_user(TEST_TECHNICIAN)
+		try:
+			names = frappe.get_list('Repair Order', filters={'name': ['in', [own.name, other.name]]}, pluck='name')
+		finally:
+			frappe.set_user('Administrator')
+
+		self.assertEqual(names, [own.name])
@@ -0,0 +1,48 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from repairbox.repairbox.retention import purge_expired_pii
+from repairbox.tests.utils import make_repair_order, make_test_records
+
+
+class TestRetention(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_test_records()
+
+	def setUp(self):
+		frappe.db.set_single_value('RepairBox Settings', 'pii_retention_days', 365)
+		frappe.db.set_single_value('RepairBox Settings', 'pii_purge_checkpoint', None)
+
+	def tearDown(self):
+		frappe.db.set_single_value('RepairBox Settings', 'pii_retention_days', 0)
+
+	def test_purges_old_delivered_orders(self):
+		old = make_order(status='Delivered', days_ago=400)
+		recent = make_order(status='Delivered', days_ago=30)
+		open_order = make_order(status='In Progress', days_ago=400)
+
+		purge_expired_pii(batch_size=2)
+
+		self.assertEqual(
+			frappe.db.get_value('Repair Order', old, ['contact_number', 'serial_number', 'pii_purged']),
+			(None, None, 1)
+		)
+		for name in (recent, open_order):
+			self.assertEqual(frappe.db.get_value('Repair Order', name, 'serial_number'), 'SN-RETENTION')
+		# A finished pass leaves no checkpoint behind
+		self.assertFalse(frappe.db.get_single_value('RepairBox Settings', 'pii_purge_checkpoint'))
+
+
+def make_order(status, days_ago):
+	doc = make_repair_order(contact_number='+216 20 123 456', serial_number='SN-RETENTION').insert()
+	frappe.db.set_value('Repair Order', doc.name, {
+		'status': status,
+		'booking_date': add_days(now_datetime(), -days_ago)
+	}, update_modified=False)
+	return doc.name
@@ -0,0 +1,159 @@
+# Copyright (c) 2026, Me and contributors
+# For license information, please see license.txt
+
+"""
+Test helpers shared by the RepairBox doctype tests.
+
+`QueryBudgetTestCase.assertQueryBudget` fails when the enclosed block runs
+more SQL queries than its budget and lists the queries it ran, so N+1
+regressions show up with the offending statements:
+
+	with self.assertQueryBudget(6):
+		doc.save()
+
+Transaction control statements (savepoints, commits, rollbacks) are not
+counted.
+"""
+
+import re
+from contextlib import contextmanager
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now_datetime
+
+TEST_BRAND = '_Test RepairBox Brand'
+TEST_DEVICE = '_Test RepairBox Device'
+TEST_CUSTOMER = '_Test RepairBox Customer'
+
+TRANSACTION_STATEMENT = re.compile(
+	r'^\s*(savepoint|release savepoint|rollback|commit|start transaction|begin)\b',
+	re.IGNORECASE
+)
+
+
+class QueryBudgetTestCase(FrappeTestCase):
+	@contextmanager
+	def assertQueryBudget(self, budget, operation=None):
+		"""Fail if the enclosed block runs more than `budget` queries"""
+		with record_queries() as queries:
+			yield queries
+
+		if len(queries) > budget:
+			self.fail(format_budget_failure(operation, budget, queries))
+
+	def assertQueriesPerRow(self, budget, run, rows=(1, 5), setup=None, operation=None):
+		"""
+		Fail if `run` needs more than `budget` additional queries per extra row.
+
+		`run(n)` is measured for each row count in `rows`. With `setup`, the
+		result of `setup(n)` is passed to `run` instead and preparing the rows
+		is not counted. Catches N+1 patterns a fixed budget with one row misses.
+		"""
+		counts = {}
+		for n in rows:
+			arg = setup(n) if setup else n
+			with record_queries() as queries:
+				run(arg)
+			counts[n] = queries
+
+		few, many = min(rows), max(rows)
+		allowed = len(counts[few]) + budget * (many - few)
+		if len(counts[many]) > allowed:
+			self.fail(format_budget_failure(
+				f'{operation or "Operation"} with {many} rows ({len(counts[few])} queries with {few})',
+				allowed,
+				counts[many]
+			))
+
+
+@contextmanager
+def record_queries():
+	"""Collect the SQL statements run by `frappe.db.sql` in the enclosed block"""
+	queries = []
+	db = frappe.db
+	own_sql = 'sql' in db.__dict__
+	sql = db.sql
+
+	def recording_sql(query, *args, **kwargs):
+		result = sql(query, *args, **kwargs)
+		statement = str(getattr(db, 'last_query', None) or query)
+		if not TRANSACTION_STATEMENT.match(statement):
+			queries.append(statement.strip())
+		return result
+
+	db.sql = recording_sql
+	try:
+		yield queries
+	finally:
+		if own_sql:
+			db.sql = sql
+		else:
+			del db.sql
+
+
+def format_budget_failure(operation, budget, queries):
+	lines = [f'{operation or "Operation"} ran {len(queries)} queries, budget is {budget}:']
+	lines.extend(f'{idx:3d}. {" ".join(query.split())}' for idx, query in enumerate(queries, 1))
+	return '\n'.join(lines)
+
+
+def make_test_records():
+	"""Create the brand, device, defects and customer used by RepairBox tests"""
+	if not frappe.db.exists('Brand', TEST_BRAND):
+		frappe.get_doc({'doctype': 'Brand', 'brand_name': TEST_BRAND, 'is_active': 1}).insert()
+
+	if not frappe.db.exists('Device', TEST_DEVICE):
+		frappe.get_doc({
+			'doctype': 'Device',
+			'device_name': TEST_DEVICE,
+			'brand': TEST_BRAND,
+			'device_type': 'Smartphone',
+			'is_active': 1
+		}).insert()
+
+	for idx in range(1, 6):
+		if not frappe.db.exists('Defect', get_test_defect(idx)):
+			frappe.get_doc({
+				'doctype': 'Defect',
+				'device': TEST_DEVICE,
+				'defect_title': f'Test Repair {idx}',
+				'estimated_time': 30 * idx,
+				'cost_amount': 10 * idx,
+				'selling_price': 25 * idx,
+				'is_active': 1
+			}).insert()
+
+	if not frappe.db.exists('Customer', TEST_CUSTOMER):
+		frappe.get_doc({
+			'doctype': 'Customer',
+			'customer_name': TEST_CUSTOMER,
+			'customer_type': 'Individual'
+		}).insert()
+
+
+def set_event_consumers(consumers):
+	"""Enable the outbox consumers named in `consumers`, space separated"""
+	settings = frappe.get_single('RepairBox Settings')
+	settings.event_consumers = consumers
+	settings.save()
+
+
+def get_test_defect(idx):
+	return f'{TEST_DEVICE}-Test Repair {idx}'
+
+
+def make_repair_order(defects=1, **kwargs):
+	"""Build an unsaved Repair Order for the test device with `defects` defect rows"""
+	doc = frappe.get_doc({
+		'doctype': 'Repair Order',
+		'customer': TEST_CUSTOMER,
+		'brand': TEST_BRAND,
+		'device': TEST_DEVICE,
+		'status': 'Pending Review',
+		'priority': 'Standard',
+		'booking_date': now_datetime(),
+		'defects': [{'defect': get_test_defect(idx)} for idx in range(1, defects + 1)]
+	})
+	doc.update(kwargs)
+	return doc